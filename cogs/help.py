@@ -41,7 +41,8 @@ class HelpCog(commands.Cog):
                 "`/schedule-calendar [年] [月]` - カレンダー形式で表示",
                 "`/schedule-edit <ID> [項目]` - 予定を編集",
                 "`/schedule-delete <ID>` - 予定を削除",
-                "`/schedule-remind <ID> <時間前>` - リマインダー設定",
+                "`/schedule-remind <ID> <時間前,...>` - リマインダー設定（複数可）",
+                "`/schedule-remind-default [時間前,...]` - 予定追加時の既定のリマインダー",
                 "`/schedule-bulk <JSON>` - 複数予定を一括追加"
             ]
             
@@ -53,10 +54,13 @@ class HelpCog(commands.Cog):
             
             # 音楽再生コマンド
             music_commands = [
-                "`/play <URL/検索語>` - YouTube音楽を再生",
+                "`/play <URL/検索語>` - YouTube音楽を再生（再生中はキューに追加）",
                 "`/pause` - 一時停止",
                 "`/resume` - 再開",
-                "`/stop` - 停止",
+                "`/skip` - 次の曲へスキップ",
+                "`/queue` - キューを表示",
+                "`/remove <番号>` - キューから削除",
+                "`/stop` - 停止（キューもクリア）",
                 "`/volume <0-100>` - 音量調整",
                 "`/nowplaying` - 現在再生中の情報",
                 "`/disconnect` - ボイスチャンネルから切断"
@@ -11,11 +11,15 @@ from discord.ext import commands
 from discord import app_commands
 import logging
 import asyncio
+import os
+import time
 import yt_dlp
-from typing import Optional, Dict, Any, List
+from collections import deque
+from typing import Optional, Dict, Any, List, Deque, Union
 import re
 from urllib.parse import urlparse
 import functools
+import threading
 
 from utils.helpers import (
     create_error_embed,
@@ -25,12 +29,18 @@ from utils.helpers import (
     load_volume_setting,
     save_volume_setting
 )
+from utils.media_cache import media_cache, search_cache, stream_expires_at
+from utils.extractor_pool import ExtractorBusyError, extractor_pool
 
 logger = logging.getLogger(__name__)
 
+# 再生方式（opus: Opus のまま Discord に送る / pcm: PCM に変換して BOT 側で音量を変える）
+PLAYBACK_MODE = os.getenv('PLAYBACK_MODE', 'opus')
+
 # yt-dlpの設定
 YTDL_FORMAT_OPTIONS = {
-    'format': 'bestaudio/best',
+    # opus の場合は Opus（WebM）の音声を優先し、音量が100%なら再エンコードせずに送る
+    'format': 'bestaudio[acodec=opus]/bestaudio/best' if PLAYBACK_MODE == 'opus' else 'bestaudio/best',
     'outtmpl': '%(extractor)s-%(id)s-%(title)s.%(ext)s',
     'restrictfilenames': True,
     'noplaylist': True,
@@ -54,6 +64,81 @@ FFMPEG_OPTIONS = {
 
 ytdl = yt_dlp.YoutubeDL(YTDL_FORMAT_OPTIONS)
 
+# 検索用のyt-dlpの設定
+YTDL_SEARCH_OPTIONS = {
+    **YTDL_FORMAT_OPTIONS,
+    'quiet': True,
+    'extract_flat': 'discard_in_playlist',  # メタデータのみ取得
+}
+
+# 検索で取得する件数
+SEARCH_RESULT_COUNT = 5
+
+# 抽出用のYoutubeDL（作成のコストが大きく、複数のスレッドで共有できないため、ワーカーごとに1つ作成して使い回す）
+_ytdl_local = threading.local()
+
+def _get_ytdl(search: bool = False) -> yt_dlp.YoutubeDL:
+    """
+    実行中のワーカーのYoutubeDLを取得（初回のみ作成）
+    
+    Args:
+        search: 検索用の設定のものを取得するか
+    
+    Returns:
+        YoutubeDL
+    """
+    name = 'search' if search else 'extract'
+    instance = getattr(_ytdl_local, name, None)
+    if instance is None:
+        instance = yt_dlp.YoutubeDL(YTDL_SEARCH_OPTIONS if search else YTDL_FORMAT_OPTIONS)
+        setattr(_ytdl_local, name, instance)
+    return instance
+
+def _extract_job(url: str, download: bool) -> Dict[str, Any]:
+    """
+    抽出用のワーカーで動画情報を取得
+    
+    Args:
+        url: YouTube URL または検索キーワード
+        download: ファイルをダウンロードするか
+    
+    Returns:
+        yt-dlpの動画情報（プレイリストの場合は最初の動画）
+    """
+    data = _get_ytdl().extract_info(url, download=download)
+    if 'entries' in data:
+        # プレイリストの場合は最初の動画を取得
+        data = data['entries'][0]
+    return data
+
+def _search_job(query: str) -> List[Dict[str, Any]]:
+    """
+    抽出用のワーカーで検索
+    
+    Args:
+        query: 検索キーワード
+    
+    Returns:
+        検索結果のリスト（上位 SEARCH_RESULT_COUNT 件）
+    """
+    # ytsearch5:<query> 形式で検索（上位5件）
+    data = _get_ytdl(search=True).extract_info(f"ytsearch{SEARCH_RESULT_COUNT}:{query}", download=False)
+    if not data or 'entries' not in data:
+        return []
+    
+    # 抽出された各エントリに webpage_url がない場合、動画URLを生成
+    entries = list(data['entries'])[:SEARCH_RESULT_COUNT]
+    for entry in entries:
+        if not entry.get('webpage_url') and entry.get('id'):
+            entry['webpage_url'] = f"https://www.youtube.com/watch?v={entry['id']}"
+    return entries
+
+# キューに入れられる曲数の上限
+MAX_QUEUE_SIZE = 100
+
+# /queue で表示する曲数
+QUEUE_PAGE_SIZE = 10
+
 class YTDLSource(discord.PCMVolumeTransformer):
     """
     YouTube音声ソースクラス
@@ -70,6 +155,45 @@ class YTDLSource(discord.PCMVolumeTransformer):
         self.uploader = data.get('uploader')
         self.webpage_url = data.get('webpage_url')
     
+    @classmethod
+    async def extract_info(cls, url, *, loop=None, download=False) -> Dict[str, Any]:
+        """
+        URLから動画情報（ストリーミング用のURLを含む）を取得
+        ストリーミングの場合はキャッシュ済みの情報を返す
+        
+        Args:
+            url: YouTube URL または検索キーワード
+            loop: イベントループ（未使用。抽出は抽出用のワーカーで実行する）
+            download: ファイルをダウンロードするか
+        
+        Returns:
+            yt-dlpの動画情報
+        """
+        async def extract() -> Dict[str, Any]:
+            # yt-dlpでの情報取得は抽出用のワーカーで実行
+            return await extractor_pool.run(_extract_job, url, download)
+        
+        if download:
+            return await extract()
+        
+        # ストリーミングの場合は動画IDごとのキャッシュを使う（URLの期限が近いものは取得し直す）
+        return await media_cache.get_or_extract(url, extract)
+    
+    @classmethod
+    def from_data(cls, data: Dict[str, Any], volume: float = 0.5) -> 'YTDLSource':
+        """
+        取得済みの動画情報からストリーミング再生用の音声ソースを作成（FFmpegの起動のみ）
+        
+        Args:
+            data: extract_info で取得した動画情報
+            volume: 音量 (0.0 - 1.0)
+        
+        Returns:
+            YTDLSourceオブジェクト
+        """
+        ffmpeg_source = discord.FFmpegPCMAudio(data['url'], **FFMPEG_OPTIONS)
+        return cls(ffmpeg_source, data=data, volume=volume)
+    
     @classmethod
     async def from_url(cls, url, *, loop=None, stream=False):
         """
@@ -83,87 +207,282 @@ class YTDLSource(discord.PCMVolumeTransformer):
         Returns:
             YTDLSourceオブジェクト
         """
-        loop = loop or asyncio.get_event_loop()
-        
-        # yt-dlpでの情報取得を非同期で実行
-        data = await loop.run_in_executor(
-            None, 
-            lambda: ytdl.extract_info(url, download=not stream)
-        )
-        
-        if 'entries' in data:
-            # プレイリストの場合は最初の動画を取得
-            data = data['entries'][0]
-        
-        filename = data['url'] if stream else ytdl.prepare_filename(data)
+        data = await cls.extract_info(url, loop=loop, download=not stream)
+        if stream:
+            return cls.from_data(data)
         
         # FFmpegソースの作成
-        ffmpeg_source = discord.FFmpegPCMAudio(filename, **FFMPEG_OPTIONS)
-        
+        ffmpeg_source = discord.FFmpegPCMAudio(ytdl.prepare_filename(data), **FFMPEG_OPTIONS)
         return cls(ffmpeg_source, data=data)
     
     @classmethod  
     async def search(cls, search_term, *, loop=None):
         """
         検索キーワードから動画情報を取得
+        同じキーワード（正規化後）の検索結果はキャッシュし、同時に届いた検索は1回にまとめる
         
         Args:
             search_term: 検索キーワード
-            loop: イベントループ
+            loop: イベントループ（未使用。検索は抽出用のワーカーで実行する）
         
         Returns:
             検索結果のリスト
-        """
-        loop = loop or asyncio.get_event_loop()
-        
-        # 検索用の設定
-        search_opts = YTDL_FORMAT_OPTIONS.copy()
-        search_opts.update({
-            'quiet': True,
-            'extract_flat': 'discard_in_playlist',  # メタデータのみ取得
-        })
         
-        search_ytdl = yt_dlp.YoutubeDL(search_opts)
-        
-        # ytsearch5:<query> 形式で検索（上位5件）
-        search_query = f"ytsearch5:{search_term}"
+        Raises:
+            ExtractorBusyError: 抽出の実行待ちが上限に達している場合
+        """
+        async def run_search(query: str) -> List[Dict[str, Any]]:
+            return await extractor_pool.run(_search_job, query)
         
         try:
-            data = await loop.run_in_executor(
-                None,
-                lambda: search_ytdl.extract_info(search_query, download=False)
-            )
-            
-            if data and 'entries' in data:
-                # 抽出された各エントリに webpage_url がない場合、動画URLを生成
-                for entry in data['entries']:
-                    if not entry.get('webpage_url') and entry.get('id'):
-                        entry['webpage_url'] = f"https://www.youtube.com/watch?v={entry['id']}"
-                return data['entries'][:5]
-            return []
+            return await search_cache.get_or_search(search_term, run_search)
             
+        except ExtractorBusyError:
+            raise
         except Exception as e:
             logger.error(f"検索エラー: {e}")
             return []
 
+class YTDLOpusSource(discord.AudioSource):
+    """
+    Opus のまま再生するYouTube音声ソース
+    
+    PCM への変換・Python での音量計算・discord.py での Opus エンコードを行わず、FFmpeg の出力をそのまま送る
+    元の音声が Opus で音量が100%の場合は再エンコードもしない（codec copy）
+    それ以外は FFmpeg の volume フィルターで音量を変えて Opus にエンコードする
+    音量を変えた場合は、再生位置から FFmpeg を起動し直す（切り替え時に一瞬途切れる）
+    """
+    
+    # 1フレームの長さ（秒）
+    FRAME_SECONDS = discord.opus.Encoder.FRAME_LENGTH / 1000
+    
+    def __init__(self, data: Dict[str, Any], *, volume: float = 0.5):
+        self.data = data
+        self.title = data.get('title')
+        self.url = data.get('url')
+        self.duration = data.get('duration')
+        self.thumbnail = data.get('thumbnail')
+        self.uploader = data.get('uploader')
+        self.webpage_url = data.get('webpage_url')
+        
+        self._volume = max(0.0, volume)
+        # 送信したフレーム数（音量の変更時に再生位置から再開するため）
+        self._frames = 0
+        # read は音声スレッド、音量の変更はイベントループから呼ばれるため、FFmpeg の差し替えはロックして行う
+        self._lock = threading.Lock()
+        self._source = self._open(0.0, self._volume)
+    
+    @classmethod
+    def from_data(cls, data: Dict[str, Any], volume: float = 0.5) -> 'YTDLOpusSource':
+        """
+        取得済みの動画情報からストリーミング再生用の音声ソースを作成（FFmpegの起動のみ）
+        
+        Args:
+            data: extract_info で取得した動画情報
+            volume: 音量 (0.0 - 1.0)
+        
+        Returns:
+            YTDLOpusSourceオブジェクト
+        """
+        return cls(data, volume=volume)
+    
+    @property
+    def volume(self) -> float:
+        """音量 (0.0 - 1.0)"""
+        return self._volume
+    
+    @volume.setter
+    def volume(self, value: float):
+        value = max(0.0, value)
+        if value == self._volume:
+            return
+        
+        source = self._open(self.position, value)
+        with self._lock:
+            source, self._source = self._source, source
+            self._volume = value
+        source.cleanup()
+    
+    @property
+    def position(self) -> float:
+        """再生位置（秒）"""
+        return self._frames * self.FRAME_SECONDS
+    
+    @property
+    def is_passthrough(self) -> bool:
+        """再エンコードせずに送っているか"""
+        return self._can_copy(self._volume)
+    
+    def read(self) -> bytes:
+        with self._lock:
+            packet = self._source.read()
+        if packet:
+            self._frames += 1
+        return packet
+    
+    def is_opus(self) -> bool:
+        return True
+    
+    def cleanup(self):
+        self._source.cleanup()
+    
+    def _can_copy(self, volume: float) -> bool:
+        """元の音声が Opus で、音量を変える必要がないか"""
+        return self.data.get('acodec') == 'opus' and volume == 1.0
+    
+    def _open(self, position: float, volume: float) -> discord.FFmpegOpusAudio:
+        """再生位置から FFmpeg を起動"""
+        before_options = FFMPEG_OPTIONS['before_options']
+        if position and not self.data.get('is_live'):
+            before_options += f" -ss {position:.2f}"
+        
+        if self._can_copy(volume):
+            return discord.FFmpegOpusAudio(
+                self.url, codec='copy', before_options=before_options, options=FFMPEG_OPTIONS['options']
+            )
+        return discord.FFmpegOpusAudio(
+            self.url,
+            # discord.py は 'opus' / 'libopus' / 'copy' を codec copy として扱うため、None で libopus エンコードにする
+            codec=None,
+            before_options=before_options,
+            options=f"{FFMPEG_OPTIONS['options']} -filter:a volume={volume:.3f}"
+        )
+
+# 再生中の音声ソース
+AudioSourceType = Union[YTDLSource, YTDLOpusSource]
+
+def create_audio_source(data: Dict[str, Any], volume: float) -> AudioSourceType:
+    """
+    再生方式（PLAYBACK_MODE）に合わせてストリーミング再生用の音声ソースを作成
+    
+    Args:
+        data: extract_info で取得した動画情報
+        volume: 音量 (0.0 - 1.0)
+    
+    Returns:
+        音声ソース
+    """
+    if PLAYBACK_MODE == 'opus':
+        return YTDLOpusSource.from_data(data, volume=volume)
+    return YTDLSource.from_data(data, volume=volume)
+
+class Track:
+    """
+    キューの1曲
+    再生前にストリーミング用のURLを解決しておき（先読み）、曲の切り替え時はFFmpegの起動だけで済むようにする
+    """
+    
+    def __init__(
+        self,
+        query: str,
+        title: Optional[str] = None,
+        duration: Optional[float] = None,
+        requester: Optional[str] = None
+    ):
+        """
+        Args:
+            query: YouTube URL
+            title: 表示用のタイトル（解決前は検索結果のタイトルまたはURL）
+            duration: 長さ（秒）
+            requester: リクエストしたユーザーの表示名
+        """
+        self.query = query
+        self.title = title or query
+        self.duration = duration
+        self.requester = requester
+        self.data: Optional[Dict[str, Any]] = None
+        self._expires_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+    
+    @property
+    def is_resolved(self) -> bool:
+        """ストリーミング用のURLが解決済みで、まだ使えるか"""
+        return self.data is not None and time.time() < self._expires_at
+    
+    def prefetch(self) -> asyncio.Task:
+        """
+        ストリーミング用のURLの解決をバックグラウンドで開始
+        （解決中・解決済みの場合はそのタスクを返す）
+        
+        Returns:
+            解決処理のタスク
+        """
+        if self._task is None or (self._task.done() and not self.is_resolved):
+            self._task = asyncio.create_task(self._resolve())
+            self._task.add_done_callback(self._log_failure)
+        return self._task
+    
+    async def resolve(self) -> Dict[str, Any]:
+        """
+        ストリーミング用のURLを解決（先読み済みの場合は待たずに返す）
+        
+        Returns:
+            yt-dlpの動画情報
+        """
+        await asyncio.shield(self.prefetch())
+        return self.data
+    
+    def cancel(self):
+        """
+        解決中の処理を中止
+        """
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+    
+    async def _resolve(self):
+        """yt-dlpで動画情報を取得"""
+        data = await YTDLSource.extract_info(self.query)
+        self.data = data
+        self.title = data.get('title') or self.title
+        self.duration = data.get('duration') or self.duration
+        self._expires_at = stream_expires_at(data)
+    
+    def _log_failure(self, task: asyncio.Task):
+        """先読みの失敗をログに記録（再生時にもう一度解決を試みる）"""
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"曲の先読みに失敗: {self.title}: {task.exception()}")
+
 class MusicPlayer:
     """
     音楽プレイヤークラス
-    ギルドごとの再生状態を管理
+    ギルドごとの再生状態とキューを管理
+    
+    曲が終わると after コールバックからイベントループ上で次の曲を再生し、
+    再生を始めたらキューの先頭の曲のストリーミング用のURLを先読みする
     """
     
     def __init__(self, guild_id: int, initial_volume: float = 0.1):
         self.guild_id = guild_id
         self.voice_client: Optional[discord.VoiceClient] = None
-        self.current_source: Optional[YTDLSource] = None
+        self.current_source: Optional[AudioSourceType] = None
+        self.current_track: Optional[Track] = None
         # 初期音量（0.0 - 1.0）
         self.volume = max(0.0, min(1.0, initial_volume))
         self.is_playing = False
         self.is_paused = False
         
+        # 再生待ちの曲
+        self.queue: Deque[Track] = deque()
+        # 自動で次の曲に進んだ時に通知するチャンネル
+        self.text_channel: Optional[discord.abc.Messageable] = None
+        
+        # 停止・差し替えのたびに増やし、古い曲の終了では次の曲に進まないようにする
+        self._generation = 0
+        # 次の曲の再生開始を1つずつ処理する
+        self._advance_lock = asyncio.Lock()
+        # 曲の終了後に次の曲へ進めるタスク（asyncio はタスクを弱参照でしか保持しないため、参照を残す）
+        self._advance_task: Optional[asyncio.Task] = None
+        
         # 再生制御用のイベント
         self._stop_event = asyncio.Event()
     
+    @property
+    def is_active(self) -> bool:
+        """再生中・一時停止中・次の曲の準備中か"""
+        if self._advance_lock.locked():
+            return True
+        return bool(self.voice_client and (self.voice_client.is_playing() or self.voice_client.is_paused()))
+    
     async def connect_to_channel(self, channel: discord.VoiceChannel) -> bool:
         """
         ボイスチャンネルに接続
@@ -191,21 +510,27 @@ class MusicPlayer:
         """
         ボイスチャンネルから切断
         """
+        self.clear_queue()
+        if self._advance_task is not None and not self._advance_task.done():
+            self._advance_task.cancel()
+        self._advance_task = None
         if self.voice_client:
+            self._generation += 1
             if self.is_playing:
                 self.voice_client.stop()
             
             await self.voice_client.disconnect()
             self.voice_client = None
             self.current_source = None
+            self.current_track = None
             self.is_playing = False
             self.is_paused = False
             
             logger.info(f"ボイスチャンネルから切断 (Guild: {self.guild_id})")
     
-    async def play(self, source: YTDLSource) -> bool:
+    async def play(self, source: AudioSourceType) -> bool:
         """
-        音楽を再生
+        音楽を再生（再生中の曲は停止して差し替え、キューは進めない）
         
         Args:
             source: 再生する音声ソース
@@ -219,16 +544,19 @@ class MusicPlayer:
         
         try:
             # 既に再生中の場合は停止
-            if self.voice_client.is_playing():
+            if self.voice_client.is_playing() or self.voice_client.is_paused():
+                self._generation += 1
                 self.voice_client.stop()
             
             # 音量設定
             source.volume = self.volume
             
-            # 再生開始
+            # 再生開始（終了時の after は音声スレッドから呼ばれるため、イベントループに処理を渡す）
+            loop = asyncio.get_running_loop()
+            generation = self._generation
             self.voice_client.play(
                 source,
-                after=lambda e: logger.error(f'Player error: {e}') if e else None
+                after=lambda e: loop.call_soon_threadsafe(self._on_track_end, e, generation)
             )
             
             self.current_source = source
@@ -242,6 +570,138 @@ class MusicPlayer:
             logger.error(f"再生エラー: {e}")
             return False
     
+    def add(self, track: Track) -> Optional[int]:
+        """
+        曲をキューに追加
+        
+        Args:
+            track: 追加する曲
+        
+        Returns:
+            キュー内の位置（1から、キューが一杯の場合はNone）
+        """
+        if len(self.queue) >= MAX_QUEUE_SIZE:
+            return None
+        
+        self.queue.append(track)
+        if len(self.queue) == 1 and self.is_active:
+            # 再生中の曲の次に再生されるので先読みしておく
+            track.prefetch()
+        return len(self.queue)
+    
+    def remove(self, position: int) -> Optional[Track]:
+        """
+        キューから曲を削除
+        
+        Args:
+            position: キュー内の位置（1から）
+        
+        Returns:
+            削除した曲（位置が範囲外の場合はNone）
+        """
+        if not 1 <= position <= len(self.queue):
+            return None
+        
+        track = self.queue[position - 1]
+        del self.queue[position - 1]
+        track.cancel()
+        if position == 1:
+            self._prefetch_next()
+        return track
+    
+    def clear_queue(self) -> int:
+        """
+        キューを空にする
+        
+        Returns:
+            削除した曲数
+        """
+        count = len(self.queue)
+        for track in self.queue:
+            track.cancel()
+        self.queue.clear()
+        return count
+    
+    async def play_next(self) -> bool:
+        """
+        キューの先頭の曲を再生（再生中の場合は何もしない）
+        読み込みに失敗した曲は飛ばして次の曲を試す
+        
+        Returns:
+            曲を再生中かどうか
+        """
+        async with self._advance_lock:
+            if self.voice_client and (self.voice_client.is_playing() or self.voice_client.is_paused()):
+                return True
+            
+            generation = self._generation
+            while self.queue:
+                track = self.queue.popleft()
+                try:
+                    data = await track.resolve()
+                    source = create_audio_source(data, self.volume)
+                except Exception as e:
+                    logger.error(f"曲の読み込みエラー ({track.title}): {e}")
+                    continue
+                
+                if generation != self._generation:
+                    # 読み込み中に停止・切断された
+                    source.cleanup()
+                    return False
+                
+                if not await self.play(source):
+                    break
+                
+                self.current_track = track
+                self._prefetch_next()
+                return True
+            
+            self.current_source = None
+            self.current_track = None
+            self.is_playing = False
+            self.is_paused = False
+            return False
+    
+    def skip(self) -> bool:
+        """
+        現在の曲を終了して次の曲へ進む（次の曲の再生は after コールバックから行う）
+        
+        Returns:
+            スキップ成功の可否
+        """
+        if self.voice_client and (self.voice_client.is_playing() or self.voice_client.is_paused()):
+            self.voice_client.stop()
+            logger.info(f"スキップ (Guild: {self.guild_id})")
+            return True
+        return False
+    
+    def _prefetch_next(self):
+        """キューの先頭の曲のストリーミング用のURLを先読み"""
+        if self.queue:
+            self.queue[0].prefetch()
+    
+    def _on_track_end(self, error: Optional[Exception], generation: int):
+        """曲の終了（イベントループ上で呼ばれる）"""
+        if error:
+            logger.error(f'Player error: {error}')
+        if generation != self._generation:
+            # 停止・差し替えによる終了
+            return
+        
+        self.is_playing = False
+        self._advance_task = asyncio.create_task(self._advance())
+    
+    async def _advance(self):
+        """曲の終了後に次の曲を再生し、通知チャンネルに知らせる"""
+        previous = self.current_track
+        try:
+            if not await self.play_next() or self.current_track is previous:
+                return
+            if self.text_channel is not None:
+                await self.text_channel.send(embed=create_now_playing_embed(self, self.current_track))
+        except Exception as e:
+            logger.error(f"次の曲の再生エラー: {e}")
+    
     def pause(self) -> bool:
         """
         再生を一時停止
@@ -272,19 +732,22 @@ class MusicPlayer:
     
     def stop(self) -> bool:
         """
-        再生を停止
+        再生を停止し、キューを空にする
         
         Returns:
             停止成功の可否
         """
+        cleared = self.clear_queue()
         if self.voice_client and (self.voice_client.is_playing() or self.voice_client.is_paused()):
+            self._generation += 1
             self.voice_client.stop()
             self.current_source = None
+            self.current_track = None
             self.is_playing = False
             self.is_paused = False
             logger.info(f"再生を停止 (Guild: {self.guild_id})")
             return True
-        return False
+        return cleared > 0
     
     def set_volume(self, volume: float) -> bool:
         """
@@ -328,10 +791,63 @@ class MusicPlayer:
             'is_playing': self.is_playing and self.voice_client and self.voice_client.is_playing(),
             'is_paused': self.is_paused,
             'current_song': self.current_source.title if self.current_source else None,
+            'queue_length': len(self.queue),
             'volume': int(self.volume * 100),
             'channel': self.voice_client.channel.name if self.voice_client and self.voice_client.channel else None
         }
 
+def format_duration(seconds: Optional[float]) -> Optional[str]:
+    """
+    秒を「分:秒」形式に変換
+    
+    Args:
+        seconds: 秒数
+    
+    Returns:
+        「分:秒」形式の文字列（長さが不明な場合はNone）
+    """
+    if not seconds:
+        return None
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}:{seconds:02d}"
+
+def create_now_playing_embed(player: MusicPlayer, track: Track) -> discord.Embed:
+    """
+    再生開始を知らせるEmbedを作成
+    
+    Args:
+        player: 再生中のプレイヤー
+        track: 再生を始めた曲
+    
+    Returns:
+        再生開始のEmbed
+    """
+    source = player.current_source
+    embed = discord.Embed(
+        title="🎵 再生開始",
+        description=f"**[{source.title}]({source.webpage_url})**",
+        color=0x00ff00
+    )
+    
+    duration = format_duration(source.duration)
+    if duration:
+        embed.add_field(name="長さ", value=duration, inline=True)
+    
+    if source.uploader:
+        embed.add_field(name="アップロード者", value=source.uploader, inline=True)
+    
+    embed.add_field(name="音量", value=f"{int(player.volume * 100)}%", inline=True)
+    
+    if player.queue:
+        embed.add_field(name="次の曲", value=f"{player.queue[0].title} (ほか{len(player.queue) - 1}曲)", inline=False)
+    
+    if source.thumbnail:
+        embed.set_thumbnail(url=source.thumbnail)
+    
+    if track.requester:
+        embed.set_footer(text=f"リクエスト: {track.requester}")
+    return embed
+
 class MusicCog(commands.Cog):
     """
     YouTube音楽再生機能を提供するCog
@@ -367,9 +883,10 @@ class MusicCog(commands.Cog):
         for player in self.players.values():
             await player.disconnect()
         self.players.clear()
+        extractor_pool.shutdown()
         logger.info("音楽再生Cogを終了しました")
     
-    @app_commands.command(name="play", description="YouTube音楽を再生します")
+    @app_commands.command(name="play", description="YouTube音楽を再生します（再生中はキューに追加）")
     @app_commands.describe(
         query="YouTube URL または 検索キーワード"
     )
@@ -401,6 +918,7 @@ class MusicCog(commands.Cog):
             
             # URLかどうかを判定
             is_url = validate_youtube_url(query)
+            selected = None
             
             if not is_url:
                 # 検索モード
@@ -438,9 +956,35 @@ class MusicCog(commands.Cog):
                 )
                 await interaction.followup.send(embed=embed)
             
+            player.text_channel = interaction.channel
+            track = Track(
+                query,
+                title=selected.get('title') if selected else None,
+                duration=selected.get('duration') if selected else None,
+                requester=interaction.user.display_name
+            )
+            
+            # 再生中の場合はキューに追加（次の曲になる場合は今の曲の再生中に先読みする）
+            if player.is_active:
+                position = player.add(track)
+                if position is None:
+                    embed = create_error_embed(
+                        "キューが一杯です",
+                        f"キューに入れられるのは{MAX_QUEUE_SIZE}曲までです。"
+                    )
+                else:
+                    embed = create_success_embed(
+                        "キューに追加しました",
+                        f"**{track.title}** をキューに追加しました。（{position}番目）"
+                    )
+                await interaction.edit_original_response(embed=embed)
+                return
+            
             # 音声ソースの作成
             try:
-                source = await YTDLSource.from_url(query, loop=self.bot.loop, stream=True)
+                await track.resolve()
+            except ExtractorBusyError:
+                raise
             except Exception as e:
                 logger.error(f"音声ソース作成エラー: {e}")
                 embed = create_error_embed(
@@ -452,31 +996,19 @@ class MusicCog(commands.Cog):
                 return
             
             # 再生開始
-            if await player.play(source):
-                embed = discord.Embed(
-                    title="🎵 再生開始",
-                    description=f"**[{source.title}]({source.webpage_url})**",
-                    color=0x00ff00
-                )
-                
-                if source.duration:
-                    # 秒を分:秒形式に変換
-                    minutes, seconds = divmod(source.duration, 60)
-                    duration_str = f"{int(minutes)}:{int(seconds):02d}"
-                    embed.add_field(name="長さ", value=duration_str, inline=True)
-                
-                if source.uploader:
-                    embed.add_field(name="アップロード者", value=source.uploader, inline=True)
-                
-                embed.add_field(name="音量", value=f"{int(player.volume * 100)}%", inline=True)
-                
-                if source.thumbnail:
-                    embed.set_thumbnail(url=source.thumbnail)
-                
-                embed.set_footer(text=f"リクエスト: {interaction.user.display_name}")
-                
+            position = player.add(track)
+            if position is not None and await player.play_next():
+                if player.current_track is track:
+                    embed = create_now_playing_embed(player, track)
+                    logger.info(f"再生開始: {track.title} (ユーザー: {interaction.user.id})")
+                else:
+                    # 同時に追加された他の曲が先に再生された
+                    embed = create_success_embed(
+                        "キューに追加しました",
+                        f"**{track.title}** をキューに追加しました。（{player.queue.index(track) + 1}番目）"
+                        if track in player.queue else f"**{track.title}** をキューに追加しました。"
+                    )
                 await interaction.edit_original_response(embed=embed)
-                logger.info(f"再生開始: {source.title} (ユーザー: {interaction.user.id})")
             else:
                 embed = create_error_embed(
                     "再生エラー",
@@ -484,6 +1016,18 @@ class MusicCog(commands.Cog):
                 )
                 await interaction.edit_original_response(embed=embed)
             
+        except ExtractorBusyError as e:
+            logger.warning(f"再生コマンドを受け付けませんでした: {e}")
+            embed = create_error_embed(
+                "混み合っています",
+                "動画の読み込みが混み合っています。\n"
+                "しばらくしてからもう一度お試しください。"
+            )
+            try:
+                await interaction.edit_original_response(embed=embed)
+            except:
+                await interaction.followup.send(embed=embed, ephemeral=True)
+            
         except Exception as e:
             logger.error(f"再生コマンドエラー: {e}")
             embed = create_error_embed(
@@ -549,7 +1093,7 @@ class MusicCog(commands.Cog):
             )
             await interaction.response.send_message(embed=embed, ephemeral=True)
     
-    @app_commands.command(name="stop", description="音楽を停止します")
+    @app_commands.command(name="stop", description="音楽を停止し、キューを空にします")
     async def stop(self, interaction: discord.Interaction):
         """音楽停止"""
         try:
@@ -558,7 +1102,7 @@ class MusicCog(commands.Cog):
             if player.stop():
                 embed = create_success_embed(
                     "停止",
-                    "音楽を停止しました。"
+                    "音楽を停止し、キューを空にしました。"
                 )
             else:
                 embed = create_error_embed(
@@ -576,6 +1120,122 @@ class MusicCog(commands.Cog):
             )
             await interaction.response.send_message(embed=embed, ephemeral=True)
     
+    @app_commands.command(name="skip", description="次の曲へスキップします")
+    async def skip(self, interaction: discord.Interaction):
+        """スキップ"""
+        try:
+            player = self.get_player(interaction.guild.id)
+            
+            if player.skip():
+                if player.queue:
+                    embed = create_success_embed(
+                        "スキップ",
+                        f"次の曲 **{player.queue[0].title}** を再生します。"
+                    )
+                else:
+                    embed = create_success_embed(
+                        "スキップ",
+                        "キューに曲がないため再生を終了しました。"
+                    )
+            else:
+                embed = create_error_embed(
+                    "スキップ失敗",
+                    "現在再生中の音楽がありません。"
+                )
+            
+            await interaction.response.send_message(embed=embed)
+            
+        except Exception as e:
+            logger.error(f"スキップエラー: {e}")
+            embed = create_error_embed(
+                "スキップ失敗",
+                "スキップ中にエラーが発生しました。"
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @app_commands.command(name="queue", description="再生待ちの曲を表示します")
+    async def queue(self, interaction: discord.Interaction):
+        """キュー表示"""
+        try:
+            player = self.get_player(interaction.guild.id)
+            
+            if not player.current_track and not player.queue:
+                embed = create_info_embed(
+                    "キューは空です",
+                    "`/play` で曲を追加してください。"
+                )
+                await interaction.response.send_message(embed=embed)
+                return
+            
+            embed = discord.Embed(
+                title="🎶 再生キュー",
+                color=0x00ff99
+            )
+            
+            if player.current_track:
+                state = "⏸️" if player.is_paused else "▶️"
+                embed.add_field(name="再生中", value=f"{state} {player.current_track.title}", inline=False)
+            
+            if player.queue:
+                lines = []
+                for position, track in enumerate(list(player.queue)[:QUEUE_PAGE_SIZE], start=1):
+                    duration = format_duration(track.duration)
+                    line = f"`{position}.` {track.title}"
+                    if duration:
+                        line += f" ({duration})"
+                    if track.requester:
+                        line += f" - {track.requester}"
+                    lines.append(line)
+                if len(player.queue) > QUEUE_PAGE_SIZE:
+                    lines.append(f"…ほか{len(player.queue) - QUEUE_PAGE_SIZE}曲")
+                embed.add_field(name="次に再生", value="\n".join(lines)[:1024], inline=False)
+            
+            total = sum(track.duration or 0 for track in player.queue)
+            embed.set_footer(text=f"{len(player.queue)}曲" + (f" / 合計 {format_duration(total)}" if total else ""))
+            
+            await interaction.response.send_message(embed=embed)
+            
+        except Exception as e:
+            logger.error(f"キュー表示エラー: {e}")
+            embed = create_error_embed(
+                "キュー表示失敗",
+                "キューの表示中にエラーが発生しました。"
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @app_commands.command(name="remove", description="キューから曲を削除します")
+    @app_commands.describe(position="削除する曲の番号（/queue で表示される番号）")
+    async def remove(
+        self,
+        interaction: discord.Interaction,
+        position: app_commands.Range[int, 1, MAX_QUEUE_SIZE]
+    ):
+        """キューから削除"""
+        try:
+            player = self.get_player(interaction.guild.id)
+            
+            track = player.remove(position)
+            if track:
+                embed = create_success_embed(
+                    "削除",
+                    f"**{track.title}** をキューから削除しました。"
+                )
+            else:
+                embed = create_error_embed(
+                    "削除失敗",
+                    f"キューに {position} 番目の曲はありません。"
+                )
+            
+            await interaction.response.send_message(embed=embed)
+            
+        except Exception as e:
+            logger.error(f"キュー削除エラー: {e}")
+            embed = create_error_embed(
+                "削除失敗",
+                "キューからの削除中にエラーが発生しました。"
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+    
     @app_commands.command(name="volume", description="音量を調整します")
     @app_commands.describe(volume="音量 (0-100)")
     async def volume(self, interaction: discord.Interaction, volume: int):
@@ -654,10 +1314,13 @@ class MusicCog(commands.Cog):
             embed.add_field(name="チャンネル", value=status['channel'], inline=True)
             
             # 長さ
-            if player.current_source.duration:
-                minutes, seconds = divmod(player.current_source.duration, 60)
-                duration_str = f"{int(minutes)}:{int(seconds):02d}"
-                embed.add_field(name="長さ", value=duration_str, inline=True)
+            duration = format_duration(player.current_source.duration)
+            if duration:
+                embed.add_field(name="長さ", value=duration, inline=True)
+            
+            # キュー
+            if status['queue_length']:
+                embed.add_field(name="キュー", value=f"{status['queue_length']}曲", inline=True)
             
             # アップロード者
             if player.current_source.uploader:
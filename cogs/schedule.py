@@ -11,7 +11,7 @@ from discord.ext import commands
 from discord import app_commands
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Optional, List, Tuple
 import asyncio
 import json
 
@@ -20,21 +20,33 @@ from database.database import (
     get_schedule_by_id,
     get_schedules_by_user,
     get_schedules_by_guild,
+    get_schedules_page_by_user,
+    get_schedules_page_by_guild,
+    get_schedules_by_month,
+    get_month_schedules_page,
     update_schedule,
     delete_schedule,
-    create_reminder,
+    create_reminders,
+    get_guild_reminder_offsets,
+    set_guild_reminder_offsets,
     create_bulk_schedules
 )
+from database.models import Schedule
+from database.recurrence import Recurrence
 from utils.helpers import (
     parse_datetime_string,
     create_error_embed,
     create_success_embed,
     create_info_embed,
     create_schedule_embed,
-    parse_reminder_time,
+    parse_reminder_times,
+    format_reminder_time,
+    calculate_remind_datetime,
+    MAX_REMINDER_OFFSETS,
     confirm_action
 )
 from utils.calendar_view import create_month_calendar, create_week_view
+from utils.list_view import ScheduleListView, SCHEDULES_PER_PAGE
 
 logger = logging.getLogger(__name__)
 
@@ -47,14 +59,76 @@ class ScheduleCog(commands.Cog):
         self.bot = bot
         logger.info("予定管理Cogを初期化しました")
     
+    async def _create_reminders(
+        self,
+        interaction: discord.Interaction,
+        schedule: Schedule,
+        deltas: List[timedelta],
+        message: Optional[str] = None
+    ) -> Tuple[List[Tuple[timedelta, datetime]], List[timedelta]]:
+        """
+        予定に複数のリマインダーを1回の書き込みで設定
+        
+        Args:
+            interaction: コマンドのインタラクション（通知先のユーザー・チャンネル）
+            schedule: 対象の予定
+            deltas: 予定の開始の何前に通知するかのリスト
+            message: カスタムメッセージ
+        
+        Returns:
+            (設定した (時間, 通知日時) のリスト, 通知日時が過去になるため設定しなかった時間のリスト)
+        """
+        now = datetime.now()
+        planned = []
+        skipped = []
+        for delta in deltas:
+            remind_datetime, recur_offset = calculate_remind_datetime(schedule, delta)
+            if remind_datetime < now:
+                skipped.append(delta)
+            else:
+                planned.append((delta, remind_datetime, recur_offset))
+        
+        await create_reminders([
+            {
+                'schedule_id': schedule.id,
+                'user_id': str(interaction.user.id),
+                'guild_id': str(interaction.guild.id),
+                'channel_id': str(interaction.channel.id),
+                'remind_datetime': remind_datetime,
+                'message': message,
+                'recur_offset': recur_offset,
+            }
+            for _, remind_datetime, recur_offset in planned
+        ])
+        return [(delta, remind_datetime) for delta, remind_datetime, _ in planned], skipped
+    
+    @staticmethod
+    def _format_reminders(reminders: List[Tuple[timedelta, datetime]]) -> str:
+        """設定したリマインダーを「1日前: <日時>」の形式で一覧表示"""
+        return "\n".join(
+            f"{format_reminder_time(delta)}前: <t:{int(remind_datetime.timestamp())}:F> "
+            f"(<t:{int(remind_datetime.timestamp())}:R>)"
+            for delta, remind_datetime in reminders
+        )
+    
     @app_commands.command(name="schedule-add", description="新しい予定を追加します")
     @app_commands.describe(
         title="予定のタイトル",
         date="日付 (例: 2025-07-31, 7/31, 明日)",
         time="時間 (例: 14:30, 2:30PM) ※省略時は9:00",
         description="予定の詳細説明 (オプション)",
-        end_time="終了時間 (オプション)"
+        end_time="終了時間 (オプション)",
+        repeat="繰り返し (オプション)",
+        repeat_count="繰り返す回数 (オプション、省略時は終わりなし)",
+        repeat_until="繰り返しの終了日 (オプション、例: 2025-12-31)"
     )
+    @app_commands.choices(repeat=[
+        app_commands.Choice(name="毎日", value="DAILY"),
+        app_commands.Choice(name="毎週", value="WEEKLY"),
+        app_commands.Choice(name="隔週", value="WEEKLY;INTERVAL=2"),
+        app_commands.Choice(name="毎月", value="MONTHLY"),
+        app_commands.Choice(name="毎年", value="YEARLY")
+    ])
     async def add_schedule(
         self,
         interaction: discord.Interaction,
@@ -62,7 +136,10 @@ class ScheduleCog(commands.Cog):
         date: str,
         time: Optional[str] = None,
         description: Optional[str] = None,
-        end_time: Optional[str] = None
+        end_time: Optional[str] = None,
+        repeat: Optional[str] = None,
+        repeat_count: Optional[app_commands.Range[int, 1, 1000]] = None,
+        repeat_until: Optional[str] = None
     ):
         """予定を追加"""
         try:
@@ -103,6 +180,31 @@ class ScheduleCog(commands.Cog):
                 await interaction.followup.send(embed=embed, ephemeral=True)
                 return
             
+            # 繰り返しのルール
+            if not repeat and (repeat_count or repeat_until):
+                embed = create_error_embed(
+                    "繰り返しエラー",
+                    "繰り返す回数・終了日を指定する場合は、繰り返し（repeat）も指定してください。"
+                )
+                await interaction.followup.send(embed=embed, ephemeral=True)
+                return
+            
+            recurrence = None
+            if repeat:
+                recurrence = f"FREQ={repeat}"
+                if repeat_count:
+                    recurrence += f";COUNT={repeat_count}"
+                if repeat_until:
+                    until = parse_datetime_string(repeat_until, "23:59")
+                    if not until or until < start_datetime:
+                        embed = create_error_embed(
+                            "繰り返しエラー",
+                            "繰り返しの終了日は開始日以降の日付を指定してください。"
+                        )
+                        await interaction.followup.send(embed=embed, ephemeral=True)
+                        return
+                    recurrence += f";UNTIL={until.strftime('%Y%m%dT%H%M%S')}"
+            
             # 予定の作成
             schedule_id = await create_schedule(
                 user_id=str(interaction.user.id),
@@ -110,9 +212,25 @@ class ScheduleCog(commands.Cog):
                 title=title,
                 start_datetime=start_datetime,
                 description=description,
-                end_datetime=end_datetime
+                end_datetime=end_datetime,
+                recurrence=recurrence
             )
             
+            # サーバーの既定のリマインダーを設定（失敗しても予定の追加は成功として扱う）
+            default_reminders: List[Tuple[timedelta, datetime]] = []
+            default_offsets = await get_guild_reminder_offsets(str(interaction.guild.id))
+            if default_offsets:
+                try:
+                    schedule = Schedule(
+                        schedule_id, str(interaction.user.id), str(interaction.guild.id), title,
+                        start_datetime=start_datetime, recurrence=recurrence
+                    )
+                    default_reminders, _ = await self._create_reminders(
+                        interaction, schedule, [timedelta(seconds=offset) for offset in default_offsets]
+                    )
+                except Exception as e:
+                    logger.error(f"既定リマインダー設定エラー: {e}")
+            
             # 成功メッセージ
             embed = create_success_embed(
                 "予定を追加しました",
@@ -129,12 +247,24 @@ class ScheduleCog(commands.Cog):
                     value=f"<t:{int(end_datetime.timestamp())}:F>",
                     inline=True
                 )
+            if recurrence:
+                embed.add_field(
+                    name="繰り返し",
+                    value=Recurrence.parse(recurrence).describe(),
+                    inline=True
+                )
             if description:
                 embed.add_field(
                     name="詳細",
                     value=description,
                     inline=False
                 )
+            if default_reminders:
+                embed.add_field(
+                    name="リマインダー（サーバーの既定）",
+                    value=self._format_reminders(default_reminders),
+                    inline=False
+                )
             embed.set_footer(text=f"予定ID: {schedule_id}")
             
             await interaction.followup.send(embed=embed)
@@ -193,20 +323,48 @@ class ScheduleCog(commands.Cog):
                 next_month = start_date.replace(month=start_date.month + 1) if start_date.month < 12 else start_date.replace(year=start_date.year + 1, month=1)
                 end_date = next_month - timedelta(seconds=1)
             
-            # 予定の取得
-            if show_all:
-                schedules = await get_schedules_by_guild(
+            # 今日・今週は期間内の全件、それ以外は1ページ分だけ取得
+            if period in ("today", "week"):
+                if show_all:
+                    schedules = await get_schedules_by_guild(
+                        str(interaction.guild.id),
+                        start_date=start_date,
+                        end_date=end_date
+                    )
+                else:
+                    schedules = await get_schedules_by_user(
+                        target_user_id,
+                        str(interaction.guild.id),
+                        start_date=start_date,
+                        end_date=end_date
+                    )
+            elif period == "month":
+                # 今月の先頭ページは月単位キャッシュから作成
+                first_page = await get_month_schedules_page(
                     str(interaction.guild.id),
-                    start_date=start_date,
-                    end_date=end_date
+                    now.year,
+                    now.month,
+                    user_id=None if show_all else target_user_id,
+                    page_size=SCHEDULES_PER_PAGE
                 )
+                schedules = first_page.items
             else:
-                schedules = await get_schedules_by_user(
-                    target_user_id,
-                    str(interaction.guild.id),
-                    start_date=start_date,
-                    end_date=end_date
-                )
+                if show_all:
+                    first_page = await get_schedules_page_by_guild(
+                        str(interaction.guild.id),
+                        start_date=start_date,
+                        end_date=end_date,
+                        page_size=SCHEDULES_PER_PAGE
+                    )
+                else:
+                    first_page = await get_schedules_page_by_user(
+                        target_user_id,
+                        str(interaction.guild.id),
+                        start_date=start_date,
+                        end_date=end_date,
+                        page_size=SCHEDULES_PER_PAGE
+                    )
+                schedules = first_page.items
             
             # 結果の表示
             if not schedules:
@@ -237,22 +395,22 @@ class ScheduleCog(commands.Cog):
                 embed = create_week_view(start_date, schedules)
             
             else:
-                # 一覧表示
-                embed = discord.Embed(
-                    title=f"📅 予定一覧 ({len(schedules)}件)",
-                    color=0x00ff99
+                # ページ単位の一覧表示（前へ/次へボタンで必要なページだけ取得）
+                view = ScheduleListView(
+                    str(interaction.user.id),
+                    target_user_id,
+                    str(interaction.guild.id),
+                    start_date,
+                    end_date,
+                    show_all,
+                    first_page
                 )
                 
-                for schedule in schedules[:10]:  # 最大10件表示
-                    time_str = f"<t:{int(schedule.start_datetime.timestamp())}:F>"
-                    embed.add_field(
-                        name=schedule.title,
-                        value=f"{time_str}\n{schedule.description or '詳細なし'}",
-                        inline=False
-                    )
-                
-                if len(schedules) > 10:
-                    embed.set_footer(text=f"他に{len(schedules) - 10}件の予定があります")
+                if first_page.has_next:
+                    await interaction.followup.send(embed=view.create_embed(), view=view)
+                else:
+                    await interaction.followup.send(embed=view.create_embed())
+                return
             
             await interaction.followup.send(embed=embed)
             
@@ -303,27 +461,13 @@ class ScheduleCog(commands.Cog):
                 await interaction.followup.send(embed=embed, ephemeral=True)
                 return
             
-            # 月の開始・終了日時を計算
-            start_date = datetime(year, month, 1)
-            if month == 12:
-                end_date = datetime(year + 1, 1, 1) - timedelta(seconds=1)
-            else:
-                end_date = datetime(year, month + 1, 1) - timedelta(seconds=1)
-            
-            # 予定の取得
-            if show_all:
-                schedules = await get_schedules_by_guild(
-                    str(interaction.guild.id),
-                    start_date=start_date,
-                    end_date=end_date
-                )
-            else:
-                schedules = await get_schedules_by_user(
-                    str(interaction.user.id),
-                    str(interaction.guild.id),
-                    start_date=start_date,
-                    end_date=end_date
-                )
+            # 予定の取得（月単位キャッシュ経由）
+            schedules = await get_schedules_by_month(
+                str(interaction.guild.id),
+                year,
+                month,
+                user_id=None if show_all else str(interaction.user.id)
+            )
             
             # カレンダーの作成
             embed, view = create_month_calendar(
@@ -505,7 +649,7 @@ class ScheduleCog(commands.Cog):
     @app_commands.command(name="schedule-remind", description="予定にリマインダーを設定します")
     @app_commands.describe(
         schedule_id="リマインダーを設定する予定のID",
-        time_before="何分/時間/日前に通知するか (例: 30分, 1時間, 1日)",
+        time_before="何分/時間/日前に通知するか。カンマ区切りで複数指定可 (例: 1日,1時間,10分)",
         message="カスタムメッセージ (オプション)"
     )
     async def set_reminder(
@@ -538,23 +682,24 @@ class ScheduleCog(commands.Cog):
                 await interaction.followup.send(embed=embed, ephemeral=True)
                 return
             
-            # 時間の解析
-            time_delta = parse_reminder_time(time_before)
-            if not time_delta:
+            # 時間の解析（カンマ区切りで複数指定可）
+            deltas = parse_reminder_times(time_before)
+            if not deltas:
                 embed = create_error_embed(
                     "時間解析エラー",
                     "時間の形式が正しくありません。\n\n"
                     "**使用可能な形式:**\n"
-                    "`30分`, `1時間`, `2日`, `30min`, `1hour`, `2days`"
+                    "`30分`, `1時間`, `2日`, `30min`, `1hour`, `2days`\n"
+                    f"カンマ区切りで{MAX_REMINDER_OFFSETS}個まで指定できます (例: `1日,1時間,10分`)"
                 )
                 await interaction.followup.send(embed=embed, ephemeral=True)
                 return
             
-            # リマインダー時刻の計算
-            remind_datetime = schedule.start_datetime - time_delta
+            # リマインダーの作成（すべて1回の書き込みで作成）
+            created, skipped = await self._create_reminders(interaction, schedule, deltas, message)
             
             # 過去の時刻チェック
-            if remind_datetime < datetime.now():
+            if not created:
                 embed = create_error_embed(
                     "時刻エラー",
                     "リマインダー時刻が過去になってしまいます。\n"
@@ -563,30 +708,21 @@ class ScheduleCog(commands.Cog):
                 await interaction.followup.send(embed=embed, ephemeral=True)
                 return
             
-            # リマインダーの作成
-            reminder_id = await create_reminder(
-                schedule_id=schedule_id,
-                user_id=str(interaction.user.id),
-                guild_id=str(interaction.guild.id),
-                channel_id=str(interaction.channel.id),
-                remind_datetime=remind_datetime,
-                message=message
-            )
-            
             embed = create_success_embed(
                 "リマインダーを設定しました",
-                f"**{schedule.title}** のリマインダーを設定しました。"
+                f"**{schedule.title}** のリマインダーを{len(created)}件設定しました。"
             )
             embed.add_field(
                 name="通知時刻",
-                value=f"<t:{int(remind_datetime.timestamp())}:F>",
-                inline=True
-            )
-            embed.add_field(
-                name="予定開始まで",
-                value=f"<t:{int(remind_datetime.timestamp())}:R>",
-                inline=True
+                value=self._format_reminders(created),
+                inline=False
             )
+            if skipped:
+                embed.add_field(
+                    name="設定できなかった時間（通知時刻が過去）",
+                    value=", ".join(format_reminder_time(delta) for delta in skipped),
+                    inline=False
+                )
             if message:
                 embed.add_field(
                     name="カスタムメッセージ",
@@ -595,7 +731,7 @@ class ScheduleCog(commands.Cog):
                 )
             
             await interaction.followup.send(embed=embed)
-            logger.info(f"リマインダーを設定: 予定ID={schedule_id}, リマインダーID={reminder_id}")
+            logger.info(f"リマインダーを設定: 予定ID={schedule_id}, {len(created)}件")
             
         except Exception as e:
             logger.error(f"リマインダー設定エラー: {e}")
@@ -605,6 +741,80 @@ class ScheduleCog(commands.Cog):
             )
             await interaction.followup.send(embed=embed, ephemeral=True)
     
+    @app_commands.command(
+        name="schedule-remind-default",
+        description="予定の追加時に自動で設定するリマインダーを設定します"
+    )
+    @app_commands.describe(
+        time_before="何分/時間/日前に通知するか。カンマ区切りで複数指定可 (例: 1日,10分)、「なし」で解除、省略時は現在の設定を表示"
+    )
+    @app_commands.default_permissions(manage_guild=True)
+    async def set_default_reminders(
+        self,
+        interaction: discord.Interaction,
+        time_before: Optional[str] = None
+    ):
+        """サーバーの既定のリマインダー設定"""
+        try:
+            await interaction.response.defer(ephemeral=True)
+            guild_id = str(interaction.guild.id)
+            
+            # 現在の設定を表示
+            if time_before is None:
+                offsets = await get_guild_reminder_offsets(guild_id)
+                embed = create_info_embed(
+                    "既定のリマインダー",
+                    ", ".join(format_reminder_time(timedelta(seconds=offset)) for offset in offsets) + " 前"
+                    if offsets else "設定されていません。"
+                )
+                await interaction.followup.send(embed=embed, ephemeral=True)
+                return
+            
+            if time_before.strip().lower() in ('なし', 'none', 'off'):
+                deltas = []
+            else:
+                deltas = parse_reminder_times(time_before)
+                if not deltas:
+                    embed = create_error_embed(
+                        "時間解析エラー",
+                        "時間の形式が正しくありません。\n\n"
+                        "**使用可能な形式:**\n"
+                        "`30分`, `1時間`, `2日`, `30min`, `1hour`, `2days`\n"
+                        f"カンマ区切りで{MAX_REMINDER_OFFSETS}個まで指定できます (例: `1日,1時間,10分`)"
+                    )
+                    await interaction.followup.send(embed=embed, ephemeral=True)
+                    return
+            
+            success = await set_guild_reminder_offsets(
+                guild_id, [int(delta.total_seconds()) for delta in deltas]
+            )
+            if not success:
+                embed = create_error_embed(
+                    "設定失敗",
+                    "既定のリマインダーの設定中にエラーが発生しました。"
+                )
+            elif deltas:
+                embed = create_success_embed(
+                    "既定のリマインダーを設定しました",
+                    "今後 `/schedule-add` で追加する予定に、開始の "
+                    + ", ".join(format_reminder_time(delta) for delta in deltas)
+                    + " 前のリマインダーを自動で設定します。"
+                )
+            else:
+                embed = create_success_embed(
+                    "既定のリマインダーを解除しました",
+                    "予定の追加時にリマインダーを自動で設定しません。"
+                )
+            await interaction.followup.send(embed=embed, ephemeral=True)
+            
+        except Exception as e:
+            logger.error(f"既定リマインダー設定エラー: {e}")
+            embed = create_error_embed(
+                "設定失敗",
+                "既定のリマインダーの設定中にエラーが発生しました。"
+            )
+            await interaction.followup.send(embed=embed, ephemeral=True)
+    
     @app_commands.command(name="schedule-bulk", description="複数の予定を一括追加します")
     @app_commands.describe(
         json_data="JSON形式の予定データ"
@@ -692,14 +902,34 @@ class ScheduleCog(commands.Cog):
                 })
             
             # 一括作成実行
-            created_ids = await create_bulk_schedules(processed_schedules)
+            result = await create_bulk_schedules(processed_schedules)
+            created_ids = result.created_ids
             
             if created_ids:
                 embed = create_success_embed(
                     "一括追加完了",
                     f"{len(created_ids)}件の予定を追加しました。"
                 )
-                embed.set_footer(text=f"作成された予定ID: {', '.join(map(str, created_ids))}")
+                
+                # 一部の行が失敗した場合は行番号とエラー内容を表示
+                if result.errors:
+                    failed_lines = [
+                        f"{index + 1}番目: {message}"
+                        for index, message in list(result.errors.items())[:10]
+                    ]
+                    if len(result.errors) > 10:
+                        failed_lines.append(f"...他{len(result.errors) - 10}件")
+                    embed.add_field(
+                        name=f"⚠️ 追加できなかった予定 ({len(result.errors)}件)",
+                        value="\n".join(failed_lines)[:1024],
+                        inline=False
+                    )
+                
+                # フッターの文字数制限に収まるようIDは先頭のみ表示
+                ids_text = ', '.join(map(str, created_ids[:50]))
+                if len(created_ids) > 50:
+                    ids_text += f" ...他{len(created_ids) - 50}件"
+                embed.set_footer(text=f"作成された予定ID: {ids_text}")
                 await interaction.followup.send(embed=embed)
                 logger.info(f"一括予定追加: {len(created_ids)}件 (ユーザー: {interaction.user.id})")
             else:
@@ -8,35 +8,88 @@
 
 from .database import (
     init_database,
+    close_database,
+    checkpoint_wal,
     create_schedule,
     get_schedule_by_id,
     get_schedules_by_user,
     get_schedules_by_guild,
+    get_schedules_page_by_user,
+    get_schedules_page_by_guild,
+    get_schedules_by_month,
+    get_month_schedules_page,
+    get_month_cache_stats,
     update_schedule,
     delete_schedule,
     create_reminder,
+    create_reminders,
     get_pending_reminders,
+    get_upcoming_reminders,
+    claim_due_reminders,
+    release_reminders,
+    fail_reminders,
+    get_dead_letter_reminders,
+    get_next_lease_expiry,
+    get_reminder_backlog,
     mark_reminder_sent,
+    mark_reminders_sent,
+    add_reminder_listener,
+    remove_reminder_listener,
+    get_guild_reminder_offsets,
+    set_guild_reminder_offsets,
+    get_media_cache,
+    set_media_cache,
+    purge_media_cache,
     create_bulk_schedules
 )
 
-from .models import Schedule, Reminder
+from .models import Schedule, Reminder, SchedulePage, BulkInsertResult
+from .recurrence import Recurrence, iter_schedule_occurrences
 
 __all__ = [
     # データベース操作関数
     'init_database',
+    'close_database',
+    'checkpoint_wal',
     'create_schedule',
     'get_schedule_by_id',
     'get_schedules_by_user',
     'get_schedules_by_guild',
+    'get_schedules_page_by_user',
+    'get_schedules_page_by_guild',
+    'get_schedules_by_month',
+    'get_month_schedules_page',
+    'get_month_cache_stats',
     'update_schedule',
     'delete_schedule',
     'create_reminder',
+    'create_reminders',
     'get_pending_reminders',
+    'get_upcoming_reminders',
+    'claim_due_reminders',
+    'release_reminders',
+    'fail_reminders',
+    'get_dead_letter_reminders',
+    'get_next_lease_expiry',
+    'get_reminder_backlog',
     'mark_reminder_sent',
+    'mark_reminders_sent',
+    'add_reminder_listener',
+    'remove_reminder_listener',
+    'get_guild_reminder_offsets',
+    'set_guild_reminder_offsets',
+    'get_media_cache',
+    'set_media_cache',
+    'purge_media_cache',
     'create_bulk_schedules',
     
     # モデルクラス
     'Schedule',
-    'Reminder'
+    'Reminder',
+    'SchedulePage',
+    'BulkInsertResult',
+    
+    # 繰り返し予定
+    'Recurrence',
+    'iter_schedule_occurrences'
 ]
@@ -0,0 +1,201 @@
+"""
+月単位の予定キャッシュ
+カレンダーや予定一覧で同じ月を繰り返し表示する際のDBアクセスを省く
+
+作成者: [Your Name]
+作成日: 2026-10-17
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from .models import Schedule
+
+logger = logging.getLogger(__name__)
+
+# サーバー全員分の予定を表すキー
+ALL_USERS = '*'
+
+# キャッシュキー: (サーバーID, ユーザーID または ALL_USERS, 年, 月)
+MonthKey = Tuple[str, str, int, int]
+
+
+class MonthCache:
+    """
+    (サーバー, ユーザー, 年, 月) ごとの予定リストを保持するLRU + TTLキャッシュ
+
+    予定の作成・更新・削除時は、その予定を含む月と移動先の月だけを無効化する
+    読み込み中に無効化が発生した場合、その読み込み結果は古い可能性があるため保存しない
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 300.0):
+        """
+        Args:
+            max_entries: 保持する月の最大数（超えた場合は最も古く使われた月から削除）
+            ttl: 有効期間（秒）
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: 'OrderedDict[MonthKey, Tuple[float, Tuple[Schedule, ...]]]' = OrderedDict()
+        # 予定ID → その予定を含むキー（更新・削除時に移動元の月を特定するため）
+        self._keys_by_schedule: Dict[int, Set[MonthKey]] = {}
+        # 無効化のたびに増える値（読み込み中の無効化を検出するため）
+        self._version = 0
+
+        # 統計情報
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(guild_id: str, year: int, month: int, user_id: Optional[str] = None) -> MonthKey:
+        """
+        キャッシュキーを作成
+
+        Args:
+            guild_id: サーバーID
+            year: 年
+            month: 月
+            user_id: ユーザーID（Noneの場合はサーバー全員分）
+
+        Returns:
+            キャッシュキー
+        """
+        return (str(guild_id), str(user_id) if user_id is not None else ALL_USERS, year, month)
+
+    @property
+    def version(self) -> int:
+        """現在の無効化バージョン（読み込み前に取得して put に渡す）"""
+        return self._version
+
+    def get(self, key: MonthKey) -> Optional[Tuple[Schedule, ...]]:
+        """
+        キャッシュから予定を取得
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            予定のタプル（キャッシュにない、または期限切れの場合はNone）
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                self._drop(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: MonthKey, schedules: Iterable[Schedule], version: int):
+        """
+        読み込んだ予定を保存
+
+        Args:
+            key: キャッシュキー
+            schedules: 予定リスト
+            version: 読み込み開始前に取得した version
+        """
+        if version != self._version:
+            # 読み込み中に書き込みがあったため、結果が古い可能性がある
+            return
+
+        schedules = tuple(schedules)
+        if key in self._entries:
+            self._drop(key)
+
+        self._entries[key] = (time.monotonic() + self.ttl, schedules)
+        for schedule in schedules:
+            self._keys_by_schedule.setdefault(schedule.id, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def invalidate_month(self, guild_id: str, user_id: str, year: int, month: int):
+        """
+        ユーザーの予定が追加・移動された月を無効化（サーバー全員分の同じ月も含む）
+
+        Args:
+            guild_id: サーバーID
+            user_id: 予定の所有ユーザーID
+            year: 年
+            month: 月
+        """
+        self._version += 1
+        for key in (
+            self.make_key(guild_id, year, month, user_id),
+            self.make_key(guild_id, year, month)
+        ):
+            if key in self._entries:
+                self._drop(key)
+                self.invalidations += 1
+
+    def invalidate_guild(self, guild_id: str):
+        """
+        サーバーのすべての月を無効化（繰り返し予定の作成・変更時）
+
+        Args:
+            guild_id: サーバーID
+        """
+        self._version += 1
+        guild_id = str(guild_id)
+        for key in [key for key in self._entries if key[0] == guild_id]:
+            self._drop(key)
+            self.invalidations += 1
+
+    def invalidate_schedule(self, schedule_id: int):
+        """
+        予定を含むすべての月を無効化
+
+        Args:
+            schedule_id: 予定ID
+        """
+        self._version += 1
+        for key in list(self._keys_by_schedule.get(schedule_id, ())):
+            self._drop(key)
+            self.invalidations += 1
+
+    def clear(self):
+        """
+        すべてのキャッシュを削除
+        """
+        self._version += 1
+        self._entries.clear()
+        self._keys_by_schedule.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        統計情報を取得
+
+        Returns:
+            ヒット数・ミス数・ヒット率などの辞書
+        """
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
+
+    def _drop(self, key: MonthKey):
+        """キーを削除し、予定IDからの逆引きも更新"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        for schedule in entry[1]:
+            keys = self._keys_by_schedule.get(schedule.id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_schedule[schedule.id]
@@ -6,46 +6,328 @@ SQLiteを使用した予定管理データのCRUD操作
 作成日: 2025-07-31
 """
 
-import aiosqlite
+import asyncio
+import base64
+import json
 import logging
+import os
+import socket
+import time
+import uuid
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Union
 from pathlib import Path
 
-from .models import Schedule, Reminder, INIT_SQL_STATEMENTS
+from .models import (
+    Schedule,
+    Reminder,
+    SchedulePage,
+    BulkInsertResult,
+    SCHEDULE_SELECT_SQL,
+    REMINDER_COLUMNS,
+    datetime_to_epoch,
+    epoch_to_datetime
+)
+from .pool import ConnectionPool
+from .cache import MonthCache
+from .recurrence import Recurrence, iter_schedule_occurrences
+from .write_queue import WriteQueue, WriteResult
+from .migrations import apply_migrations, get_pending_backfills, run_backfills
 
 logger = logging.getLogger(__name__)
 
 # データベースファイルのパス
 DB_PATH = Path(__file__).parent / 'schedule_bot.db'
 
-async def init_database():
+# 読み込み用接続の本数（環境変数で変更可能）
+DB_POOL_READERS = int(os.getenv('DB_POOL_READERS', 4))
+
+# ストレージプロファイル（接続ごとに適用するPRAGMA）
+# durable: 電源断でもコミット済みデータを失わない設定
+# fast: WALのコミット時fsyncを省略し、キャッシュ・mmapを大きく取る設定
+#       （電源断時に直近のコミットが失われる可能性があるが、DBは破損しない）
+STORAGE_PROFILES: Dict[str, Dict[str, Any]] = {
+    'durable': {
+        'busy_timeout': 5000,          # ロック競合時に最大5秒待機
+        'journal_mode': 'WAL',         # 読み込みと書き込みを並行実行可能にする
+        'synchronous': 'FULL',
+        'cache_size': -8192,           # 8MB（負の値はKB単位）
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+    },
+    'fast': {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -32768,          # 32MB
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+    },
+}
+
+# 使用するストレージプロファイル名（環境変数で変更可能）
+DB_STORAGE_PROFILE = os.getenv('DB_STORAGE_PROFILE', 'durable')
+
+# 書き込みをまとめてコミットするまでの追加の待ち時間（ミリ秒、環境変数で変更可能）
+# 0でもコミット中に届いた書き込みは次のトランザクションにまとめられる
+DB_GROUP_COMMIT_MS = float(os.getenv('DB_GROUP_COMMIT_MS', 0))
+
+# 月単位の予定キャッシュの最大保持数と有効期間（秒、環境変数で変更可能）
+MONTH_CACHE_SIZE = int(os.getenv('MONTH_CACHE_SIZE', 256))
+MONTH_CACHE_TTL = float(os.getenv('MONTH_CACHE_TTL', 300))
+
+# リマインダーを確保するワーカーの識別子（複数プロセスで送信する場合はプロセスごとに一意にする）
+REMINDER_WORKER_ID = os.getenv('REMINDER_WORKER_ID') or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# リマインダーを確保してから送信済みにするまでの猶予（秒）
+# 期限を過ぎても送信済みにならない場合（ワーカーの停止など）は他のワーカーが再確保する
+REMINDER_LEASE_SECONDS = int(os.getenv('REMINDER_LEASE_SECONDS', 300))
+
+# 送信に失敗したリマインダーを再送するまでの待ち時間（秒）
+# 失敗するたびに2倍にし、REMINDER_RETRY_MAX_SECONDS を上限とする
+REMINDER_RETRY_SECONDS = 60
+REMINDER_RETRY_MAX_SECONDS = 3600
+
+# 送信を試みる最大回数（環境変数で変更可能、超えたリマインダーは reminder_dead_letters に移動する）
+REMINDER_MAX_ATTEMPTS = int(os.getenv('REMINDER_MAX_ATTEMPTS', 5))
+
+# SQLiteの1文あたりのバインド変数の上限（SQLITE_MAX_VARIABLE_NUMBER の既定値、3.32.0以降）
+SQLITE_MAX_VARIABLES = 32766
+
+# 共有接続プール（init_database で開き、close_database で閉じる）
+_pool: Optional[ConnectionPool] = None
+
+# 書き込みキュー（予定・リマインダーの変更をグループコミットする）
+_write_queue: Optional[WriteQueue] = None
+
+# バックグラウンドで実行中のバックフィル
+_backfill_task: Optional[asyncio.Task] = None
+
+# カレンダー・予定一覧用の月単位キャッシュ
+_month_cache = MonthCache(max_entries=MONTH_CACHE_SIZE, ttl=MONTH_CACHE_TTL)
+
+# リマインダーの変更を受け取るリスナー（リマインダースケジューラーが登録する）
+# 以下のメソッドを持つオブジェクト:
+#   on_reminder_created(reminder_id, schedule_id, remind_datetime)
+#   on_schedule_deleted(schedule_id)
+_reminder_listeners: List[Any] = []
+
+def add_reminder_listener(listener: Any):
+    """
+    リマインダーの変更を受け取るリスナーを登録
+    
+    Args:
+        listener: on_reminder_created / on_schedule_deleted を持つオブジェクト
+    """
+    if listener not in _reminder_listeners:
+        _reminder_listeners.append(listener)
+
+def remove_reminder_listener(listener: Any):
+    """
+    リスナーの登録を解除
+    
+    Args:
+        listener: add_reminder_listener で登録したオブジェクト
+    """
+    if listener in _reminder_listeners:
+        _reminder_listeners.remove(listener)
+
+def _notify_reminder_listeners(method: str, *args: Any):
+    """登録済みのリスナーに変更を通知（リスナーの例外は書き込み側に伝えない）"""
+    for listener in list(_reminder_listeners):
+        try:
+            getattr(listener, method)(*args)
+        except Exception as e:
+            logger.error(f"リマインダーリスナーエラー ({method}): {e}")
+
+def _get_pool() -> ConnectionPool:
+    """
+    共有接続プールを取得
+    
+    Returns:
+        接続プール
+    """
+    if _pool is None or not _pool.is_open:
+        raise RuntimeError("データベースが初期化されていません。init_database() を先に呼び出してください")
+    return _pool
+
+async def _write(sql: str, params: Any = (), fetch: bool = False) -> WriteResult:
+    """
+    書き込みキュー経由でSQLを実行し、コミットされるまで待つ
+    
+    Args:
+        sql: 実行するSQL文
+        params: パラメータ
+        fetch: RETURNING 句の結果を取得するか
+    
+    Returns:
+        書き込み結果
+    """
+    if _write_queue is None or not _write_queue.is_running:
+        raise RuntimeError("データベースが初期化されていません。init_database() を先に呼び出してください")
+    return await _write_queue.execute(sql, params, fetch)
+
+async def init_database(
+    db_path: Optional[Union[str, Path]] = None,
+    profile: Optional[str] = None
+):
     """
     データベースの初期化
-    テーブルとインデックスを作成
+    共有接続プールを開き、未適用のマイグレーションを適用する
+    
+    Args:
+        db_path: データベースファイルのパス（省略時は DB_PATH）
+        profile: ストレージプロファイル名（省略時は DB_STORAGE_PROFILE）
     """
+    global _pool, _write_queue, _backfill_task
+    
     try:
-        async with aiosqlite.connect(DB_PATH) as db:
-            # テーブルとインデックスの作成
-            for sql in INIT_SQL_STATEMENTS:
-                await db.execute(sql)
+        profile = profile or DB_STORAGE_PROFILE
+        if profile not in STORAGE_PROFILES:
+            raise ValueError(
+                f"不明なストレージプロファイル: {profile} "
+                f"(使用可能: {', '.join(STORAGE_PROFILES)})"
+            )
+        
+        # 再初期化の場合は既存のプールを閉じる
+        await close_database()
+        
+        pool = ConnectionPool(
+            db_path or DB_PATH,
+            readers=DB_POOL_READERS,
+            pragmas=STORAGE_PROFILES[profile]
+        )
+        await pool.open()
+        
+        try:
+            # スキーマのマイグレーション
+            version = await apply_migrations(pool)
             
-            await db.commit()
-            logger.info(f"データベースを初期化しました: {DB_PATH}")
+            # 完了しないとクエリ結果が変わるバックフィルは先に終わらせる
+            pending = await get_pending_backfills(pool)
+            for backfill in pending:
+                if backfill.blocking:
+                    await backfill.run(pool)
+        except Exception:
+            await pool.close()
+            raise
+        
+        _pool = pool
+        _write_queue = WriteQueue(pool, flush_interval=DB_GROUP_COMMIT_MS / 1000)
+        _write_queue.start()
+        logger.info(
+            f"データベースを初期化しました: {pool.db_path} "
+            f"(スキーマ: v{version}, プロファイル: {profile})"
+        )
+        
+        # 残りのバックフィルはバックグラウンドで実行
+        background = [backfill for backfill in pending if not backfill.blocking]
+        if background:
+            _backfill_task = asyncio.create_task(run_backfills(background, pool))
             
     except Exception as e:
         logger.error(f"データベース初期化エラー: {e}")
         raise
 
+async def close_database():
+    """
+    共有接続プールを閉じる（BOT終了時に呼び出す）
+    """
+    global _pool, _write_queue, _backfill_task
+    
+    # キューに残っている書き込みをコミットしてから止める
+    if _write_queue is not None:
+        queue, _write_queue = _write_queue, None
+        await queue.stop()
+    
+    _month_cache.clear()
+    
+    # 実行中のバックフィルは中断（進捗は保存済みのため次回起動時に再開）
+    if _backfill_task is not None:
+        task, _backfill_task = _backfill_task, None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    
+    if _pool is not None:
+        pool, _pool = _pool, None
+        
+        # WALの内容をDB本体へ書き戻してから閉じる
+        try:
+            async with pool.writer() as db:
+                await db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except Exception as e:
+            logger.warning(f"終了時のWALチェックポイントに失敗: {e}")
+        
+        await pool.close()
+
+async def checkpoint_wal(mode: str = 'PASSIVE') -> Optional[Tuple[int, int, int]]:
+    """
+    WALチェックポイントを実行
+    WALファイルが際限なく大きくなるのを防ぐため定期的に呼び出す
+    
+    Args:
+        mode: チェックポイントモード (PASSIVE, FULL, RESTART, TRUNCATE)
+    
+    Returns:
+        (busy, WALのページ数, 書き戻したページ数) のタプル（失敗時はNone）
+    """
+    mode = mode.upper()
+    if mode not in ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE'):
+        raise ValueError(f"不明なチェックポイントモード: {mode}")
+    
+    try:
+        async with _get_pool().writer() as db:
+            async with db.execute(f"PRAGMA wal_checkpoint({mode})") as cursor:
+                row = await cursor.fetchone()
+        
+        busy, log_pages, checkpointed = row[0], row[1], row[2]
+        logger.debug(f"WALチェックポイント: busy={busy}, log={log_pages}, checkpointed={checkpointed}")
+        return busy, log_pages, checkpointed
+        
+    except Exception as e:
+        logger.error(f"WALチェックポイントエラー: {e}")
+        return None
+
+def _now_epoch() -> int:
+    """現在時刻のエポック秒"""
+    return int(time.time())
+
 # ==================== 予定管理 (CRUD) ====================
 
+def _recurrence_params(
+    recurrence: Optional[str],
+    start_datetime: datetime
+) -> Tuple[Optional[str], Optional[int]]:
+    """
+    繰り返しのルールを検証して保存用の値に変換
+    
+    Args:
+        recurrence: RRULE文字列（Noneまたは空文字の場合は繰り返しなし）
+        start_datetime: 最初の発生日時
+    
+    Returns:
+        (保存用のRRULE文字列, 最後の発生日時のエポック秒) のタプル
+    
+    Raises:
+        ValueError: 繰り返しのルールが不正な場合
+    """
+    if not recurrence:
+        return None, None
+    
+    rule = Recurrence.parse(recurrence)
+    return rule.to_rrule(), datetime_to_epoch(rule.last(start_datetime))
+
 async def create_schedule(
     user_id: str,
     guild_id: str,
     title: str,
     start_datetime: datetime,
     description: Optional[str] = None,
-    end_datetime: Optional[datetime] = None
+    end_datetime: Optional[datetime] = None,
+    recurrence: Optional[str] = None
 ) -> int:
     """
     新しい予定を作成
@@ -54,27 +336,45 @@ async def create_schedule(
         user_id: ユーザーID
         guild_id: サーバーID
         title: 予定タイトル
-        start_datetime: 開始日時
+        start_datetime: 開始日時（繰り返し予定の場合は最初の発生日時）
         description: 説明（オプション）
         end_datetime: 終了日時（オプション）
+        recurrence: 繰り返しのRRULE文字列（オプション、例: "FREQ=WEEKLY;COUNT=10"）
     
     Returns:
         作成された予定のID
+    
+    Raises:
+        ValueError: 繰り返しのルールが不正な場合
     """
     try:
-        async with aiosqlite.connect(DB_PATH) as db:
-            cursor = await db.execute(
-                """
-                INSERT INTO schedules (user_id, guild_id, title, description, start_datetime, end_datetime)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (user_id, guild_id, title, description, start_datetime, end_datetime)
+        recurrence, recurrence_end = _recurrence_params(recurrence, start_datetime)
+        
+        result = await _write(
+            """
+            INSERT INTO schedules (
+                user_id, guild_id, title, description,
+                start_datetime, end_datetime, created_at, updated_at,
+                recurrence, recurrence_end
             )
-            await db.commit()
-            
-            schedule_id = cursor.lastrowid
-            logger.info(f"予定を作成しました: ID={schedule_id}, タイトル='{title}'")
-            return schedule_id
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                user_id, guild_id, title, description,
+                datetime_to_epoch(start_datetime), datetime_to_epoch(end_datetime),
+                _now_epoch(), _now_epoch(),
+                recurrence, recurrence_end
+            )
+        )
+        
+        schedule_id = result.lastrowid
+        if recurrence:
+            # 以降のすべての月に現れるため、サーバーのキャッシュをまとめて無効化
+            _month_cache.invalidate_guild(guild_id)
+        else:
+            _month_cache.invalidate_month(guild_id, user_id, start_datetime.year, start_datetime.month)
+        logger.info(f"予定を作成しました: ID={schedule_id}, タイトル='{title}'")
+        return schedule_id
             
     except Exception as e:
         logger.error(f"予定作成エラー: {e}")
@@ -91,27 +391,15 @@ async def get_schedule_by_id(schedule_id: int) -> Optional[Schedule]:
         予定オブジェクト（存在しない場合はNone）
     """
     try:
-        async with aiosqlite.connect(DB_PATH) as db:
-            db.row_factory = aiosqlite.Row  # 辞書形式でデータを取得
-            
+        async with _get_pool().reader() as db:
             async with db.execute(
-                "SELECT * FROM schedules WHERE id = ? AND is_active = TRUE",
+                f"SELECT {SCHEDULE_SELECT_SQL} FROM schedules WHERE id = ? AND is_active = TRUE",
                 (schedule_id,)
             ) as cursor:
                 row = await cursor.fetchone()
                 
                 if row:
-                    data = dict(row)
-                    # 日時文字列をdatetimeオブジェクトに変換
-                    data['start_datetime'] = datetime.fromisoformat(data['start_datetime'])
-                    if data['end_datetime']:
-                        data['end_datetime'] = datetime.fromisoformat(data['end_datetime'])
-                    if data['created_at']:
-                        data['created_at'] = datetime.fromisoformat(data['created_at'])
-                    if data['updated_at']:
-                        data['updated_at'] = datetime.fromisoformat(data['updated_at'])
-                    
-                    return Schedule(data)
+                    return Schedule.from_row(row)
                 
                 return None
                 
@@ -119,6 +407,131 @@ async def get_schedule_by_id(schedule_id: int) -> Optional[Schedule]:
         logger.error(f"予定取得エラー (ID: {schedule_id}): {e}")
         return None
 
+async def _query_schedules(
+    where: str,
+    params: List[Any],
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    limit: int
+) -> List[Schedule]:
+    """
+    条件に一致する予定を開始日時順に取得
+    
+    Args:
+        where: 絞り込み条件
+        params: 絞り込み条件のパラメータ
+        start_date: 取得開始日（オプション）
+        end_date: 取得終了日（オプション）
+        limit: 取得件数の上限
+    
+    Returns:
+        予定リスト（繰り返し予定は範囲内の発生ごとに展開）
+    """
+    query = f"SELECT {SCHEDULE_SELECT_SQL} FROM schedules WHERE {where} AND recurrence IS NULL"
+    params_for_series = list(params)
+    params = list(params)
+    
+    # 日付範囲の条件追加
+    if start_date:
+        query += " AND start_datetime >= ?"
+        params.append(datetime_to_epoch(start_date))
+    
+    if end_date:
+        query += " AND start_datetime <= ?"
+        params.append(datetime_to_epoch(end_date))
+    
+    # ページングと同じ並び順にする（キャッシュした月から先頭ページを作れるように）
+    query += " ORDER BY start_datetime ASC, id ASC LIMIT ?"
+    params.append(limit)
+    
+    async with _get_pool().reader() as db:
+        async with db.execute(query, params) as cursor:
+            rows = await cursor.fetchall()
+        series = await _query_series(db, where, params_for_series, start_date, end_date)
+    
+    schedules = [Schedule.from_row(row) for row in rows]
+    if series:
+        schedules = _merge_occurrences(schedules, series, start_date, end_date, None, limit)
+    return schedules
+
+async def _query_series(
+    db: Any,
+    where: str,
+    params: List[Any],
+    start_date: Optional[datetime],
+    end_date: Optional[datetime]
+) -> List[Schedule]:
+    """
+    条件に一致し、期間内に発生する可能性のある繰り返し予定を取得
+    
+    Args:
+        db: 読み込み用接続
+        where: 絞り込み条件
+        params: 絞り込み条件のパラメータ
+        start_date: 取得開始日（オプション）
+        end_date: 取得終了日（オプション）
+    
+    Returns:
+        繰り返し予定（展開前）のリスト
+    """
+    query = f"SELECT {SCHEDULE_SELECT_SQL} FROM schedules WHERE {where} AND recurrence IS NOT NULL"
+    params = list(params)
+    
+    if end_date:
+        query += " AND start_datetime <= ?"
+        params.append(datetime_to_epoch(end_date))
+    
+    if start_date:
+        query += " AND (recurrence_end IS NULL OR recurrence_end >= ?)"
+        params.append(datetime_to_epoch(start_date))
+    
+    async with db.execute(query, params) as cursor:
+        rows = await cursor.fetchall()
+    
+    return [Schedule.from_row(row) for row in rows]
+
+def _merge_occurrences(
+    schedules: List[Schedule],
+    series: List[Schedule],
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    after: Optional[Tuple[int, int]],
+    limit: int
+) -> List[Schedule]:
+    """
+    繰り返し予定を期間内の発生ごとに展開し、通常の予定と (開始日時, ID) 順に並べる
+    
+    Args:
+        schedules: 通常の予定（開始日時順）
+        series: 繰り返し予定
+        start_date: 取得開始日（オプション）
+        end_date: 取得終了日（オプション）
+        after: この (開始日時のエポック秒, 予定ID) より後のものだけを返す（ページング用）
+        limit: 取得件数の上限
+    
+    Returns:
+        予定リスト
+    """
+    merged = list(schedules)
+    first = start_date
+    if after is not None:
+        cursor_start = epoch_to_datetime(after[0])
+        first = max(first, cursor_start) if first else cursor_start
+    
+    for schedule in series:
+        taken = 0
+        for occurrence in iter_schedule_occurrences(schedule, first, end_date):
+            if after is not None and (datetime_to_epoch(occurrence.start_datetime), occurrence.id) <= after:
+                continue
+            merged.append(occurrence)
+            taken += 1
+            # 上限を超える分は並べ替え後に必ず切り捨てられる
+            if taken >= limit:
+                break
+    
+    merged.sort(key=lambda schedule: (schedule.start_datetime, schedule.id))
+    return merged[:limit]
+
 async def get_schedules_by_user(
     user_id: str,
     guild_id: str,
@@ -140,46 +553,11 @@ async def get_schedules_by_user(
         予定リスト
     """
     try:
-        async with aiosqlite.connect(DB_PATH) as db:
-            db.row_factory = aiosqlite.Row
-            
-            # クエリの構築
-            query = """
-                SELECT * FROM schedules 
-                WHERE user_id = ? AND guild_id = ? AND is_active = TRUE
-            """
-            params = [user_id, guild_id]
-            
-            # 日付範囲の条件追加
-            if start_date:
-                query += " AND start_datetime >= ?"
-                params.append(start_date)
-            
-            if end_date:
-                query += " AND start_datetime <= ?"
-                params.append(end_date)
-            
-            query += " ORDER BY start_datetime ASC LIMIT ?"
-            params.append(limit)
-            
-            async with db.execute(query, params) as cursor:
-                rows = await cursor.fetchall()
-                
-                schedules = []
-                for row in rows:
-                    data = dict(row)
-                    # 日時文字列の変換
-                    data['start_datetime'] = datetime.fromisoformat(data['start_datetime'])
-                    if data['end_datetime']:
-                        data['end_datetime'] = datetime.fromisoformat(data['end_datetime'])
-                    if data['created_at']:
-                        data['created_at'] = datetime.fromisoformat(data['created_at'])
-                    if data['updated_at']:
-                        data['updated_at'] = datetime.fromisoformat(data['updated_at'])
-                    
-                    schedules.append(Schedule(data))
-                
-                return schedules
+        return await _query_schedules(
+            "user_id = ? AND guild_id = ? AND is_active = TRUE",
+            [user_id, guild_id],
+            start_date, end_date, limit
+        )
                 
     except Exception as e:
         logger.error(f"予定一覧取得エラー (ユーザー: {user_id}): {e}")
@@ -204,215 +582,546 @@ async def get_schedules_by_guild(
         予定リスト
     """
     try:
-        async with aiosqlite.connect(DB_PATH) as db:
-            db.row_factory = aiosqlite.Row
-            
-            query = """
-                SELECT * FROM schedules 
-                WHERE guild_id = ? AND is_active = TRUE
-            """
-            params = [guild_id]
-            
-            if start_date:
-                query += " AND start_datetime >= ?"
-                params.append(start_date)
-            
-            if end_date:
-                query += " AND start_datetime <= ?"
-                params.append(end_date)
-            
-            query += " ORDER BY start_datetime ASC LIMIT ?"
-            params.append(limit)
-            
-            async with db.execute(query, params) as cursor:
-                rows = await cursor.fetchall()
-                
-                schedules = []
-                for row in rows:
-                    data = dict(row)
-                    data['start_datetime'] = datetime.fromisoformat(data['start_datetime'])
-                    if data['end_datetime']:
-                        data['end_datetime'] = datetime.fromisoformat(data['end_datetime'])
-                    if data['created_at']:
-                        data['created_at'] = datetime.fromisoformat(data['created_at'])
-                    if data['updated_at']:
-                        data['updated_at'] = datetime.fromisoformat(data['updated_at'])
-                    
-                    schedules.append(Schedule(data))
-                
-                return schedules
+        return await _query_schedules(
+            "guild_id = ? AND is_active = TRUE",
+            [guild_id],
+            start_date, end_date, limit
+        )
                 
     except Exception as e:
         logger.error(f"サーバー予定一覧取得エラー (サーバー: {guild_id}): {e}")
         return []
 
-async def update_schedule(
-    schedule_id: int,
-    user_id: str,
-    title: Optional[str] = None,
-    description: Optional[str] = None,
-    start_datetime: Optional[datetime] = None,
-    end_datetime: Optional[datetime] = None
-) -> bool:
+def month_range(year: int, month: int) -> Tuple[datetime, datetime]:
     """
-    予定を更新
+    月の開始・終了日時を計算
     
     Args:
-        schedule_id: 予定ID
-        user_id: ユーザーID（権限チェック用）
-        title: 新しいタイトル（オプション）
-        description: 新しい説明（オプション）
-        start_datetime: 新しい開始日時（オプション）
-        end_datetime: 新しい終了日時（オプション）
+        year: 年
+        month: 月
     
     Returns:
-        更新成功の可否
+        (月初 0:00:00, 月末 23:59:59) のタプル
     """
-    try:
-        # 更新項目の構築
-        updates = []
-        params = []
-        
-        if title is not None:
-            updates.append("title = ?")
-            params.append(title)
-        
-        if description is not None:
-            updates.append("description = ?")
-            params.append(description)
-        
-        if start_datetime is not None:
-            updates.append("start_datetime = ?")
-            params.append(start_datetime)
-        
-        if end_datetime is not None:
-            updates.append("end_datetime = ?")
-            params.append(end_datetime)
-        
-        if not updates:
-            logger.warning("更新項目が指定されていません")
-            return False
-        
-        updates.append("updated_at = CURRENT_TIMESTAMP")
-        params.extend([schedule_id, user_id])
-        
-        async with aiosqlite.connect(DB_PATH) as db:
-            cursor = await db.execute(
-                f"""
-                UPDATE schedules 
-                SET {', '.join(updates)}
-                WHERE id = ? AND user_id = ? AND is_active = TRUE
-                """,
-                params
-            )
-            await db.commit()
-            
-            if cursor.rowcount > 0:
-                logger.info(f"予定を更新しました: ID={schedule_id}")
-                return True
-            else:
-                logger.warning(f"予定の更新に失敗（存在しないか権限なし）: ID={schedule_id}")
-                return False
-                
-    except Exception as e:
-        logger.error(f"予定更新エラー: {e}")
-        return False
+    start_date = datetime(year, month, 1)
+    if month == 12:
+        end_date = datetime(year + 1, 1, 1) - timedelta(seconds=1)
+    else:
+        end_date = datetime(year, month + 1, 1) - timedelta(seconds=1)
+    return start_date, end_date
 
-async def delete_schedule(schedule_id: int, user_id: str) -> bool:
+async def get_schedules_by_month(
+    guild_id: str,
+    year: int,
+    month: int,
+    user_id: Optional[str] = None
+) -> List[Schedule]:
     """
-    予定を削除（論理削除）
+    1か月分の予定を取得（月単位キャッシュ経由）
+    件数の上限は get_schedules_by_user / get_schedules_by_guild と同じ
     
     Args:
-        schedule_id: 予定ID
-        user_id: ユーザーID（権限チェック用）
+        guild_id: サーバーID
+        year: 年
+        month: 月
+        user_id: ユーザーID（Noneの場合はサーバー全員分）
     
     Returns:
-        削除成功の可否
+        予定リスト
     """
+    key = MonthCache.make_key(guild_id, year, month, user_id)
+    cached = _month_cache.get(key)
+    if cached is not None:
+        return list(cached)
+    
     try:
-        async with aiosqlite.connect(DB_PATH) as db:
-            cursor = await db.execute(
-                """
-                UPDATE schedules 
-                SET is_active = FALSE, updated_at = CURRENT_TIMESTAMP
-                WHERE id = ? AND user_id = ? AND is_active = TRUE
-                """,
-                (schedule_id, user_id)
+        version = _month_cache.version
+        start_date, end_date = month_range(year, month)
+        
+        if user_id is None:
+            schedules = await _query_schedules(
+                "guild_id = ? AND is_active = TRUE",
+                [guild_id],
+                start_date, end_date, 100
             )
-            await db.commit()
-            
-            if cursor.rowcount > 0:
-                logger.info(f"予定を削除しました: ID={schedule_id}")
-                return True
-            else:
-                logger.warning(f"予定の削除に失敗（存在しないか権限なし）: ID={schedule_id}")
-                return False
-                
+        else:
+            schedules = await _query_schedules(
+                "user_id = ? AND guild_id = ? AND is_active = TRUE",
+                [user_id, guild_id],
+                start_date, end_date, 50
+            )
+        
+        _month_cache.put(key, schedules, version)
+        return schedules
+        
     except Exception as e:
-        logger.error(f"予定削除エラー: {e}")
-        return False
-
-# ==================== リマインダー機能 ====================
+        logger.error(f"月間予定取得エラー (サーバー: {guild_id}, {year}年{month}月): {e}")
+        return []
 
-async def create_reminder(
-    schedule_id: int,
-    user_id: str,
+async def get_month_schedules_page(
     guild_id: str,
-    channel_id: str,
-    remind_datetime: datetime,
-    message: Optional[str] = None
-) -> int:
+    year: int,
+    month: int,
+    user_id: Optional[str] = None,
+    page_size: int = 10
+) -> SchedulePage:
     """
-    リマインダーを作成
+    1か月分の予定一覧の先頭ページを取得（月単位キャッシュ経由）
+    次のページ以降は next_cursor を get_schedules_page_by_user / get_schedules_page_by_guild に渡して取得する
     
     Args:
-        schedule_id: 対象予定ID
-        user_id: ユーザーID
         guild_id: サーバーID
-        channel_id: 通知チャンネルID
-        remind_datetime: リマインダー日時
-        message: カスタムメッセージ
+        year: 年
+        month: 月
+        user_id: ユーザーID（Noneの場合はサーバー全員分）
+        page_size: 1ページの件数
     
     Returns:
-        作成されたリマインダーID
+        予定の1ページ
     """
-    try:
-        async with aiosqlite.connect(DB_PATH) as db:
-            cursor = await db.execute(
-                """
-                INSERT INTO reminders (schedule_id, user_id, guild_id, channel_id, remind_datetime, message)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (schedule_id, user_id, guild_id, channel_id, remind_datetime, message)
-            )
-            await db.commit()
-            
-            reminder_id = cursor.lastrowid
-            logger.info(f"リマインダーを作成しました: ID={reminder_id}")
-            return reminder_id
-            
-    except Exception as e:
-        logger.error(f"リマインダー作成エラー: {e}")
-        raise
+    schedules = await get_schedules_by_month(guild_id, year, month, user_id)
+    items = schedules[:page_size]
+    next_cursor = _encode_cursor(items[-1]) if len(schedules) > page_size else None
+    return SchedulePage(items, next_cursor)
 
-async def get_pending_reminders() -> List[Dict[str, Any]]:
+def get_month_cache_stats() -> Dict[str, Any]:
     """
-    送信待ちのリマインダーを取得
+    月単位キャッシュの統計情報を取得
     
     Returns:
-        送信待ちリマインダーリスト
+        ヒット数・ミス数・ヒット率などの辞書
     """
-    try:
-        current_time = datetime.now()
-        
-        async with aiosqlite.connect(DB_PATH) as db:
-            db.row_factory = aiosqlite.Row
-            
+    return _month_cache.stats()
+
+def _encode_cursor(schedule: Schedule) -> str:
+    """
+    ページングカーソルを作成（最後に返した予定の (開始日時, ID) を埋め込む）
+    
+    Args:
+        schedule: ページの最後の予定
+    
+    Returns:
+        不透明なカーソル文字列
+    """
+    raw = f"{datetime_to_epoch(schedule.start_datetime)}:{schedule.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def _decode_cursor(cursor: str) -> Tuple[int, int]:
+    """
+    ページングカーソルを解析
+    
+    Args:
+        cursor: _encode_cursor で作成したカーソル
+    
+    Returns:
+        (開始日時のエポック秒, 予定ID) のタプル
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        start, schedule_id = base64.urlsafe_b64decode(padded.encode()).decode().split(':')
+        return int(start), int(schedule_id)
+    except Exception:
+        raise ValueError(f"不正なカーソル: {cursor}")
+
+async def _get_schedules_page(
+    where: str,
+    params: List[Any],
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    cursor: Optional[str],
+    page_size: int
+) -> SchedulePage:
+    """
+    (start_datetime, id) をキーにしたキーセットページングで予定を1ページ分取得
+    OFFSET を使わないため、何ページ目でもインデックス上の必要な範囲だけを読む
+    
+    Args:
+        where: 絞り込み条件
+        params: 絞り込み条件のパラメータ
+        start_date: 取得開始日（オプション）
+        end_date: 取得終了日（オプション）
+        cursor: 前のページの next_cursor（最初のページはNone）
+        page_size: 1ページの件数
+    
+    Returns:
+        予定の1ページ
+    """
+    query = f"SELECT {SCHEDULE_SELECT_SQL} FROM schedules WHERE {where} AND recurrence IS NULL"
+    params_for_series = list(params)
+    params = list(params)
+    
+    if start_date:
+        query += " AND start_datetime >= ?"
+        params.append(datetime_to_epoch(start_date))
+    
+    if end_date:
+        query += " AND start_datetime <= ?"
+        params.append(datetime_to_epoch(end_date))
+    
+    after = None
+    if cursor:
+        after = _decode_cursor(cursor)
+        query += " AND (start_datetime, id) > (?, ?)"
+        params.extend(after)
+    
+    # 次のページの有無を判定するため1件多く取得する
+    query += " ORDER BY start_datetime ASC, id ASC LIMIT ?"
+    params.append(page_size + 1)
+    
+    async with _get_pool().reader() as db:
+        async with db.execute(query, params) as db_cursor:
+            rows = await db_cursor.fetchall()
+        series = await _query_series(db, where, params_for_series, start_date, end_date)
+    
+    schedules = [Schedule.from_row(row) for row in rows]
+    if series:
+        schedules = _merge_occurrences(schedules, series, start_date, end_date, after, page_size + 1)
+    
+    items = schedules[:page_size]
+    next_cursor = _encode_cursor(items[-1]) if len(schedules) > page_size else None
+    return SchedulePage(items, next_cursor)
+
+async def get_schedules_page_by_user(
+    user_id: str,
+    guild_id: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    page_size: int = 10
+) -> SchedulePage:
+    """
+    ユーザーの予定一覧を1ページ分取得
+    
+    Args:
+        user_id: ユーザーID
+        guild_id: サーバーID
+        start_date: 取得開始日（オプション）
+        end_date: 取得終了日（オプション）
+        cursor: 前のページの next_cursor（最初のページはNone）
+        page_size: 1ページの件数
+    
+    Returns:
+        予定の1ページ
+    """
+    try:
+        return await _get_schedules_page(
+            "user_id = ? AND guild_id = ? AND is_active = TRUE",
+            [user_id, guild_id],
+            start_date, end_date, cursor, page_size
+        )
+        
+    except Exception as e:
+        logger.error(f"予定ページ取得エラー (ユーザー: {user_id}): {e}")
+        return SchedulePage([])
+
+async def get_schedules_page_by_guild(
+    guild_id: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    page_size: int = 10
+) -> SchedulePage:
+    """
+    サーバー全体の予定一覧を1ページ分取得
+    
+    Args:
+        guild_id: サーバーID
+        start_date: 取得開始日（オプション）
+        end_date: 取得終了日（オプション）
+        cursor: 前のページの next_cursor（最初のページはNone）
+        page_size: 1ページの件数
+    
+    Returns:
+        予定の1ページ
+    """
+    try:
+        return await _get_schedules_page(
+            "guild_id = ? AND is_active = TRUE",
+            [guild_id],
+            start_date, end_date, cursor, page_size
+        )
+        
+    except Exception as e:
+        logger.error(f"サーバー予定ページ取得エラー (サーバー: {guild_id}): {e}")
+        return SchedulePage([])
+
+async def update_schedule(
+    schedule_id: int,
+    user_id: str,
+    title: Optional[str] = None,
+    description: Optional[str] = None,
+    start_datetime: Optional[datetime] = None,
+    end_datetime: Optional[datetime] = None,
+    recurrence: Optional[str] = None
+) -> bool:
+    """
+    予定を更新
+    
+    Args:
+        schedule_id: 予定ID
+        user_id: ユーザーID（権限チェック用）
+        title: 新しいタイトル（オプション）
+        description: 新しい説明（オプション）
+        start_datetime: 新しい開始日時（オプション、繰り返し予定の場合は最初の発生日時）
+        end_datetime: 新しい終了日時（オプション）
+        recurrence: 新しい繰り返しのRRULE文字列（オプション、空文字で繰り返しを解除）
+    
+    Returns:
+        更新成功の可否
+    """
+    try:
+        # 更新項目の構築
+        updates = []
+        params = []
+        was_recurring = False
+        
+        if recurrence is not None or start_datetime is not None:
+            # 最後の発生日時は最初の発生日時とルールの両方から決まる
+            current = await get_schedule_by_id(schedule_id)
+            if current is None or current.user_id != user_id:
+                logger.warning(f"予定の更新に失敗（存在しないか権限なし）: ID={schedule_id}")
+                return False
+            
+            was_recurring = current.recurrence is not None
+            rule = current.recurrence if recurrence is None else recurrence
+            if rule:
+                rule, recurrence_end = _recurrence_params(rule, start_datetime or current.start_datetime)
+                updates.append("recurrence = ?, recurrence_end = ?")
+                params.extend([rule, recurrence_end])
+            elif was_recurring:
+                updates.append("recurrence = NULL, recurrence_end = NULL")
+        
+        if title is not None:
+            updates.append("title = ?")
+            params.append(title)
+        
+        if description is not None:
+            updates.append("description = ?")
+            params.append(description)
+        
+        if start_datetime is not None:
+            updates.append("start_datetime = ?")
+            params.append(datetime_to_epoch(start_datetime))
+        
+        if end_datetime is not None:
+            updates.append("end_datetime = ?")
+            params.append(datetime_to_epoch(end_datetime))
+        
+        if not updates:
+            logger.warning("更新項目が指定されていません")
+            return False
+        
+        updates.append("updated_at = ?")
+        params.extend([_now_epoch(), schedule_id, user_id])
+        
+        result = await _write(
+            f"""
+            UPDATE schedules 
+            SET {', '.join(updates)}
+            WHERE id = ? AND user_id = ? AND is_active = TRUE
+            RETURNING guild_id, start_datetime, recurrence
+            """,
+            params,
+            fetch=True
+        )
+        
+        if result.rows:
+            # 移動元の月と移動先の月のキャッシュを無効化
+            guild_id, start, new_recurrence = result.rows[0]
+            start = epoch_to_datetime(start)
+            _month_cache.invalidate_schedule(schedule_id)
+            if was_recurring or new_recurrence:
+                _month_cache.invalidate_guild(guild_id)
+            else:
+                _month_cache.invalidate_month(guild_id, user_id, start.year, start.month)
+            logger.info(f"予定を更新しました: ID={schedule_id}")
+            return True
+        else:
+            logger.warning(f"予定の更新に失敗（存在しないか権限なし）: ID={schedule_id}")
+            return False
+                
+    except Exception as e:
+        logger.error(f"予定更新エラー: {e}")
+        return False
+
+async def delete_schedule(schedule_id: int, user_id: str) -> bool:
+    """
+    予定を削除（論理削除）
+    
+    Args:
+        schedule_id: 予定ID
+        user_id: ユーザーID（権限チェック用）
+    
+    Returns:
+        削除成功の可否
+    """
+    try:
+        result = await _write(
+            """
+            UPDATE schedules 
+            SET is_active = FALSE, updated_at = ?
+            WHERE id = ? AND user_id = ? AND is_active = TRUE
+            """,
+            (_now_epoch(), schedule_id, user_id)
+        )
+        
+        if result.rowcount > 0:
+            _month_cache.invalidate_schedule(schedule_id)
+            _notify_reminder_listeners('on_schedule_deleted', schedule_id)
+            logger.info(f"予定を削除しました: ID={schedule_id}")
+            return True
+        else:
+            logger.warning(f"予定の削除に失敗（存在しないか権限なし）: ID={schedule_id}")
+            return False
+                
+    except Exception as e:
+        logger.error(f"予定削除エラー: {e}")
+        return False
+
+# ==================== リマインダー機能 ====================
+
+async def create_reminder(
+    schedule_id: int,
+    user_id: str,
+    guild_id: str,
+    channel_id: str,
+    remind_datetime: datetime,
+    message: Optional[str] = None,
+    recur_offset: Optional[int] = None
+) -> int:
+    """
+    リマインダーを作成
+    
+    Args:
+        schedule_id: 対象予定ID
+        user_id: ユーザーID
+        guild_id: サーバーID
+        channel_id: 通知チャンネルID
+        remind_datetime: リマインダー日時
+        message: カスタムメッセージ
+        recur_offset: 繰り返し予定の場合、発生日時の何秒前に通知するか
+            （送信済みになると次の発生日時のリマインダーが作成される）
+    
+    Returns:
+        作成されたリマインダーID
+    """
+    try:
+        result = await _write(
+            """
+            INSERT INTO reminders (
+                schedule_id, user_id, guild_id, channel_id, remind_datetime, message, created_at,
+                recur_offset
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                schedule_id, user_id, guild_id, channel_id,
+                datetime_to_epoch(remind_datetime), message, _now_epoch(),
+                recur_offset
+            )
+        )
+        
+        reminder_id = result.lastrowid
+        _notify_reminder_listeners('on_reminder_created', reminder_id, schedule_id, remind_datetime)
+        logger.info(f"リマインダーを作成しました: ID={reminder_id}")
+        return reminder_id
+            
+    except Exception as e:
+        logger.error(f"リマインダー作成エラー: {e}")
+        raise
+
+# 一括作成で挿入するリマインダーの列
+_REMINDER_INSERT_COLUMNS = (
+    'schedule_id', 'user_id', 'guild_id', 'channel_id', 'remind_datetime', 'message', 'created_at',
+    'recur_offset'
+)
+_REMINDER_ROW_SQL = '(' + ', '.join('?' * len(_REMINDER_INSERT_COLUMNS)) + ')'
+
+async def create_reminders(reminders: List[Dict[str, Any]]) -> List[int]:
+    """
+    複数のリマインダーを1回の INSERT（1トランザクション）で作成
+    すべて作成されるか、1件も作成されないかのどちらかになる
+    
+    Args:
+        reminders: create_reminder の引数と同じキーを持つ辞書のリスト
+            （schedule_id, user_id, guild_id, channel_id, remind_datetime, message, recur_offset）
+    
+    Returns:
+        作成されたリマインダーIDのリスト（reminders と同じ順）
+    """
+    if not reminders:
+        return []
+    
+    try:
+        if len(reminders) * len(_REMINDER_INSERT_COLUMNS) > SQLITE_MAX_VARIABLES:
+            raise ValueError(f"一度に作成できるリマインダーが多すぎます: {len(reminders)}件")
+        
+        now = _now_epoch()
+        params = []
+        for data in reminders:
+            params.extend((
+                data['schedule_id'], data['user_id'], data['guild_id'], data['channel_id'],
+                datetime_to_epoch(data['remind_datetime']), data.get('message'), now,
+                data.get('recur_offset')
+            ))
+        
+        result = await _write(
+            f"INSERT INTO reminders ({', '.join(_REMINDER_INSERT_COLUMNS)}) VALUES "
+            + ', '.join([_REMINDER_ROW_SQL] * len(reminders)) + " RETURNING id",
+            params,
+            fetch=True
+        )
+        
+        # RETURNING の順序は保証されないが、1文の中で採番されるIDは挿入順に増加する
+        reminder_ids = sorted(row[0] for row in result.rows)
+        for reminder_id, data in zip(reminder_ids, reminders):
+            _notify_reminder_listeners(
+                'on_reminder_created', reminder_id, data['schedule_id'], data['remind_datetime']
+            )
+        logger.info(f"リマインダーを{len(reminder_ids)}件作成しました: ID={reminder_ids}")
+        return reminder_ids
+        
+    except Exception as e:
+        logger.error(f"リマインダー一括作成エラー: {e}")
+        raise
+
+# 送信待ちリマインダーの取得列（リマインダーの列 + 予定のタイトル・開始日時 + 繰り返しの通知オフセット）
+_PENDING_REMINDER_SELECT_SQL = f"""
+    SELECT {', '.join('r.' + column for column in REMINDER_COLUMNS)}, s.title, s.start_datetime, r.recur_offset
+    FROM reminders r
+    JOIN schedules s ON r.schedule_id = s.id
+"""
+
+def _pending_reminder_dicts(rows: List[Tuple[Any, ...]]) -> List[Dict[str, Any]]:
+    """_PENDING_REMINDER_SELECT_SQL の行を送信用の辞書に変換"""
+    reminders = []
+    column_count = len(REMINDER_COLUMNS)
+    for row in rows:
+        data = Reminder.from_row(row[:column_count]).to_dict()
+        data['title'] = row[column_count]
+        recur_offset = row[column_count + 2]
+        if recur_offset is None:
+            data['start_datetime'] = epoch_to_datetime(row[column_count + 1])
+        else:
+            # 繰り返し予定は、このリマインダーが対象とする発生日時を開始日時とする
+            data['start_datetime'] = data['remind_datetime'] + timedelta(seconds=recur_offset)
+        data['recur_offset'] = recur_offset
+        reminders.append(data)
+    return reminders
+
+async def get_pending_reminders() -> List[Dict[str, Any]]:
+    """
+    送信待ちのリマインダーを取得
+    
+    Returns:
+        送信待ちリマインダーリスト
+    """
+    try:
+        current_time = _now_epoch()
+        
+        async with _get_pool().reader() as db:
             async with db.execute(
-                """
-                SELECT r.*, s.title, s.start_datetime
-                FROM reminders r
-                JOIN schedules s ON r.schedule_id = s.id
+                _PENDING_REMINDER_SELECT_SQL + """
                 WHERE r.is_sent = FALSE 
                 AND r.remind_datetime <= ?
                 AND s.is_active = TRUE
@@ -422,19 +1131,369 @@ async def get_pending_reminders() -> List[Dict[str, Any]]:
             ) as cursor:
                 rows = await cursor.fetchall()
                 
-                reminders = []
-                for row in rows:
-                    data = dict(row)
-                    data['remind_datetime'] = datetime.fromisoformat(data['remind_datetime'])
-                    data['start_datetime'] = datetime.fromisoformat(data['start_datetime'])
-                    reminders.append(data)
-                
-                return reminders
+                return _pending_reminder_dicts(rows)
                 
     except Exception as e:
         logger.error(f"リマインダー取得エラー: {e}")
         return []
 
+async def claim_due_reminders(
+    limit: int = 100,
+    worker_id: Optional[str] = None,
+    lease_seconds: Optional[int] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    通知日時になったリマインダーを送信用に確保（リース）して取得
+    確保は1文のUPDATEで行うため、複数のワーカーが同時に呼び出しても同じリマインダーを確保することはない
+    
+    Args:
+        limit: 確保する最大件数
+        worker_id: ワーカーID（省略時は REMINDER_WORKER_ID）
+        lease_seconds: 確保の有効期間（秒、省略時は REMINDER_LEASE_SECONDS）
+        due_after: この日時以降の通知日時のものだけを確保（省略時は制限なし）
+        due_before: この日時以前の通知日時のものだけを確保（省略時は現在時刻）
+    
+    Returns:
+        確保した送信待ちリマインダーリスト（attempt_count を含む）
+    """
+    worker_id = worker_id or REMINDER_WORKER_ID
+    now = _now_epoch()
+    
+    try:
+        result = await _write(
+            """
+            UPDATE reminders
+            SET claimed_by = ?, lease_expires = ?, attempt_count = attempt_count + 1
+            WHERE id IN (
+                SELECT r.id FROM reminders r
+                JOIN schedules s ON r.schedule_id = s.id
+                WHERE r.is_sent = FALSE
+                AND r.remind_datetime BETWEEN ? AND ?
+                AND (r.lease_expires IS NULL OR r.lease_expires <= ?)
+                AND s.is_active = TRUE
+                ORDER BY r.remind_datetime ASC
+                LIMIT ?
+            )
+            RETURNING id, attempt_count
+            """,
+            (
+                worker_id, now + (lease_seconds or REMINDER_LEASE_SECONDS),
+                datetime_to_epoch(due_after) if due_after else 0,
+                min(now, datetime_to_epoch(due_before)) if due_before else now,
+                now, limit
+            ),
+            fetch=True
+        )
+        if not result.rows:
+            return []
+        
+        attempts = dict(result.rows)
+        async with _get_pool().reader() as db:
+            async with db.execute(
+                _PENDING_REMINDER_SELECT_SQL + f"""
+                WHERE r.id IN ({', '.join('?' * len(attempts))})
+                ORDER BY r.remind_datetime ASC
+                """,
+                list(attempts)
+            ) as cursor:
+                rows = await cursor.fetchall()
+        
+        reminders = _pending_reminder_dicts(rows)
+        for reminder in reminders:
+            reminder['attempt_count'] = attempts[reminder['id']]
+        return reminders
+        
+    except Exception as e:
+        logger.error(f"リマインダー確保エラー: {e}")
+        return []
+
+async def release_reminders(
+    reminder_ids: List[int],
+    worker_id: Optional[str] = None,
+    retry_after: Optional[int] = None
+) -> int:
+    """
+    送信できなかったリマインダーの確保を解除
+    retry_after 秒後までは再確保されない
+    
+    Args:
+        reminder_ids: リマインダーIDのリスト
+        worker_id: 確保したワーカーID（省略時は REMINDER_WORKER_ID）
+        retry_after: 再送までの待ち時間（秒、省略時は REMINDER_RETRY_SECONDS）
+    
+    Returns:
+        解除された件数
+    """
+    worker_id = worker_id or REMINDER_WORKER_ID
+    retry_at = _now_epoch() + (REMINDER_RETRY_SECONDS if retry_after is None else retry_after)
+    released = 0
+    
+    try:
+        for start in range(0, len(reminder_ids), SQLITE_MAX_VARIABLES - 2):
+            chunk = reminder_ids[start:start + SQLITE_MAX_VARIABLES - 2]
+            result = await _write(
+                f"""
+                UPDATE reminders SET claimed_by = NULL, lease_expires = ?
+                WHERE id IN ({', '.join('?' * len(chunk))}) AND claimed_by = ? AND is_sent = FALSE
+                """,
+                [retry_at, *chunk, worker_id]
+            )
+            released += result.rowcount
+        
+        return released
+        
+    except Exception as e:
+        logger.error(f"リマインダー確保解除エラー: {e}")
+        return released
+
+async def fail_reminders(
+    reminder_ids: List[int],
+    worker_id: Optional[str] = None,
+    error: Optional[str] = None
+) -> Tuple[int, int]:
+    """
+    送信できなかったリマインダーを再送待ちにする
+    再送までの待ち時間は失敗するたびに2倍になり、REMINDER_MAX_ATTEMPTS 回失敗したものは
+    reminder_dead_letters に移動して以降は送信しない
+    
+    Args:
+        reminder_ids: リマインダーIDのリスト
+        worker_id: 確保したワーカーID（省略時は REMINDER_WORKER_ID）
+        error: 失敗理由
+    
+    Returns:
+        (再送待ちにした件数, reminder_dead_letters に移動した件数)
+    """
+    worker_id = worker_id or REMINDER_WORKER_ID
+    now = _now_epoch()
+    retried = dead_lettered = 0
+    
+    try:
+        for start in range(0, len(reminder_ids), SQLITE_MAX_VARIABLES - 5):
+            chunk = reminder_ids[start:start + SQLITE_MAX_VARIABLES - 5]
+            placeholders = ', '.join('?' * len(chunk))
+            
+            # 上限回数に達したものを移動
+            rows = await _dead_letter_reminders(chunk, worker_id, error, now)
+            dead_lettered += len(rows)
+            # 繰り返し予定の場合、送信を諦めた回の次からは通常どおり通知する
+            await _create_next_recurring_reminders(rows)
+            
+            # 残りは 待ち時間 × 2^(失敗回数 - 1) 後まで再確保されないようにする
+            result = await _write(
+                f"""
+                UPDATE reminders
+                SET claimed_by = NULL,
+                    lease_expires = ? + MIN(? << MIN(MAX(attempt_count - 1, 0), 20), ?)
+                WHERE id IN ({placeholders}) AND claimed_by = ? AND is_sent = FALSE
+                """,
+                [now, REMINDER_RETRY_SECONDS, REMINDER_RETRY_MAX_SECONDS, *chunk, worker_id]
+            )
+            retried += result.rowcount
+        
+        if dead_lettered:
+            logger.warning(f"送信できなかったリマインダーを{dead_lettered}件 reminder_dead_letters に移動しました: {error}")
+        return retried, dead_lettered
+        
+    except Exception as e:
+        logger.error(f"リマインダー再送設定エラー: {e}")
+        return retried, dead_lettered
+
+async def _dead_letter_reminders(
+    reminder_ids: List[int],
+    worker_id: str,
+    error: Optional[str],
+    now: int
+) -> List[Tuple[Any, ...]]:
+    """
+    送信を試みた回数が上限に達したリマインダーを reminder_dead_letters に移動
+    コピーと削除を1トランザクションで行い、移動済みのリマインダーが再び確保されないようにする
+    
+    Args:
+        reminder_ids: リマインダーIDのリスト（SQLITE_MAX_VARIABLES - 5 件以下）
+        worker_id: 確保したワーカーID
+        error: 失敗理由
+        now: 現在時刻（エポック秒）
+    
+    Returns:
+        移動したリマインダーの _NEXT_REMINDER_RETURNING_SQL の列
+    """
+    placeholders = ', '.join('?' * len(reminder_ids))
+    condition = f"id IN ({placeholders}) AND claimed_by = ? AND is_sent = FALSE AND attempt_count >= ?"
+    condition_params = [*reminder_ids, worker_id, REMINDER_MAX_ATTEMPTS]
+    
+    async with _get_pool().writer() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        await db.execute(
+            f"""
+            INSERT OR REPLACE INTO reminder_dead_letters (
+                id, schedule_id, user_id, guild_id, channel_id, remind_datetime,
+                message, created_at, attempt_count, last_error, failed_at
+            )
+            SELECT id, schedule_id, user_id, guild_id, channel_id, remind_datetime,
+                message, created_at, attempt_count, ?, ?
+            FROM reminders
+            WHERE {condition}
+            """,
+            [error, now, *condition_params]
+        )
+        async with db.execute(
+            f"DELETE FROM reminders WHERE {condition} RETURNING {_NEXT_REMINDER_RETURNING_SQL}",
+            condition_params
+        ) as cursor:
+            rows = list(await cursor.fetchall())
+        await db.commit()
+        return rows
+
+async def get_dead_letter_reminders(guild_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+    """
+    サーバーの送信を諦めたリマインダーを新しい順に取得
+    
+    Args:
+        guild_id: サーバーID
+        limit: 取得件数の上限
+    
+    Returns:
+        リマインダーの辞書のリスト（attempt_count, last_error, failed_at を含む）
+    """
+    columns = (
+        'id', 'schedule_id', 'user_id', 'guild_id', 'channel_id', 'remind_datetime',
+        'message', 'created_at', 'attempt_count', 'last_error', 'failed_at'
+    )
+    try:
+        async with _get_pool().reader() as db:
+            async with db.execute(
+                f"""
+                SELECT {', '.join(columns)} FROM reminder_dead_letters
+                WHERE guild_id = ?
+                ORDER BY failed_at DESC
+                LIMIT ?
+                """,
+                (guild_id, limit)
+            ) as cursor:
+                rows = await cursor.fetchall()
+        
+        reminders = []
+        for row in rows:
+            data = dict(zip(columns, row))
+            for key in ('remind_datetime', 'created_at', 'failed_at'):
+                data[key] = epoch_to_datetime(data[key])
+            reminders.append(data)
+        return reminders
+        
+    except Exception as e:
+        logger.error(f"送信失敗リマインダー取得エラー: {e}")
+        return []
+
+async def get_next_lease_expiry(after: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    確保中・再送待ちのリマインダーのうち、最も早く再確保できるようになる日時を取得
+    （停止したワーカーが確保したままのリマインダーや、再送待ちのリマインダーを拾うため）
+    
+    Args:
+        after: この日時より後の期限のみ対象にする（省略時は現在時刻）
+    
+    Returns:
+        最も早い期限（該当なしの場合はNone）
+    """
+    try:
+        async with _get_pool().reader() as db:
+            async with db.execute(
+                """
+                SELECT MIN(lease_expires) FROM reminders
+                WHERE is_sent = FALSE AND lease_expires IS NOT NULL AND lease_expires > ?
+                """,
+                (datetime_to_epoch(after) if after else _now_epoch(),)
+            ) as cursor:
+                row = await cursor.fetchone()
+        
+        return epoch_to_datetime(row[0])
+        
+    except Exception as e:
+        logger.error(f"リース期限取得エラー: {e}")
+        return None
+
+async def get_reminder_backlog(now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+    """
+    通知日時を過ぎても送信されていないリマインダーの件数を取得（送信の遅れを監視するため）
+    
+    Args:
+        now: 基準日時（省略時は現在時刻）
+    
+    Returns:
+        overdue（件数）/ leased（そのうち送信中・再送待ちで確保されている件数）/ oldest_overdue（最も古い通知日時）の辞書
+        （エラーの場合はNone）
+    """
+    try:
+        current_time = datetime_to_epoch(now) if now else _now_epoch()
+        
+        async with _get_pool().reader() as db:
+            async with db.execute(
+                """
+                SELECT COUNT(*), COALESCE(SUM(r.lease_expires > ?), 0), MIN(r.remind_datetime)
+                FROM reminders r
+                JOIN schedules s ON r.schedule_id = s.id
+                WHERE r.is_sent = FALSE
+                AND r.remind_datetime <= ?
+                AND s.is_active = TRUE
+                """,
+                (current_time, current_time)
+            ) as cursor:
+                row = await cursor.fetchone()
+        
+        return {
+            'overdue': row[0],
+            'leased': row[1],
+            'oldest_overdue': epoch_to_datetime(row[2]),
+        }
+        
+    except Exception as e:
+        logger.error(f"リマインダー滞留件数取得エラー: {e}")
+        return None
+
+async def get_upcoming_reminders(
+    after: Optional[datetime] = None,
+    limit: int = 200
+) -> List[Reminder]:
+    """
+    未送信のリマインダーを通知日時の早い順に取得（リマインダースケジューラーの読み込み範囲）
+    
+    Args:
+        after: この日時より後のリマインダーのみ取得（Noneの場合は期限切れも含めてすべて）
+        limit: 取得件数の上限
+    
+    Returns:
+        リマインダーリスト
+    """
+    try:
+        query = f"""
+            SELECT {', '.join('r.' + column for column in REMINDER_COLUMNS)}
+            FROM reminders r
+            JOIN schedules s ON r.schedule_id = s.id
+            WHERE r.is_sent = FALSE
+            AND s.is_active = TRUE
+        """
+        params: List[Any] = []
+        
+        if after is not None:
+            query += " AND r.remind_datetime > ?"
+            params.append(datetime_to_epoch(after))
+        
+        query += " ORDER BY r.remind_datetime ASC, r.id ASC LIMIT ?"
+        params.append(limit)
+        
+        async with _get_pool().reader() as db:
+            async with db.execute(query, params) as cursor:
+                rows = await cursor.fetchall()
+        
+        return [Reminder.from_row(row) for row in rows]
+        
+    except Exception as e:
+        logger.error(f"今後のリマインダー取得エラー: {e}")
+        return []
+
 async def mark_reminder_sent(reminder_id: int) -> bool:
     """
     リマインダーを送信済みにマーク
@@ -446,56 +1505,392 @@ async def mark_reminder_sent(reminder_id: int) -> bool:
         更新成功の可否
     """
     try:
-        async with aiosqlite.connect(DB_PATH) as db:
-            cursor = await db.execute(
-                "UPDATE reminders SET is_sent = TRUE WHERE id = ?",
-                (reminder_id,)
-            )
-            await db.commit()
-            
-            return cursor.rowcount > 0
+        result = await _write(
+            f"""
+            UPDATE reminders SET is_sent = TRUE, claimed_by = NULL, lease_expires = NULL WHERE id = ?
+            RETURNING {_NEXT_REMINDER_RETURNING_SQL}
+            """,
+            (reminder_id,),
+            fetch=True
+        )
+        
+        await _create_next_recurring_reminders(result.rows)
+        return bool(result.rows)
             
     except Exception as e:
         logger.error(f"リマインダー更新エラー: {e}")
         return False
 
-# ==================== 一括操作 ====================
-
-async def create_bulk_schedules(schedules_data: List[Dict[str, Any]]) -> List[int]:
+async def mark_reminders_sent(reminder_ids: List[int], worker_id: Optional[str] = None) -> int:
     """
-    複数の予定を一括作成
+    複数のリマインダーを1回のUPDATEで送信済みにマーク
     
     Args:
-        schedules_data: 予定データのリスト
+        reminder_ids: リマインダーIDのリスト
+        worker_id: 確保したワーカーID（指定した場合はそのワーカーが確保中のものだけを更新）
     
     Returns:
-        作成された予定IDのリスト
+        更新された件数
+    """
+    updated = 0
+    
+    try:
+        for start in range(0, len(reminder_ids), SQLITE_MAX_VARIABLES - 1):
+            chunk = reminder_ids[start:start + SQLITE_MAX_VARIABLES - 1]
+            query = f"""
+                UPDATE reminders SET is_sent = TRUE, claimed_by = NULL, lease_expires = NULL
+                WHERE id IN ({', '.join('?' * len(chunk))})
+            """
+            params = list(chunk)
+            if worker_id is not None:
+                query += " AND claimed_by = ?"
+                params.append(worker_id)
+            query += f" RETURNING {_NEXT_REMINDER_RETURNING_SQL}"
+            
+            result = await _write(query, params, fetch=True)
+            updated += len(result.rows)
+            await _create_next_recurring_reminders(result.rows)
+        
+        return updated
+        
+    except Exception as e:
+        logger.error(f"リマインダー一括更新エラー: {e}")
+        return updated
+
+# 送信済み・送信を諦めたリマインダーから次の発生日時のリマインダーを作るための列
+_NEXT_REMINDER_RETURNING_SQL = "schedule_id, user_id, guild_id, channel_id, remind_datetime, message, recur_offset"
+
+async def _create_next_recurring_reminders(rows: List[Tuple[Any, ...]]):
     """
+    繰り返し予定のリマインダーについて、次の発生日時のリマインダーを作成
+    
+    Args:
+        rows: _NEXT_REMINDER_RETURNING_SQL の列を持つ、処理済みのリマインダーの行
+    """
+    rows = [row for row in rows if row[6] is not None]
+    if not rows:
+        return
+    
     try:
-        created_ids = []
-        
-        async with aiosqlite.connect(DB_PATH) as db:
-            for data in schedules_data:
-                cursor = await db.execute(
-                    """
-                    INSERT INTO schedules (user_id, guild_id, title, description, start_datetime, end_datetime)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        data['user_id'],
-                        data['guild_id'],
-                        data['title'],
-                        data.get('description'),
-                        data['start_datetime'],
-                        data.get('end_datetime')
-                    )
-                )
-                created_ids.append(cursor.lastrowid)
+        schedule_ids = sorted({row[0] for row in rows})
+        async with _get_pool().reader() as db:
+            async with db.execute(
+                f"""
+                SELECT id, start_datetime, recurrence FROM schedules
+                WHERE id IN ({', '.join('?' * len(schedule_ids))})
+                AND is_active = TRUE AND recurrence IS NOT NULL
+                """,
+                schedule_ids
+            ) as cursor:
+                series = {row[0]: row[1:] for row in await cursor.fetchall()}
+        
+        now = datetime.now()
+        next_reminders = []
+        for schedule_id, user_id, guild_id, channel_id, remind_at, message, recur_offset in rows:
+            if schedule_id not in series:
+                continue
+            start, recurrence = series[schedule_id]
+            offset = timedelta(seconds=recur_offset)
+            
+            # 処理した回より後で、通知日時がまだ来ていない最初の発生日時
+            after = max(epoch_to_datetime(remind_at), now) + offset
+            occurrence = Recurrence.parse(recurrence).next_after(epoch_to_datetime(start), after)
+            if occurrence is None:
+                continue
             
-            await db.commit()
-            logger.info(f"一括で{len(created_ids)}件の予定を作成しました")
-            return created_ids
+            next_reminders.append({
+                'schedule_id': schedule_id,
+                'user_id': user_id,
+                'guild_id': guild_id,
+                'channel_id': channel_id,
+                'remind_datetime': occurrence - offset,
+                'message': message,
+                'recur_offset': recur_offset,
+            })
+        
+        await create_reminders(next_reminders)
             
     except Exception as e:
-        logger.error(f"一括予定作成エラー: {e}")
+        logger.error(f"次回リマインダー作成エラー: {e}")
+
+# ==================== サーバー設定 ====================
+
+async def get_guild_reminder_offsets(guild_id: str) -> List[int]:
+    """
+    サーバーの既定のリマインダーを取得
+    
+    Args:
+        guild_id: サーバーID
+    
+    Returns:
+        予定の開始の何秒前に通知するかのリスト（長い順、未設定・エラーの場合は空）
+    """
+    try:
+        async with _get_pool().reader() as db:
+            async with db.execute(
+                "SELECT reminder_offsets FROM guild_settings WHERE guild_id = ?",
+                (guild_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+        
+        if not row or not row[0]:
+            return []
+        return sorted((int(value) for value in row[0].split(',') if value), reverse=True)
+        
+    except Exception as e:
+        logger.error(f"既定リマインダー取得エラー: {e}")
         return []
+
+async def set_guild_reminder_offsets(guild_id: str, offsets: List[int]) -> bool:
+    """
+    サーバーの既定のリマインダーを設定
+    
+    Args:
+        guild_id: サーバーID
+        offsets: 予定の開始の何秒前に通知するかのリスト（空のリストで解除）
+    
+    Returns:
+        設定成功の可否
+    """
+    try:
+        value = ','.join(str(offset) for offset in sorted(set(offsets), reverse=True)) or None
+        await _write(
+            """
+            INSERT INTO guild_settings (guild_id, reminder_offsets, updated_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT (guild_id) DO UPDATE SET
+                reminder_offsets = excluded.reminder_offsets,
+                updated_at = excluded.updated_at
+            """,
+            (guild_id, value, _now_epoch())
+        )
+        logger.info(f"既定のリマインダーを設定しました: サーバー={guild_id}, {value}")
+        return True
+        
+    except Exception as e:
+        logger.error(f"既定リマインダー設定エラー: {e}")
+        return False
+
+# ==================== 動画情報キャッシュ ====================
+
+async def get_media_cache(video_id: str) -> Optional[Tuple[Dict[str, Any], int]]:
+    """
+    キャッシュした動画情報を取得
+    
+    Args:
+        video_id: 動画ID
+    
+    Returns:
+        (動画情報, ストリーミング用URLの有効期限のエポック秒)（キャッシュにない・エラーの場合はNone）
+    """
+    try:
+        async with _get_pool().reader() as db:
+            async with db.execute(
+                "SELECT data, expires_at FROM media_cache WHERE video_id = ?",
+                (video_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+        
+        if not row:
+            return None
+        return json.loads(row[0]), row[1]
+        
+    except Exception as e:
+        logger.error(f"動画情報キャッシュ取得エラー: {e}")
+        return None
+
+async def set_media_cache(video_id: str, data: Dict[str, Any], expires_at: int) -> bool:
+    """
+    動画情報をキャッシュに保存（同じ動画IDの行は上書き）
+    
+    Args:
+        video_id: 動画ID
+        data: 動画情報（JSONに変換できる値のみ）
+        expires_at: ストリーミング用URLの有効期限のエポック秒
+    
+    Returns:
+        保存成功の可否
+    """
+    try:
+        await _write(
+            """
+            INSERT INTO media_cache (video_id, data, expires_at, updated_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (video_id) DO UPDATE SET
+                data = excluded.data,
+                expires_at = excluded.expires_at,
+                updated_at = excluded.updated_at
+            """,
+            (video_id, json.dumps(data, ensure_ascii=False), int(expires_at), _now_epoch())
+        )
+        return True
+        
+    except Exception as e:
+        logger.error(f"動画情報キャッシュ保存エラー: {e}")
+        return False
+
+async def purge_media_cache(before: Optional[int] = None) -> int:
+    """
+    有効期限の過ぎた動画情報をキャッシュから削除
+    
+    Args:
+        before: この時刻（エポック秒）より前に期限が切れた行を削除（省略時は現在時刻）
+    
+    Returns:
+        削除した件数（エラーの場合は0）
+    """
+    try:
+        result = await _write(
+            "DELETE FROM media_cache WHERE expires_at < ?",
+            (before if before is not None else _now_epoch(),)
+        )
+        return result.rowcount
+        
+    except Exception as e:
+        logger.error(f"動画情報キャッシュ削除エラー: {e}")
+        return 0
+
+# ==================== 一括操作 ====================
+
+# 一括作成で1トランザクションにまとめる最大行数
+# 書き込み接続を長時間占有せず、チャンクの合間に他のコマンドの書き込みを通すため
+BULK_CHUNK_ROWS = 1000
+
+# 一括作成で挿入する列
+_BULK_SCHEDULE_COLUMNS = (
+    'user_id', 'guild_id', 'title', 'description',
+    'start_datetime', 'end_datetime', 'created_at', 'updated_at'
+)
+_BULK_ROW_SQL = '(' + ', '.join('?' * len(_BULK_SCHEDULE_COLUMNS)) + ')'
+_BULK_INSERT_SQL = f"INSERT INTO schedules ({', '.join(_BULK_SCHEDULE_COLUMNS)}) VALUES "
+
+def _bulk_schedule_params(data: Dict[str, Any], now: int) -> Tuple[Any, ...]:
+    """
+    一括作成用の1行分のパラメータを作成
+    
+    Args:
+        data: 予定データ
+        now: 作成日時のエポック秒
+    
+    Returns:
+        _BULK_SCHEDULE_COLUMNS の順に並んだパラメータ
+    """
+    for key in ('user_id', 'guild_id', 'title', 'start_datetime'):
+        if data.get(key) is None:
+            raise ValueError(f"{key} が指定されていません")
+    
+    if not isinstance(data['start_datetime'], datetime):
+        raise ValueError("start_datetime が日時ではありません")
+    
+    return (
+        data['user_id'],
+        data['guild_id'],
+        data['title'],
+        data.get('description'),
+        datetime_to_epoch(data['start_datetime']),
+        datetime_to_epoch(data.get('end_datetime')),
+        now,
+        now
+    )
+
+async def _insert_schedule_chunk(rows: List[Tuple[Any, ...]]) -> List[Union[int, Exception]]:
+    """
+    予定のチャンクを1トランザクションで挿入
+    複数行の INSERT ... RETURNING id を1回実行し、失敗した場合のみ1行ずつ挿入して失敗した行を特定する
+    
+    Args:
+        rows: _bulk_schedule_params で作成したパラメータのリスト
+    
+    Returns:
+        行ごとの作成ID（失敗した行は例外）
+    """
+    async with _get_pool().writer() as db:
+        await db.execute("BEGIN IMMEDIATE")
+        
+        try:
+            params = [value for row in rows for value in row]
+            async with db.execute(
+                _BULK_INSERT_SQL + ', '.join([_BULK_ROW_SQL] * len(rows)) + " RETURNING id",
+                params
+            ) as cursor:
+                # RETURNING の順序は保証されないが、1文の中で採番されるIDは挿入順に増加する
+                results = sorted(row[0] for row in await cursor.fetchall())
+                
+        except Exception:
+            # 失敗した文はまとめて取り消されるため、1行ずつ挿入し直して失敗した行を特定する
+            if not db.in_transaction:
+                raise
+            
+            results = []
+            for row in rows:
+                try:
+                    cursor = await db.execute(_BULK_INSERT_SQL + _BULK_ROW_SQL, row)
+                    results.append(cursor.lastrowid)
+                except Exception as e:
+                    if not db.in_transaction:
+                        raise
+                    results.append(e)
+        
+        await db.commit()
+        return results
+
+async def create_bulk_schedules(
+    schedules_data: List[Dict[str, Any]],
+    chunk_size: int = BULK_CHUNK_ROWS
+) -> BulkInsertResult:
+    """
+    複数の予定を一括作成
+    チャンクごとにコミットし、合間に他のコマンドの書き込みを通すため、数万件でもBOTの応答を止めない
+    不正な行や挿入に失敗した行はスキップし、行ごとのエラーとして結果に記録する
+    
+    Args:
+        schedules_data: 予定データのリスト
+        chunk_size: 1トランザクションにまとめる最大行数（バインド変数の上限に収まるよう調整される）
+    
+    Returns:
+        一括作成の結果
+    """
+    result = BulkInsertResult(len(schedules_data))
+    now = _now_epoch()
+    
+    # 挿入前にデータを検証
+    prepared = []
+    for index, data in enumerate(schedules_data):
+        try:
+            prepared.append((index, _bulk_schedule_params(data, now)))
+        except Exception as e:
+            result.add_error(index, str(e))
+    
+    chunk_size = max(1, min(chunk_size, SQLITE_MAX_VARIABLES // len(_BULK_SCHEDULE_COLUMNS)))
+    
+    for start in range(0, len(prepared), chunk_size):
+        chunk = prepared[start:start + chunk_size]
+        
+        try:
+            outcomes = await _insert_schedule_chunk([params for _, params in chunk])
+        except Exception as e:
+            logger.error(f"一括予定作成エラー: {e}")
+            for index, _ in chunk:
+                result.add_error(index, str(e))
+            continue
+        
+        months = set()
+        for (index, params), outcome in zip(chunk, outcomes):
+            if isinstance(outcome, Exception):
+                result.add_error(index, str(outcome))
+            else:
+                result.ids[index] = outcome
+                start_dt = epoch_to_datetime(params[4])
+                months.add((params[1], params[0], start_dt.year, start_dt.month))
+        
+        # 予定が追加された月のキャッシュを無効化
+        for guild_id, user_id, year, month in months:
+            _month_cache.invalidate_month(guild_id, user_id, year, month)
+        
+        # 次のチャンクの前に他のタスクへ処理を譲る
+        await asyncio.sleep(0)
+    
+    if result.errors:
+        logger.warning(f"一括予定作成: {len(result.errors)}件の行が失敗しました")
+    logger.info(f"一括で{len(result.created_ids)}件の予定を作成しました")
+    return result
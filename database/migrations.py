@@ -0,0 +1,380 @@
+"""
+スキーママイグレーション
+番号付きマイグレーションを schema_version テーブルで管理し、1件ずつトランザクション内で適用する
+大量の行を書き換える処理はバッチ単位のバックフィルとしてバックグラウンドで実行する
+
+作成者: [Your Name]
+作成日: 2026-10-17
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+import aiosqlite
+
+from .models import (
+    SCHEDULES_TABLE_SQL,
+    REMINDERS_TABLE_SQL,
+    INDEXES_SQL,
+    OBSOLETE_INDEXES_SQL,
+    REDUNDANT_INDEXES_SQL,
+    REMINDER_LEASE_COLUMNS_SQL,
+    REMINDER_DEAD_LETTERS_SQL,
+    RECURRENCE_COLUMNS_SQL,
+    GUILD_SETTINGS_SQL,
+    MEDIA_CACHE_SQL
+)
+from .pool import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+# マイグレーション管理用テーブル
+SCHEMA_VERSION_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,              -- マイグレーション番号
+    name TEXT NOT NULL,                       -- マイグレーション名
+    applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+# バックフィルの進捗管理用テーブル
+SCHEMA_BACKFILLS_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS schema_backfills (
+    name TEXT PRIMARY KEY,                    -- バックフィル名
+    last_rowid INTEGER NOT NULL DEFAULT 0,    -- 処理済みの最後のrowid
+    completed_at DATETIME                     -- 完了日時（未完了はNULL）
+);
+"""
+
+
+class Backfill:
+    """
+    バッチ単位で既存行を書き換えるバックフィル
+
+    rowid順に batch_size 件ずつ短いトランザクションで UPDATE し、
+    バッチの間に書き込みロックを手放すため、他のコマンドの書き込みを長時間止めない
+    """
+
+    def __init__(
+        self,
+        name: str,
+        table: str,
+        set_sql: str,
+        where_sql: str,
+        batch_size: int = 500,
+        pause: float = 0.05,
+        blocking: bool = False
+    ):
+        """
+        Args:
+            name: バックフィル名（進捗の保存キー）
+            table: 対象テーブル
+            set_sql: UPDATE の SET 句
+            where_sql: 書き換えが必要な行の条件
+            batch_size: 1トランザクションで処理する行数
+            pause: バッチ間の待機秒数
+            blocking: True の場合は init_database の完了前に最後まで実行する
+                      （旧形式の行が残っているとクエリ結果が変わる場合に使用）
+        """
+        self.name = name
+        self.table = table
+        self.set_sql = set_sql
+        self.where_sql = where_sql
+        self.batch_size = batch_size
+        self.pause = pause
+        self.blocking = blocking
+
+    async def run(self, pool: ConnectionPool) -> int:
+        """
+        未処理の行がなくなるまでバッチを繰り返す
+
+        Args:
+            pool: 接続プール
+
+        Returns:
+            書き換えた行数
+        """
+        async with pool.reader() as db:
+            async with db.execute(
+                "SELECT last_rowid, completed_at FROM schema_backfills WHERE name = ?",
+                (self.name,)
+            ) as cursor:
+                row = await cursor.fetchone()
+
+        if row is None or row[1] is not None:
+            return 0
+
+        last_rowid = row[0]
+        total = 0
+
+        while True:
+            async with pool.writer() as db:
+                async with db.execute(
+                    f"""
+                    SELECT rowid FROM {self.table}
+                    WHERE rowid > ? AND ({self.where_sql})
+                    ORDER BY rowid LIMIT ?
+                    """,
+                    (last_rowid, self.batch_size)
+                ) as cursor:
+                    rowids = [r[0] for r in await cursor.fetchall()]
+
+                if not rowids:
+                    await db.execute(
+                        "UPDATE schema_backfills SET completed_at = CURRENT_TIMESTAMP WHERE name = ?",
+                        (self.name,)
+                    )
+                    await db.commit()
+                    break
+
+                placeholders = ', '.join('?' * len(rowids))
+                cursor = await db.execute(
+                    f"UPDATE {self.table} SET {self.set_sql} WHERE rowid IN ({placeholders})",
+                    rowids
+                )
+                total += cursor.rowcount
+
+                last_rowid = rowids[-1]
+                await db.execute(
+                    "UPDATE schema_backfills SET last_rowid = ? WHERE name = ?",
+                    (last_rowid, self.name)
+                )
+                await db.commit()
+
+            # 他の書き込みに順番を譲る
+            await asyncio.sleep(self.pause)
+
+        logger.info(f"バックフィル完了: {self.name} ({total}行)")
+        return total
+
+
+class Migration:
+    """
+    番号付きマイグレーション
+    """
+
+    def __init__(
+        self,
+        version: int,
+        name: str,
+        statements: Sequence[str] = (),
+        apply: Optional[Callable[[aiosqlite.Connection], Awaitable[None]]] = None,
+        backfills: Sequence[Backfill] = ()
+    ):
+        """
+        Args:
+            version: マイグレーション番号（1から連番）
+            name: マイグレーション名
+            statements: 実行するSQL文
+            apply: SQL文の後に実行する追加処理（同じトランザクション内）
+            backfills: 適用後にバックグラウンドで実行するバックフィル
+        """
+        self.version = version
+        self.name = name
+        self.statements = list(statements)
+        self.apply = apply
+        self.backfills = list(backfills)
+
+    def __str__(self) -> str:
+        return f"Migration({self.version:04d}_{self.name})"
+
+
+def _epoch_sql(column: str, local: bool = True) -> str:
+    """
+    ISO形式の日時文字列の列をエポック秒に変換するSQL式
+
+    Args:
+        column: 列名
+        local: 列の値がローカル時刻か（False の場合はUTC、CURRENT_TIMESTAMP の値など）
+    """
+    modifier = ", 'utc'" if local else ""
+    return (
+        f"CASE WHEN typeof({column}) = 'text' "
+        f"THEN CAST(strftime('%s', {column}{modifier}) AS INTEGER) ELSE {column} END"
+    )
+
+
+# ==================== マイグレーション一覧 ====================
+# 追加する場合は末尾に次の番号で追記する（適用済みのものは変更しない）
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        1, 'initial_schema',
+        # 既存環境（schema_version 導入前）でもそのまま適用できるよう IF [NOT] EXISTS で記述
+        [SCHEDULES_TABLE_SQL, REMINDERS_TABLE_SQL] + INDEXES_SQL + OBSOLETE_INDEXES_SQL
+    ),
+    Migration(
+        2, 'epoch_timestamps',
+        # 日時をISO文字列からエポック秒（INTEGER）に変換する
+        # 文字列と整数が混在すると範囲比較の結果が変わるため、起動完了前に変換を終わらせる
+        backfills=[
+            Backfill(
+                'schedules_epoch_timestamps', 'schedules',
+                ', '.join([
+                    f"start_datetime = {_epoch_sql('start_datetime')}",
+                    f"end_datetime = {_epoch_sql('end_datetime')}",
+                    f"created_at = {_epoch_sql('created_at', local=False)}",
+                    f"updated_at = {_epoch_sql('updated_at', local=False)}",
+                ]),
+                "typeof(start_datetime) = 'text' OR typeof(end_datetime) = 'text' "
+                "OR typeof(created_at) = 'text' OR typeof(updated_at) = 'text'",
+                blocking=True
+            ),
+            Backfill(
+                'reminders_epoch_timestamps', 'reminders',
+                ', '.join([
+                    f"remind_datetime = {_epoch_sql('remind_datetime')}",
+                    f"created_at = {_epoch_sql('created_at', local=False)}",
+                ]),
+                "typeof(remind_datetime) = 'text' OR typeof(created_at) = 'text'",
+                blocking=True
+            ),
+        ]
+    ),
+    Migration(
+        3, 'reminder_leases',
+        # 送信前にリマインダーを確保（リース）し、複数ワーカーが同じリマインダーを送信しないようにする
+        REMINDER_LEASE_COLUMNS_SQL
+    ),
+    Migration(
+        4, 'reminder_dead_letters',
+        # 再送の上限回数に達したリマインダーの移動先
+        REMINDER_DEAD_LETTERS_SQL
+    ),
+    Migration(
+        5, 'recurring_schedules',
+        # 繰り返し予定は1行で保存し、表示範囲・次のリマインダーの分だけ展開する
+        RECURRENCE_COLUMNS_SQL
+    ),
+    Migration(
+        6, 'guild_settings',
+        # サーバーごとの既定のリマインダー
+        GUILD_SETTINGS_SQL
+    ),
+    Migration(
+        7, 'media_cache',
+        # yt-dlp で取得した動画情報のキャッシュ（再起動後も同じ曲の抽出を省く）
+        MEDIA_CACHE_SQL
+    ),
+    Migration(
+        8, 'drop_redundant_indexes',
+        # 複合インデックス・部分インデックスと重複する単一列のインデックスを削除（書き込みコスト削減）
+        REDUNDANT_INDEXES_SQL
+    ),
+]
+
+
+def _backfill_registry() -> Dict[str, Backfill]:
+    """名前 -> バックフィルの対応表"""
+    return {
+        backfill.name: backfill
+        for migration in MIGRATIONS
+        for backfill in migration.backfills
+    }
+
+
+async def get_schema_version(db: aiosqlite.Connection) -> int:
+    """
+    適用済みの最新マイグレーション番号を取得
+
+    Args:
+        db: データベース接続
+
+    Returns:
+        マイグレーション番号（未適用は0）
+    """
+    async with db.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version") as cursor:
+        row = await cursor.fetchone()
+        return row[0]
+
+
+async def apply_migrations(pool: ConnectionPool) -> int:
+    """
+    未適用のマイグレーションを番号順に適用
+    1件ごとに BEGIN IMMEDIATE ～ COMMIT で囲み、失敗した場合はその1件をロールバックして中断する
+
+    Args:
+        pool: 接続プール
+
+    Returns:
+        適用後のマイグレーション番号
+    """
+    async with pool.writer() as db:
+        await db.execute(SCHEMA_VERSION_TABLE_SQL)
+        await db.execute(SCHEMA_BACKFILLS_TABLE_SQL)
+        await db.commit()
+
+        current = await get_schema_version(db)
+
+        for migration in MIGRATIONS:
+            if migration.version <= current:
+                continue
+
+            try:
+                await db.execute("BEGIN IMMEDIATE")
+
+                for sql in migration.statements:
+                    await db.execute(sql)
+
+                if migration.apply is not None:
+                    await migration.apply(db)
+
+                for backfill in migration.backfills:
+                    await db.execute(
+                        "INSERT OR IGNORE INTO schema_backfills (name) VALUES (?)",
+                        (backfill.name,)
+                    )
+
+                await db.execute(
+                    "INSERT INTO schema_version (version, name) VALUES (?, ?)",
+                    (migration.version, migration.name)
+                )
+                await db.commit()
+
+            except Exception as e:
+                await db.rollback()
+                logger.error(f"マイグレーション失敗: {migration}: {e}")
+                raise
+
+            current = migration.version
+            logger.info(f"マイグレーションを適用しました: {migration}")
+
+        return current
+
+
+async def get_pending_backfills(pool: ConnectionPool) -> List[Backfill]:
+    """
+    未完了のバックフィルを取得
+
+    Args:
+        pool: 接続プール
+
+    Returns:
+        バックフィルのリスト（登録順）
+    """
+    async with pool.reader() as db:
+        async with db.execute(
+            "SELECT name FROM schema_backfills WHERE completed_at IS NULL"
+        ) as cursor:
+            pending = {row[0] for row in await cursor.fetchall()}
+
+    return [backfill for name, backfill in _backfill_registry().items() if name in pending]
+
+
+async def run_backfills(backfills: Sequence[Backfill], pool: ConnectionPool):
+    """
+    バックフィルを順番に実行
+
+    Args:
+        backfills: 実行するバックフィル
+        pool: 接続プール
+    """
+    for backfill in backfills:
+        try:
+            await backfill.run(pool)
+        except asyncio.CancelledError:
+            logger.info(f"バックフィルを中断しました（次回起動時に再開）: {backfill.name}")
+            raise
+        except Exception as e:
+            logger.error(f"バックフィルエラー: {backfill.name}: {e}")
@@ -7,7 +7,7 @@
 """
 
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, NamedTuple, Sequence, Union
 
 # データベーステーブルの構造定義
 
@@ -43,49 +43,224 @@ CREATE TABLE IF NOT EXISTS reminders (
 );
 """
 
+# reminders テーブルの追加列（マイグレーション3）- 複数ワーカーでの送信の排他制御
+# claimed_by: 送信のために確保したワーカーID
+# lease_expires: 確保の有効期限（エポック秒、期限切れになると他のワーカーが再確保できる）
+# attempt_count: 確保された回数
+REMINDER_LEASE_COLUMNS_SQL = [
+    "ALTER TABLE reminders ADD COLUMN claimed_by TEXT;",
+    "ALTER TABLE reminders ADD COLUMN lease_expires INTEGER;",
+    "ALTER TABLE reminders ADD COLUMN attempt_count INTEGER NOT NULL DEFAULT 0;",
+    # get_next_lease_expiry: 未送信かつ確保中（または再送待ち）のリマインダーの最も早い期限
+    "CREATE INDEX IF NOT EXISTS idx_reminders_lease_expires ON reminders (lease_expires) WHERE is_sent = FALSE AND lease_expires IS NOT NULL;"
+]
+
+# reminder_dead_letters テーブル（マイグレーション4）- 再送の上限回数に達したリマインダー
+# reminders から移動した行（id はリマインダーIDのまま）に、失敗の情報を加えて保存する
+REMINDER_DEAD_LETTERS_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS reminder_dead_letters (
+        id INTEGER PRIMARY KEY,                   -- 元のリマインダーID
+        schedule_id INTEGER NOT NULL,             -- 予定ID
+        user_id TEXT NOT NULL,                    -- 通知対象ユーザーID
+        guild_id TEXT NOT NULL,                   -- Discord サーバーID
+        channel_id TEXT NOT NULL,                 -- 通知チャンネルID
+        remind_datetime DATETIME NOT NULL,        -- リマインダー実行日時
+        message TEXT,                             -- カスタムメッセージ
+        created_at DATETIME,                      -- リマインダーの作成日時
+        attempt_count INTEGER NOT NULL,           -- 送信を試みた回数
+        last_error TEXT,                          -- 最後の失敗理由
+        failed_at DATETIME NOT NULL               -- 送信を諦めた日時
+    );
+    """,
+    # get_dead_letter_reminders: guild_id = ? ORDER BY failed_at DESC
+    "CREATE INDEX IF NOT EXISTS idx_reminder_dead_letters_guild_failed ON reminder_dead_letters (guild_id, failed_at);"
+]
+
+# 繰り返し予定の列（マイグレーション5）
+# schedules.recurrence: RRULE 文字列（NULL = 繰り返しなし）。start_datetime は最初の発生日時
+# schedules.recurrence_end: 最後の発生日時（エポック秒、NULL = 終わりなし）。表示範囲との重なりの判定用
+# reminders.recur_offset: 繰り返し予定のリマインダーで、発生日時の何秒前に通知するか
+#   送信済みになると次の発生日時のリマインダーを作成する（先の分までまとめて作成しない）
+RECURRENCE_COLUMNS_SQL = [
+    "ALTER TABLE schedules ADD COLUMN recurrence TEXT;",
+    "ALTER TABLE schedules ADD COLUMN recurrence_end INTEGER;",
+    "ALTER TABLE reminders ADD COLUMN recur_offset INTEGER;",
+    # 表示範囲に重なる繰り返し予定: [user_id = ? AND] guild_id = ? AND is_active = TRUE AND recurrence IS NOT NULL AND start_datetime <= ?
+    # （通常の予定の複合インデックスを使うと、サーバーの過去の予定をすべて読むことになる）
+    "CREATE INDEX IF NOT EXISTS idx_schedules_guild_recurring ON schedules (guild_id, is_active, start_datetime) WHERE recurrence IS NOT NULL;",
+    "CREATE INDEX IF NOT EXISTS idx_schedules_user_guild_recurring ON schedules (user_id, guild_id, is_active, start_datetime) WHERE recurrence IS NOT NULL;"
+]
+
+# guild_settings テーブル（マイグレーション6）- サーバーごとの設定
+# reminder_offsets: 予定の追加時に自動で設定するリマインダー（開始の何秒前か、カンマ区切り。NULL = なし）
+GUILD_SETTINGS_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS guild_settings (
+        guild_id TEXT PRIMARY KEY,                -- Discord サーバーID
+        reminder_offsets TEXT,                    -- 既定のリマインダー（秒、カンマ区切り）
+        updated_at DATETIME NOT NULL              -- 更新日時
+    );
+    """
+]
+
+# media_cache テーブル（マイグレーション7）- yt-dlp で取得した動画情報のキャッシュ
+# data: 再生に必要なキーだけに絞った動画情報（JSON）
+# expires_at: ストリーミング用のURLを使える期限（エポック秒）。過ぎた行は再取得・定期的に削除する
+MEDIA_CACHE_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS media_cache (
+        video_id TEXT PRIMARY KEY,                -- 動画ID
+        data TEXT NOT NULL,                       -- 動画情報（JSON）
+        expires_at INTEGER NOT NULL,              -- ストリーミング用URLの有効期限
+        updated_at INTEGER NOT NULL               -- 取得日時
+    );
+    """,
+    # purge_media_cache: expires_at < ?
+    "CREATE INDEX IF NOT EXISTS idx_media_cache_expires ON media_cache (expires_at);"
+]
+
 # インデックスの作成
+# 実際のクエリの形（WHERE の等価条件 → ORDER BY の列順）に合わせた複合インデックス
 INDEXES_SQL = [
-    "CREATE INDEX IF NOT EXISTS idx_schedules_user_id ON schedules (user_id);",
-    "CREATE INDEX IF NOT EXISTS idx_schedules_guild_id ON schedules (guild_id);",
-    "CREATE INDEX IF NOT EXISTS idx_schedules_start_datetime ON schedules (start_datetime);",
+    # get_schedules_by_user: user_id = ? AND guild_id = ? AND is_active = TRUE ORDER BY start_datetime
+    "CREATE INDEX IF NOT EXISTS idx_schedules_user_guild_active_start ON schedules (user_id, guild_id, is_active, start_datetime);",
+    # get_schedules_by_guild: guild_id = ? AND is_active = TRUE ORDER BY start_datetime
+    "CREATE INDEX IF NOT EXISTS idx_schedules_guild_active_start ON schedules (guild_id, is_active, start_datetime);",
     "CREATE INDEX IF NOT EXISTS idx_reminders_schedule_id ON reminders (schedule_id);",
-    "CREATE INDEX IF NOT EXISTS idx_reminders_remind_datetime ON reminders (remind_datetime);",
-    "CREATE INDEX IF NOT EXISTS idx_reminders_is_sent ON reminders (is_sent);"
+    # get_pending_reminders: is_sent = FALSE AND remind_datetime <= ?（未送信分だけを持つ部分インデックス）
+    "CREATE INDEX IF NOT EXISTS idx_reminders_pending ON reminders (remind_datetime) WHERE is_sent = FALSE;"
+]
+
+# 複合インデックスに置き換えられた不要なインデックス（書き込みコスト削減のため削除）
+OBSOLETE_INDEXES_SQL = [
+    "DROP INDEX IF EXISTS idx_schedules_user_id;",
+    "DROP INDEX IF EXISTS idx_schedules_guild_id;",
+    "DROP INDEX IF EXISTS idx_reminders_is_sent;"
+]
+
+# 先頭の列が同じ複合インデックス・部分インデックスがあり、どのクエリにも使われないインデックス
+# （予定の取得は guild_id / user_id で絞り込み、リマインダーの取得は常に is_sent = FALSE の idx_reminders_pending を使う）
+REDUNDANT_INDEXES_SQL = [
+    "DROP INDEX IF EXISTS idx_schedules_start_datetime;",
+    "DROP INDEX IF EXISTS idx_reminders_remind_datetime;"
 ]
 
-class Schedule:
+# 日時は INTEGER のUNIXエポック秒（UTC基準）で保存する
+# アプリ内ではタイムゾーンなしのローカル日時（datetime.now() と同じ扱い）として扱う
+
+def datetime_to_epoch(value: Optional[datetime]) -> Optional[int]:
+    """
+    datetimeを保存用のエポック秒に変換
+    
+    Args:
+        value: 日時（タイムゾーンなしはローカル時刻とみなす）
+    
+    Returns:
+        エポック秒（Noneの場合はNone）
+    """
+    if value is None:
+        return None
+    return int(value.timestamp())
+
+def epoch_to_datetime(value: Union[int, str, None]) -> Optional[datetime]:
+    """
+    保存されたエポック秒をdatetimeに変換
+    
+    Args:
+        value: エポック秒（移行前のISO文字列も受け付ける）
+    
+    Returns:
+        ローカル時刻のdatetime（Noneの場合はNone）
+    """
+    if value is None:
+        return None
+    if type(value) is int:
+        return datetime.fromtimestamp(value)
+    return datetime.fromisoformat(value)
+
+# 行変換で多用するため属性参照を省く
+_fromtimestamp = datetime.fromtimestamp
+
+# SELECT で取得する列（モデルのフィールド順と一致させる）
+SCHEDULE_COLUMNS = (
+    'id', 'user_id', 'guild_id', 'title', 'description',
+    'start_datetime', 'end_datetime', 'created_at', 'updated_at', 'is_active', 'recurrence'
+)
+REMINDER_COLUMNS = (
+    'id', 'schedule_id', 'user_id', 'guild_id', 'channel_id',
+    'remind_datetime', 'message', 'is_sent', 'created_at'
+)
+
+# SELECT 句に埋め込む列リスト
+SCHEDULE_SELECT_SQL = ', '.join(SCHEDULE_COLUMNS)
+REMINDER_SELECT_SQL = ', '.join(REMINDER_COLUMNS)
+
+class Schedule(NamedTuple):
     """
     予定データのモデルクラス
+    イミュータブルなタプル（インスタンス辞書なし）で、SQLiteの行タプルから位置で直接生成する
     """
     
-    def __init__(self, data: Dict[str, Any]):
-        self.id: Optional[int] = data.get('id')
-        self.user_id: str = data['user_id']
-        self.guild_id: str = data['guild_id']
-        self.title: str = data['title']
-        self.description: Optional[str] = data.get('description')
-        self.start_datetime: datetime = data['start_datetime']
-        self.end_datetime: Optional[datetime] = data.get('end_datetime')
-        self.created_at: Optional[datetime] = data.get('created_at')
-        self.updated_at: Optional[datetime] = data.get('updated_at')
-        self.is_active: bool = data.get('is_active', True)
+    id: Optional[int]
+    user_id: str
+    guild_id: str
+    title: str
+    description: Optional[str] = None
+    start_datetime: Optional[datetime] = None
+    end_datetime: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    is_active: bool = True
+    recurrence: Optional[str] = None
+    
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> 'Schedule':
+        """
+        SCHEDULE_COLUMNS の順に並んだ行タプルから生成
+        
+        Args:
+            row: schedules テーブルの行
+        
+        Returns:
+            予定オブジェクト
+        """
+        id, user_id, guild_id, title, description, start, end, created, updated, is_active, recurrence = row
+        # 通常は整数なので関数呼び出しを挟まずに変換する
+        return tuple.__new__(cls, (
+            id, user_id, guild_id, title, description,
+            _fromtimestamp(start) if type(start) is int else epoch_to_datetime(start),
+            _fromtimestamp(end) if type(end) is int else epoch_to_datetime(end),
+            _fromtimestamp(created) if type(created) is int else epoch_to_datetime(created),
+            _fromtimestamp(updated) if type(updated) is int else epoch_to_datetime(updated),
+            bool(is_active),
+            recurrence
+        ))
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Schedule':
+        """
+        辞書から生成（旧コンストラクタ互換）
+        """
+        return cls(
+            data.get('id'),
+            data['user_id'],
+            data['guild_id'],
+            data['title'],
+            data.get('description'),
+            data['start_datetime'],
+            data.get('end_datetime'),
+            data.get('created_at'),
+            data.get('updated_at'),
+            data.get('is_active', True),
+            data.get('recurrence')
+        )
     
     def to_dict(self) -> Dict[str, Any]:
         """
         辞書形式に変換
         """
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'guild_id': self.guild_id,
-            'title': self.title,
-            'description': self.description,
-            'start_datetime': self.start_datetime,
-            'end_datetime': self.end_datetime,
-            'created_at': self.created_at,
-            'updated_at': self.updated_at,
-            'is_active': self.is_active
-        }
+        return dict(zip(self._fields, self))
     
     def __str__(self) -> str:
         """
@@ -93,37 +268,64 @@ class Schedule:
         """
         return f"Schedule(id={self.id}, title='{self.title}', start={self.start_datetime})"
 
-class Reminder:
+class Reminder(NamedTuple):
     """
     リマインダーデータのモデルクラス
+    イミュータブルなタプル（インスタンス辞書なし）で、SQLiteの行タプルから位置で直接生成する
     """
     
-    def __init__(self, data: Dict[str, Any]):
-        self.id: Optional[int] = data.get('id')
-        self.schedule_id: int = data['schedule_id']
-        self.user_id: str = data['user_id']
-        self.guild_id: str = data['guild_id']
-        self.channel_id: str = data['channel_id']
-        self.remind_datetime: datetime = data['remind_datetime']
-        self.message: Optional[str] = data.get('message')
-        self.is_sent: bool = data.get('is_sent', False)
-        self.created_at: Optional[datetime] = data.get('created_at')
+    id: Optional[int]
+    schedule_id: int
+    user_id: str
+    guild_id: str
+    channel_id: str
+    remind_datetime: Optional[datetime] = None
+    message: Optional[str] = None
+    is_sent: bool = False
+    created_at: Optional[datetime] = None
+    
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> 'Reminder':
+        """
+        REMINDER_COLUMNS の順に並んだ行タプルから生成
+        
+        Args:
+            row: reminders テーブルの行
+        
+        Returns:
+            リマインダーオブジェクト
+        """
+        id, schedule_id, user_id, guild_id, channel_id, remind, message, is_sent, created = row
+        return tuple.__new__(cls, (
+            id, schedule_id, user_id, guild_id, channel_id,
+            _fromtimestamp(remind) if type(remind) is int else epoch_to_datetime(remind),
+            message,
+            bool(is_sent),
+            _fromtimestamp(created) if type(created) is int else epoch_to_datetime(created)
+        ))
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Reminder':
+        """
+        辞書から生成（旧コンストラクタ互換）
+        """
+        return cls(
+            data.get('id'),
+            data['schedule_id'],
+            data['user_id'],
+            data['guild_id'],
+            data['channel_id'],
+            data['remind_datetime'],
+            data.get('message'),
+            data.get('is_sent', False),
+            data.get('created_at')
+        )
     
     def to_dict(self) -> Dict[str, Any]:
         """
         辞書形式に変換
         """
-        return {
-            'id': self.id,
-            'schedule_id': self.schedule_id,
-            'user_id': self.user_id,
-            'guild_id': self.guild_id,
-            'channel_id': self.channel_id,
-            'remind_datetime': self.remind_datetime,
-            'message': self.message,
-            'is_sent': self.is_sent,
-            'created_at': self.created_at
-        }
+        return dict(zip(self._fields, self))
     
     def __str__(self) -> str:
         """
@@ -131,8 +333,65 @@ class Reminder:
         """
         return f"Reminder(id={self.id}, schedule_id={self.schedule_id}, remind_at={self.remind_datetime})"
 
-# データベース初期化用のSQL文リスト
-INIT_SQL_STATEMENTS = [
-    SCHEDULES_TABLE_SQL,
-    REMINDERS_TABLE_SQL
-] + INDEXES_SQL
+class SchedulePage:
+    """
+    予定一覧の1ページ分の結果
+    """
+    
+    def __init__(self, items: List['Schedule'], next_cursor: Optional[str] = None):
+        self.items: List[Schedule] = items
+        # 次ページ取得用のカーソル（最後のページの場合はNone）
+        self.next_cursor: Optional[str] = next_cursor
+    
+    @property
+    def has_next(self) -> bool:
+        """次のページがあるか"""
+        return self.next_cursor is not None
+    
+    def __len__(self) -> int:
+        return len(self.items)
+    
+    def __str__(self) -> str:
+        """
+        文字列表現
+        """
+        return f"SchedulePage(items={len(self.items)}, has_next={self.has_next})"
+
+class BulkInsertResult:
+    """
+    一括作成の結果
+    入力と同じ順でIDを保持し、失敗した行はエラー内容を記録する
+    """
+    
+    def __init__(self, total: int):
+        # 入力と同じ順の作成ID（失敗した行はNone）
+        self.ids: List[Optional[int]] = [None] * total
+        # 失敗した行の番号（0始まり）→ エラー内容
+        self.errors: Dict[int, str] = {}
+    
+    @property
+    def created_ids(self) -> List[int]:
+        """作成に成功した予定のID"""
+        return [schedule_id for schedule_id in self.ids if schedule_id is not None]
+    
+    @property
+    def total(self) -> int:
+        """入力された行数"""
+        return len(self.ids)
+    
+    def add_error(self, index: int, message: str):
+        """
+        行の失敗を記録
+        
+        Args:
+            index: 行の番号（0始まり）
+            message: エラー内容
+        """
+        self.ids[index] = None
+        self.errors[index] = message
+    
+    def __str__(self) -> str:
+        """
+        文字列表現
+        """
+        return f"BulkInsertResult(created={len(self.created_ids)}, failed={len(self.errors)}, total={self.total})"
@@ -0,0 +1,167 @@
+"""
+データベース接続プール
+aiosqlite接続（= バックグラウンドスレッド）をクエリごとに作り直さず使い回すためのプール
+書き込み用1本 + 読み込み用N本の接続を保持する
+
+作成者: [Your Name]
+作成日: 2026-10-17
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    """
+    SQLite接続プール
+
+    書き込みは1本の接続をロックで直列化し、読み込みは複数の接続をキューで貸し出す
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        readers: int = 4,
+        pragmas: Optional[Dict[str, Any]] = None
+    ):
+        self.db_path = db_path
+        self.reader_count = max(1, readers)
+        # 接続ごとに適用するPRAGMA（記述順に適用）
+        self.pragmas = dict(pragmas or {})
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._writer_lock = asyncio.Lock()
+        self._readers: List[aiosqlite.Connection] = []
+        self._idle_readers: Optional[asyncio.Queue] = None
+        self._closed = True
+
+    @property
+    def is_open(self) -> bool:
+        """プールが使用可能かどうか"""
+        return not self._closed
+
+    async def _connect(self) -> aiosqlite.Connection:
+        """
+        新しい接続を作成
+
+        Returns:
+            設定済みの接続
+        """
+        # 行はタプルのまま返す（モデルへの変換は列位置で行う）
+        db = await aiosqlite.connect(self.db_path)
+
+        try:
+            for name, value in self.pragmas.items():
+                await db.execute(f"PRAGMA {name} = {value}")
+        except Exception:
+            await db.close()
+            raise
+
+        return db
+
+    async def open(self):
+        """
+        書き込み用・読み込み用の接続をすべて開く
+        """
+        if not self._closed:
+            return
+
+        try:
+            self._writer = await self._connect()
+            self._idle_readers = asyncio.Queue()
+            for _ in range(self.reader_count):
+                db = await self._connect()
+                self._readers.append(db)
+                self._idle_readers.put_nowait(db)
+        except Exception:
+            await self._close_all()
+            raise
+
+        self._closed = False
+        logger.info(f"接続プールを開きました: 読み込み{self.reader_count}本 + 書き込み1本")
+
+    async def close(self):
+        """
+        すべての接続を閉じる
+        """
+        if self._closed:
+            return
+
+        self._closed = True
+        # 実行中の書き込みが終わるのを待ってから閉じる
+        async with self._writer_lock:
+            await self._close_all()
+        logger.info("接続プールを閉じました")
+
+    async def _close_all(self):
+        """保持しているすべての接続を閉じる"""
+        connections = list(self._readers)
+        if self._writer is not None:
+            connections.append(self._writer)
+
+        for db in connections:
+            try:
+                await db.close()
+            except Exception as e:
+                logger.warning(f"接続クローズ時のエラー: {e}")
+
+        self._writer = None
+        self._readers = []
+        self._idle_readers = None
+
+    def connections(self) -> List[aiosqlite.Connection]:
+        """
+        プールが保持する全接続（書き込み用を含む）
+
+        Returns:
+            接続のリスト
+        """
+        connections = list(self._readers)
+        if self._writer is not None:
+            connections.insert(0, self._writer)
+        return connections
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        読み込み用の接続を借りる
+        """
+        if self._closed:
+            raise RuntimeError("接続プールが開かれていません")
+
+        idle_readers = self._idle_readers
+        db = await idle_readers.get()
+        try:
+            yield db
+        finally:
+            if self._closed or self._idle_readers is not idle_readers:
+                # 貸し出し中にプールが閉じられた場合はキューに戻さず閉じる
+                try:
+                    await db.close()
+                except Exception as e:
+                    logger.warning(f"接続クローズ時のエラー: {e}")
+            else:
+                idle_readers.put_nowait(db)
+
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        書き込み用の接続を排他的に借りる
+        例外時は未コミットの変更をロールバックする
+        """
+        if self._closed:
+            raise RuntimeError("接続プールが開かれていません")
+
+        async with self._writer_lock:
+            try:
+                yield self._writer
+            except BaseException:
+                if self._writer.in_transaction:
+                    await self._writer.rollback()
+                raise
@@ -0,0 +1,288 @@
+"""
+繰り返し予定
+RRULE（RFC 5545）のサブセットで繰り返しを表し、予定は1行だけ保存して表示範囲の分だけ展開する
+
+作成者: [Your Name]
+作成日: 2026-10-17
+"""
+
+import calendar
+from datetime import datetime, timedelta
+from typing import Iterator, NamedTuple, Optional, Tuple
+
+from .models import Schedule
+
+# 対応する繰り返しの単位
+FREQUENCIES = ('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY')
+
+# BYDAY の曜日（datetime.weekday() の順）
+WEEKDAYS = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+
+# COUNT・INTERVAL の上限
+MAX_COUNT = 1000
+MAX_INTERVAL = 1000
+
+# (INTERVAL=1 の表示, INTERVAL>1 の単位)
+_FREQUENCY_LABELS = {
+    'DAILY': ('毎日', '日'),
+    'WEEKLY': ('毎週', '週'),
+    'MONTHLY': ('毎月', 'か月'),
+    'YEARLY': ('毎年', '年'),
+}
+_WEEKDAY_LABELS = '月火水木金土日'
+
+
+def _add_months(value: datetime, months: int) -> Optional[datetime]:
+    """月を加算（その月に同じ日がない場合はNone）"""
+    month_index = value.month - 1 + months
+    year, month = value.year + month_index // 12, month_index % 12 + 1
+    if value.day > calendar.monthrange(year, month)[1]:
+        return None
+    return value.replace(year=year, month=month)
+
+
+def _parse_until(value: str) -> datetime:
+    """UNTIL の値（YYYYMMDD または YYYYMMDDTHHMMSS）を解析"""
+    value = value.rstrip('Z')
+    if 'T' in value:
+        return datetime.strptime(value, '%Y%m%dT%H%M%S')
+    # 日付のみの場合はその日の終わりまで
+    return datetime.strptime(value, '%Y%m%d') + timedelta(days=1, seconds=-1)
+
+
+class Recurrence(NamedTuple):
+    """
+    繰り返しのルール（FREQ / INTERVAL / COUNT / UNTIL / BYDAY に対応）
+    """
+
+    freq: str
+    interval: int = 1
+    count: Optional[int] = None
+    until: Optional[datetime] = None
+    byday: Tuple[int, ...] = ()
+
+    @classmethod
+    def parse(cls, rule: str) -> 'Recurrence':
+        """
+        RRULE 文字列を解析
+
+        Args:
+            rule: RRULE 文字列（例: "FREQ=WEEKLY;BYDAY=MO,WE;COUNT=10"、先頭の "RRULE:" は省略可）
+
+        Returns:
+            繰り返しのルール
+
+        Raises:
+            ValueError: 対応していない形式の場合
+        """
+        text = rule.strip()
+        if text.upper().startswith('RRULE:'):
+            text = text[6:]
+
+        parts = {}
+        for part in filter(None, text.upper().split(';')):
+            key, sep, value = part.partition('=')
+            if not sep or not value:
+                raise ValueError(f"不正な繰り返しルール: {rule}")
+            parts[key] = value
+
+        freq = parts.pop('FREQ', None)
+        if freq not in FREQUENCIES:
+            raise ValueError(f"FREQ は {', '.join(FREQUENCIES)} のいずれかを指定してください: {rule}")
+
+        try:
+            interval = int(parts.pop('INTERVAL', 1))
+            count = int(parts['COUNT']) if 'COUNT' in parts else None
+            parts.pop('COUNT', None)
+            until = _parse_until(parts.pop('UNTIL')) if 'UNTIL' in parts else None
+        except ValueError:
+            raise ValueError(f"不正な繰り返しルール: {rule}")
+
+        byday: Tuple[int, ...] = ()
+        if 'BYDAY' in parts:
+            if freq != 'WEEKLY':
+                raise ValueError(f"BYDAY は FREQ=WEEKLY の場合のみ指定できます: {rule}")
+            days = parts.pop('BYDAY').split(',')
+            if any(day not in WEEKDAYS for day in days):
+                raise ValueError(f"不正な曜日: {rule}")
+            byday = tuple(sorted({WEEKDAYS.index(day) for day in days}))
+
+        if parts:
+            raise ValueError(f"対応していない項目: {', '.join(parts)}")
+        if not 1 <= interval <= MAX_INTERVAL:
+            raise ValueError(f"INTERVAL は 1〜{MAX_INTERVAL} で指定してください: {rule}")
+        if count is not None and not 1 <= count <= MAX_COUNT:
+            raise ValueError(f"COUNT は 1〜{MAX_COUNT} で指定してください: {rule}")
+
+        return cls(freq, interval, count, until, byday)
+
+    def to_rrule(self) -> str:
+        """
+        RRULE 文字列に変換（保存用）
+
+        Returns:
+            RRULE 文字列
+        """
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.byday:
+            parts.append("BYDAY=" + ','.join(WEEKDAYS[day] for day in self.byday))
+        if self.count is not None:
+            parts.append(f"COUNT={self.count}")
+        if self.until is not None:
+            parts.append(f"UNTIL={self.until.strftime('%Y%m%dT%H%M%S')}")
+        return ';'.join(parts)
+
+    def describe(self) -> str:
+        """
+        表示用の説明（例: "毎週 月・水 (10回)"）
+
+        Returns:
+            説明文
+        """
+        every, unit = _FREQUENCY_LABELS[self.freq]
+        text = every if self.interval == 1 else f"{self.interval}{unit}ごと"
+        if self.byday:
+            text += " " + '・'.join(_WEEKDAY_LABELS[day] for day in self.byday)
+        if self.count is not None:
+            text += f" ({self.count}回)"
+        if self.until is not None:
+            text += f" ({self.until.strftime('%Y/%m/%d')}まで)"
+        return text
+
+    def _candidates(self, start: datetime, after: Optional[datetime]) -> Iterator[Tuple[int, datetime]]:
+        """
+        (何回目か, 日時) を順に生成（COUNT / UNTIL は考慮しない）
+        日・週単位は after の直前まで計算で読み飛ばす
+        """
+        if self.freq in ('DAILY', 'WEEKLY') and not self.byday:
+            step = timedelta(days=self.interval * (7 if self.freq == 'WEEKLY' else 1))
+            index = 0
+            if after is not None and after > start:
+                index = -(-(after - start) // step)
+            while True:
+                yield index, start + step * index
+                index += 1
+
+        elif self.freq == 'WEEKLY':
+            week_start = start - timedelta(days=start.weekday())
+            step = timedelta(weeks=self.interval)
+            # 最初の週は開始日より前の曜日を数えない
+            first_week = sum(1 for day in self.byday if day >= start.weekday())
+            period = 0
+            if after is not None and after > week_start:
+                period = (after - week_start) // step
+            while True:
+                base = week_start + step * period
+                index = 0 if period == 0 else first_week + (period - 1) * len(self.byday)
+                for day in self.byday:
+                    value = base + timedelta(days=day)
+                    if value < start:
+                        continue
+                    yield index, value
+                    index += 1
+                period += 1
+
+        else:
+            months = self.interval * (12 if self.freq == 'YEARLY' else 1)
+            index = period = 0
+            while True:
+                value = _add_months(start, months * period)
+                if value is not None:
+                    yield index, value
+                    index += 1
+                period += 1
+
+    def occurrences(self, start: datetime, after: Optional[datetime] = None) -> Iterator[datetime]:
+        """
+        after 以降の発生日時を順に生成
+
+        Args:
+            start: 最初の発生日時（予定の開始日時）
+            after: この日時以降の発生日時のみ生成（省略時は最初から）
+
+        Returns:
+            発生日時のイテレーター（終わりのない繰り返しの場合は無限に続く）
+        """
+        for index, value in self._candidates(start, after):
+            if self.count is not None and index >= self.count:
+                return
+            if self.until is not None and value > self.until:
+                return
+            if after is None or value >= after:
+                yield value
+
+    def next_after(self, start: datetime, after: datetime) -> Optional[datetime]:
+        """
+        after より後の最初の発生日時
+
+        Args:
+            start: 最初の発生日時
+            after: 基準日時
+
+        Returns:
+            発生日時（繰り返しが終わっている場合はNone）
+        """
+        return next(self.occurrences(start, after + timedelta(seconds=1)), None)
+
+    def last(self, start: datetime) -> Optional[datetime]:
+        """
+        最後の発生日時（絞り込み用に保存する）
+
+        Args:
+            start: 最初の発生日時
+
+        Returns:
+            最後の発生日時（終わりのない繰り返しの場合はNone）
+        """
+        if self.count is None:
+            return self.until
+        last = None
+        for last in self.occurrences(start):
+            pass
+        return last
+
+
+def normalize_rrule(rule: str) -> str:
+    """
+    RRULE 文字列を検証して保存用の形式に変換
+
+    Args:
+        rule: RRULE 文字列
+
+    Returns:
+        保存用の RRULE 文字列
+
+    Raises:
+        ValueError: 対応していない形式の場合
+    """
+    return Recurrence.parse(rule).to_rrule()
+
+
+def iter_schedule_occurrences(
+    schedule: Schedule,
+    after: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> Iterator[Schedule]:
+    """
+    繰り返し予定を発生ごとの予定に展開（IDは繰り返し予定のまま）
+
+    Args:
+        schedule: 繰り返し予定
+        after: この日時以降に開始するものだけを展開（省略時は最初から）
+        end: この日時までに開始するものだけを展開（省略時は無制限）
+
+    Returns:
+        開始日時・終了日時を発生日時に合わせた予定のイテレーター
+    """
+    rule = Recurrence.parse(schedule.recurrence)
+    duration = schedule.end_datetime - schedule.start_datetime if schedule.end_datetime else None
+
+    for start in rule.occurrences(schedule.start_datetime, after):
+        if end is not None and start > end:
+            return
+        yield schedule._replace(
+            start_datetime=start,
+            end_datetime=start + duration if duration is not None else None
+        )
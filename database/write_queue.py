@@ -0,0 +1,202 @@
+"""
+グループコミット用の書き込みキュー
+複数のコマンドから同時に届いた書き込みをまとめ、1トランザクション（= 1回のfsync）でコミットする
+
+作成者: [Your Name]
+作成日: 2026-10-17
+"""
+
+import asyncio
+import logging
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+from .pool import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+
+class WriteResult(NamedTuple):
+    """
+    書き込み1件分の結果
+    """
+
+    lastrowid: Optional[int]
+    rowcount: int
+    rows: List[Tuple[Any, ...]]  # RETURNING 句の結果（fetch=True の場合のみ）
+
+
+class _WriteOp(NamedTuple):
+    """キューに積まれた書き込み"""
+
+    sql: str
+    params: Sequence[Any]
+    fetch: bool
+    future: asyncio.Future
+
+
+class WriteQueue:
+    """
+    書き込みをまとめてコミットするキュー
+
+    SQLiteは失敗した文の変更だけを取り消すため、1件が失敗しても同じバッチの他の書き込みには影響しない
+    呼び出し元の Future はコミット完了後に解決されるため、結果を受け取った時点でデータは永続化済み
+    """
+
+    def __init__(
+        self,
+        pool: ConnectionPool,
+        flush_interval: float = 0.0,
+        max_batch: int = 256
+    ):
+        """
+        Args:
+            pool: 接続プール
+            flush_interval: 最初の書き込みが届いてからコミットするまでの追加の待ち時間（秒）
+                コミット中に届いた書き込みは次のバッチにまとまるため、通常は0（ディスクの速度に応じて自然にまとまる）
+            max_batch: 1トランザクションにまとめる最大件数
+        """
+        self.pool = pool
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # 統計情報
+        self.commits = 0
+        self.writes = 0
+
+    @property
+    def is_running(self) -> bool:
+        """キューが動作中かどうか"""
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """
+        書き込みループを開始
+        """
+        if self.is_running:
+            return
+
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """
+        キューに残っている書き込みをすべてコミットしてから停止
+        """
+        if not self.is_running:
+            return
+
+        await self._queue.put(None)  # 停止の合図
+        await self._task
+        self._task = None
+
+    def submit(self, sql: str, params: Sequence[Any] = (), fetch: bool = False) -> asyncio.Future:
+        """
+        書き込みをキューに積む
+
+        Args:
+            sql: 実行するSQL文
+            params: パラメータ
+            fetch: RETURNING 句の結果を取得するか
+
+        Returns:
+            コミット後に WriteResult で解決される Future
+        """
+        if not self.is_running:
+            raise RuntimeError("書き込みキューが開始されていません")
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_WriteOp(sql, params, fetch, future))
+        return future
+
+    async def execute(self, sql: str, params: Sequence[Any] = (), fetch: bool = False) -> WriteResult:
+        """
+        書き込みをキューに積み、コミットされるまで待つ
+
+        Args:
+            sql: 実行するSQL文
+            params: パラメータ
+            fetch: RETURNING 句の結果を取得するか
+
+        Returns:
+            書き込み結果
+        """
+        return await self.submit(sql, params, fetch)
+
+    async def _run(self):
+        """書き込みループ"""
+        stopping = False
+
+        while not stopping:
+            op = await self._queue.get()
+            if op is None:
+                break
+
+            # 同時に実行中のコマンドの書き込みが積まれるのを待ってからまとめる
+            await asyncio.sleep(self.flush_interval)
+
+            batch = [op]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                op = self._queue.get_nowait()
+                if op is None:
+                    stopping = True
+                    break
+                batch.append(op)
+
+            await self._flush(batch)
+
+        # 停止の合図より後に積まれた書き込みも取りこぼさない
+        remaining = []
+        while not self._queue.empty():
+            op = self._queue.get_nowait()
+            if op is not None:
+                remaining.append(op)
+        for start in range(0, len(remaining), self.max_batch):
+            await self._flush(remaining[start:start + self.max_batch])
+
+    async def _flush(self, batch: List[_WriteOp]):
+        """
+        バッチを1トランザクションで実行してコミット
+
+        Args:
+            batch: 書き込みのリスト
+        """
+        results: List[Tuple[_WriteOp, Any]] = []
+
+        try:
+            async with self.pool.writer() as db:
+                await db.execute("BEGIN IMMEDIATE")
+
+                for op in batch:
+                    try:
+                        cursor = await db.execute(op.sql, op.params)
+                        rows = list(await cursor.fetchall()) if op.fetch else []
+                        results.append((op, WriteResult(cursor.lastrowid, cursor.rowcount, rows)))
+                    except Exception as e:
+                        # 制約違反などで失敗した文はその文だけが取り消される
+                        # （ディスクエラー等でトランザクションごと失われた場合はバッチ全体を失敗とする）
+                        if not db.in_transaction:
+                            raise
+                        results.append((op, e))
+
+                await db.commit()
+
+        except Exception as e:
+            logger.error(f"グループコミットエラー ({len(batch)}件): {e}")
+            for op in batch:
+                if not op.future.done():
+                    op.future.set_exception(e)
+            return
+
+        self.commits += 1
+        self.writes += len(batch)
+
+        # コミット完了後に各呼び出し元へ結果を返す
+        for op, result in results:
+            if op.future.done():
+                continue
+            if isinstance(result, Exception):
+                op.future.set_exception(result)
+            else:
+                op.future.set_result(result)
@@ -10,6 +10,7 @@ import os
 import asyncio
 import logging
 from datetime import datetime
+from typing import Optional
 import discord
 from discord.ext import commands, tasks
 from dotenv import load_dotenv
@@ -19,17 +20,21 @@ import threading
 # 環境変数の読み込み
 load_dotenv()
 
-# ログ設定
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('bot.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
+def setup_logging():
+    """
+    ログ設定（BOTとして起動した場合のみ。ベンチマークなどから ScheduleBot を読み込んだ場合は bot.log に書き込まない）
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('bot.log', encoding='utf-8'),
+            logging.StreamHandler()
+        ]
+    )
+
 class ScheduleBot(commands.Bot):
     """
     予定管理とYouTube再生機能を持つDiscord BOT
@@ -47,6 +52,13 @@ class ScheduleBot(commands.Bot):
             help_command=None    # デフォルトのhelpコマンドを無効化
         )
         
+        # リマインダーの送信（並行送信 + レート制限）とスケジューラー
+        # スケジューラーの開始はチャンネル情報が揃う on_ready で行う
+        from utils.reminder_dispatcher import ReminderDispatcher
+        from utils.reminder_scheduler import ReminderScheduler
+        self.reminder_dispatcher = ReminderDispatcher(self.send_reminder)
+        self.reminder_scheduler = ReminderScheduler(self.reminder_dispatcher.dispatch)
+        
     async def setup_hook(self):
         """
         BOT起動時の初期化処理
@@ -54,10 +66,13 @@ class ScheduleBot(commands.Bot):
         logger.info("BOTの初期化を開始...")
         
         # データベースの初期化
-        from database.database import init_database
+        from database.database import init_database, add_reminder_listener
         await init_database()
         logger.info("データベースの初期化完了")
         
+        # リマインダーの作成・予定の削除をスケジューラーに通知する
+        add_reminder_listener(self.reminder_scheduler)
+        
         # Cogsの読み込み
         cogs_to_load = [
             'cogs.schedule',  # 予定管理機能
@@ -80,8 +95,8 @@ class ScheduleBot(commands.Bot):
             logger.error(f"スラッシュコマンドの同期に失敗: {e}")
         
         # 定期実行タスクの開始
-        self.reminder_task.start()
-        logger.info("リマインダータスクを開始しました")
+        self.wal_checkpoint_task.start()
+        logger.info("WALチェックポイントタスクを開始しました")
     
     async def on_ready(self):
         """
@@ -98,6 +113,9 @@ class ScheduleBot(commands.Bot):
         )
         await self.change_presence(activity=activity)
         
+        # リマインダースケジューラーの開始（再接続時は何もしない）
+        self.reminder_scheduler.start()
+        
     async def on_guild_join(self, guild):
         """
         新しいサーバーに追加された時の処理
@@ -124,38 +142,110 @@ class ScheduleBot(commands.Bot):
             except discord.Forbidden:
                 logger.warning(f"サーバー {guild.name} でウェルカムメッセージの送信に失敗（権限不足）")
     
-    @tasks.loop(minutes=1)
-    async def reminder_task(self):
+    async def close(self):
         """
-        リマインダーの定期チェック（1分間隔）
+        BOT終了時の処理
         """
-        try:
-            from database.database import get_pending_reminders
-            from utils.helpers import send_reminder
-            
-            # 通知が必要なリマインダーを取得
-            reminders = await get_pending_reminders()
-            
-            for reminder in reminders:
-                try:
-                    await send_reminder(self, reminder)
-                    logger.info(f"リマインダーを送信: {reminder['title']}")
-                except Exception as e:
-                    logger.error(f"リマインダー送信エラー: {e}")
-                    
-        except Exception as e:
-            logger.error(f"リマインダータスクでエラー: {e}")
+        self.wal_checkpoint_task.cancel()
+        await self.reminder_scheduler.stop()
+        await super().close()
+
+        # データベース接続プールを閉じる
+        from database.database import close_database
+        await close_database()
+        logger.info("データベース接続を閉じました")
+
+    async def send_reminder(self, reminders) -> bool:
+        """
+        同じチャンネル・同じ予定のリマインダーをまとめて1通で送信
+        （送信済みのマークはディスパッチャーがまとめて行う）
+        
+        Args:
+            reminders: 送信待ちリマインダーのリスト
+        
+        Returns:
+            送信できた場合はTrue（失敗時は例外を送出し、失敗理由はディスパッチャーが記録する）
+        """
+        from utils.helpers import send_reminder_digest
+        
+        return await send_reminder_digest(self, reminders)
+    
+    def reminder_stats(self) -> dict:
+        """
+        リマインダー送信の統計情報を取得
+        
+        Returns:
+            送信数・送信待ち件数・スループット・遅延リマインダーの処理状況などの辞書
+        """
+        next_deadline = self.reminder_scheduler.next_deadline
+        return {
+            **self.reminder_dispatcher.stats(),
+            'scheduled': len(self.reminder_scheduler),
+            'next_deadline': next_deadline.isoformat() if next_deadline else None,
+            'catching_up': self.reminder_scheduler.is_catching_up,
+            'catch_up': self.reminder_scheduler.catch_up.as_dict() if self.reminder_scheduler.catch_up else None,
+        }
     
-    @reminder_task.before_loop
-    async def before_reminder_task(self):
+    async def reminder_metrics(self) -> str:
         """
-        リマインダータスク開始前の待機
+        リマインダー送信のメトリクスを Prometheus のテキスト形式で取得
+        
+        Returns:
+            通知の遅れ・送信時間のヒストグラム、送信数・失敗数、滞留件数などのメトリクス
         """
-        await self.wait_until_ready()
+        from database.database import get_reminder_backlog
+        
+        dispatcher = self.reminder_dispatcher
+        counters = {
+            'reminders_sent_total': ("Reminders delivered.", dispatcher.sent),
+            'reminders_failed_total': ("Reminder deliveries that failed.", dispatcher.failed),
+            'reminders_dead_lettered_total': (
+                "Reminders given up after the maximum attempts.", dispatcher.dead_lettered
+            ),
+            'reminder_messages_total': ("Reminder messages posted.", dispatcher.messages),
+        }
+        gauges = {
+            'reminder_queue_depth': ("Reminders waiting for a send slot.", dispatcher.queue_depth),
+            'reminder_in_flight': ("Reminders being sent.", dispatcher.in_flight),
+            'reminder_scheduled': ("Reminders held by the scheduler.", len(self.reminder_scheduler)),
+            'reminder_catching_up': (
+                "1 while overdue reminders are being caught up.", int(self.reminder_scheduler.is_catching_up)
+            ),
+        }
+        
+        backlog = await get_reminder_backlog()
+        if backlog is not None:
+            oldest = backlog['oldest_overdue']
+            gauges['reminder_backlog'] = ("Unsent reminders past their remind time.", backlog['overdue'])
+            gauges['reminder_backlog_leased'] = ("Overdue reminders currently claimed by a worker.", backlog['leased'])
+            gauges['reminder_backlog_oldest_seconds'] = (
+                "Age of the oldest overdue reminder.",
+                max(0.0, (datetime.now() - oldest).total_seconds()) if oldest else 0
+            )
+        
+        return dispatcher.metrics.render_prometheus(counters, gauges)
+    
+    @tasks.loop(minutes=10)
+    async def wal_checkpoint_task(self):
+        """
+        WALチェックポイントの定期実行（10分間隔）
+        """
+        try:
+            from database.database import checkpoint_wal
+            
+            result = await checkpoint_wal()
+            if result and result[0]:
+                logger.warning("WALチェックポイントが読み込み中の接続により一部スキップされました")
+                
+        except Exception as e:
+            logger.error(f"WALチェックポイントタスクでエラー: {e}")
 
-async def create_health_server():
+async def create_health_server(bot: Optional[ScheduleBot] = None):
     """
     Render用のヘルスチェックHTTPサーバーを作成
+    
+    Args:
+        bot: 状態を表示するBOTインスタンス（オプション）
     """
     async def health_check(request):
         return web.json_response({
@@ -165,15 +255,37 @@ async def create_health_server():
         })
     
     async def bot_status(request):
-        return web.json_response({
+        from database.database import get_month_cache_stats, get_reminder_backlog
+        from utils.media_cache import media_cache, search_cache
+        from utils.extractor_pool import extractor_pool
+        
+        status = {
             "status": "running",
-            "type": "discord-bot"
-        })
+            "type": "discord-bot",
+            "month_cache": get_month_cache_stats(),
+            "media_cache": media_cache.stats(),
+            "search_cache": search_cache.stats(),
+            "extractor": extractor_pool.stats()
+        }
+        if bot is not None:
+            status["reminders"] = bot.reminder_stats()
+            backlog = await get_reminder_backlog()
+            if backlog is not None:
+                oldest = backlog['oldest_overdue']
+                backlog['oldest_overdue'] = oldest.isoformat() if oldest else None
+            status["reminders"]["backlog"] = backlog
+        return web.json_response(status)
+    
+    async def metrics(request):
+        if bot is None:
+            return web.Response(status=404)
+        return web.Response(text=await bot.reminder_metrics(), content_type='text/plain', charset='utf-8')
     
     app = web.Application()
     app.router.add_get('/', health_check)
     app.router.add_get('/health', health_check)
     app.router.add_get('/status', bot_status)
+    app.router.add_get('/metrics', metrics)
     
     # Renderから提供されるPORT環境変数を使用
     port = int(os.getenv('PORT', 10000))
@@ -203,12 +315,14 @@ async def main():
         logger.error("デフォルトのトークンが設定されています。実際のBOTトークンに変更してください。")
         return
     
+    # BOTインスタンスの作成
+    bot = ScheduleBot()
+    
     # Render用HTTPサーバーの起動
     logger.info("Render用HTTPサーバーを起動中...")
-    http_runner = await create_health_server()
+    http_runner = await create_health_server(bot)
     
-    # BOTインスタンスの作成と起動
-    bot = ScheduleBot()
+    # BOTの起動
     
     try:
         logger.info("Discord BOTに接続を試行中...")
@@ -237,6 +351,8 @@ async def main():
         await http_runner.cleanup()
 
 if __name__ == '__main__':
+    setup_logging()
+    
     # Windowsでのイベントループポリシー設定（必要に応じて）
     if os.name == 'nt':
         asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
@@ -0,0 +1,128 @@
+"""
+一括作成のベンチマークスクリプト
+
+1行ずつ execute して lastrowid を集める従来方式と、チャンク単位の
+複数行 INSERT ... RETURNING id による create_bulk_schedules で秒間作成行数を比較します。
+一括作成の実行中に他のコマンド（予定の取得・リマインダー作成）の応答時間も計測します。
+
+実行例:
+    (venv) $ python tests/bench_bulk.py --rows 20000
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database import database  # noqa: E402
+from database.models import datetime_to_epoch  # noqa: E402
+
+
+def make_rows(count: int, invalid_every: int):
+    """一括作成用のデータ（invalid_every 行ごとに不正な行を混ぜる）"""
+    base = datetime.now() + timedelta(days=1)
+    rows = []
+    for i in range(count):
+        row = {
+            'user_id': str(i % 50),
+            'guild_id': '1',
+            'title': f"予定{i}",
+            'description': None,
+            'start_datetime': base + timedelta(minutes=i),
+        }
+        if invalid_every and i % invalid_every == invalid_every - 1:
+            row['title'] = None
+        rows.append(row)
+    return rows
+
+
+async def legacy_bulk(rows) -> int:
+    """従来方式: 1行ずつ execute して最後にまとめてコミット"""
+    now = database._now_epoch()
+    created = 0
+    async with database._get_pool().writer() as db:
+        for data in rows:
+            cursor = await db.execute(
+                """
+                INSERT INTO schedules (
+                    user_id, guild_id, title, description,
+                    start_datetime, end_datetime, created_at, updated_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    data['user_id'], data['guild_id'], data['title'], data.get('description'),
+                    datetime_to_epoch(data['start_datetime']), None, now, now
+                )
+            )
+            created += cursor.lastrowid is not None
+        await db.commit()
+    return created
+
+
+async def probe(stop: asyncio.Event, latencies) -> None:
+    """一括作成中に他のコマンドを実行し、応答時間を記録"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await database.get_schedule_by_id(1)
+        await database.create_reminder(1, '1', '1', '1', datetime.now())
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(0.01)
+
+
+async def main_async(args) -> None:
+    # 作成ごとのINFOログで計測が乱れないようにする
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        await database.init_database(Path(tmp) / 'bench.db')
+        try:
+            # 従来方式は不正な行が1件でもあると全体が失敗するため、正常な行のみで計測
+            rows = make_rows(args.rows, 0)
+            started = time.perf_counter()
+            created = await legacy_bulk(rows)
+            elapsed = time.perf_counter() - started
+            print(f"{'1行ずつ execute (従来)':<28} {created:>7} 行 / {elapsed:6.2f} 秒 = {created / elapsed:9.0f} 行/秒")
+
+            rows = make_rows(args.rows, args.invalid_every)
+            stop = asyncio.Event()
+            latencies = []
+            prober = asyncio.create_task(probe(stop, latencies))
+
+            started = time.perf_counter()
+            result = await database.create_bulk_schedules(rows)
+            elapsed = time.perf_counter() - started
+
+            stop.set()
+            await prober
+
+            created = len(result.created_ids)
+            print(f"{'チャンク INSERT ... RETURNING':<28} {created:>7} 行 / {elapsed:6.2f} 秒 = {created / elapsed:9.0f} 行/秒")
+            print(f"失敗した行: {len(result.errors)}件 (例: {next(iter(result.errors.items()), None)})")
+
+            if latencies:
+                latencies.sort()
+                print(
+                    f"一括作成中の他コマンド: {len(latencies)}回, "
+                    f"中央値 {latencies[len(latencies) // 2] * 1000:.1f} ms, "
+                    f"最大 {latencies[-1] * 1000:.1f} ms"
+                )
+        finally:
+            await database.close_database()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="一括作成のベンチマーク")
+    parser.add_argument('--rows', type=int, default=20000, help="一括作成する行数")
+    parser.add_argument('--invalid-every', type=int, default=1000, help="この行数ごとに不正な行を混ぜる（0で混ぜない）")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
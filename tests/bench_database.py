@@ -0,0 +1,159 @@
+"""
+データベースアクセスのベンチマークスクリプト
+
+クエリごとに aiosqlite.connect() する従来方式と、共有接続プール経由の方式で
+秒間クエリ数を比較します。書き込みについては、1件ごとにコミットする従来方式と
+書き込みキューによるグループコミットで秒間書き込み数を比較します。
+一時ディレクトリのデータベースを使うため、本番の schedule_bot.db には影響しません。
+
+実行例:
+    (venv) $ python tests/bench_database.py --schedules 2000 --queries 5000 --writes 2000 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import aiosqlite
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database import database  # noqa: E402
+
+
+async def seed(count: int) -> None:
+    """ベンチマーク用の予定を作成"""
+    base = datetime.now() + timedelta(days=1)
+    rows = [
+        {
+            'user_id': str(i % 50),
+            'guild_id': '1',
+            'title': f"予定{i}",
+            'description': None,
+            'start_datetime': base + timedelta(hours=i),
+        }
+        for i in range(count)
+    ]
+    await database.create_bulk_schedules(rows)
+
+
+async def connect_per_query(db_path: Path, schedule_id: int, user_id: str) -> None:
+    """従来方式: クエリごとに接続を開閉する"""
+    async with aiosqlite.connect(db_path) as db:
+        db.row_factory = aiosqlite.Row
+        async with db.execute(
+            "SELECT * FROM schedules WHERE id = ? AND is_active = TRUE",
+            (schedule_id,)
+        ) as cursor:
+            await cursor.fetchone()
+
+    async with aiosqlite.connect(db_path) as db:
+        db.row_factory = aiosqlite.Row
+        async with db.execute(
+            """
+            SELECT * FROM schedules
+            WHERE user_id = ? AND guild_id = ? AND is_active = TRUE
+            ORDER BY start_datetime ASC LIMIT ?
+            """,
+            (user_id, '1', 50)
+        ) as cursor:
+            await cursor.fetchall()
+
+
+async def pooled(db_path: Path, schedule_id: int, user_id: str) -> None:
+    """プール方式: database.py の関数をそのまま呼ぶ"""
+    await database.get_schedule_by_id(schedule_id)
+    await database.get_schedules_by_user(user_id, '1')
+
+
+def owner_of(schedule_id: int) -> str:
+    """seed() で作成した予定の所有ユーザーID"""
+    return str((schedule_id - 1) % 50)
+
+
+async def commit_per_write(db_path: Path, schedule_id: int, user_id: str) -> None:
+    """従来方式: 書き込みごとにコミットする"""
+    async with database._get_pool().writer() as db:
+        await db.execute(
+            """
+            INSERT INTO reminders (schedule_id, user_id, guild_id, channel_id, remind_datetime, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (schedule_id, user_id, '1', '1', database._now_epoch(), database._now_epoch())
+        )
+        await db.commit()
+    async with database._get_pool().writer() as db:
+        await db.execute(
+            "UPDATE schedules SET description = ?, updated_at = ? WHERE id = ? AND user_id = ?",
+            ("更新", database._now_epoch(), schedule_id, owner_of(schedule_id))
+        )
+        await db.commit()
+
+
+async def group_commit(db_path: Path, schedule_id: int, user_id: str) -> None:
+    """グループコミット方式: database.py の関数をそのまま呼ぶ"""
+    await database.create_reminder(schedule_id, user_id, '1', '1', datetime.now())
+    await database.update_schedule(schedule_id, owner_of(schedule_id), description="更新")
+
+
+async def run(name: str, func, db_path: Path, schedules: int, queries: int, concurrency: int) -> float:
+    """並列にクエリを実行して秒間クエリ数を返す"""
+    semaphore = asyncio.Semaphore(concurrency)
+    rng = random.Random(0)
+    # 1回の呼び出しで2クエリ発行する
+    calls = [(rng.randint(1, schedules), str(rng.randint(0, 49))) for _ in range(queries // 2)]
+
+    async def one(schedule_id: int, user_id: str):
+        async with semaphore:
+            await func(db_path, schedule_id, user_id)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(s, u) for s, u in calls))
+    elapsed = time.perf_counter() - started
+
+    qps = len(calls) * 2 / elapsed
+    print(f"{name:<24} {len(calls) * 2:>7} クエリ / {elapsed:7.2f} 秒 = {qps:9.1f} q/s")
+    return qps
+
+
+async def main_async(args) -> None:
+    # 作成・更新ごとのINFOログで計測が乱れないようにする
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / 'bench.db'
+        await database.init_database(db_path)
+        try:
+            await seed(args.schedules)
+
+            before = await run("接続を毎回作成 (従来)", connect_per_query, db_path,
+                               args.schedules, args.queries, args.concurrency)
+            after = await run("共有接続プール", pooled, db_path,
+                              args.schedules, args.queries, args.concurrency)
+            print(f"改善率: {after / before:.1f} 倍\n")
+
+            before = await run("1件ごとにコミット (従来)", commit_per_write, db_path,
+                               args.schedules, args.writes, args.concurrency)
+            after = await run("グループコミット", group_commit, db_path,
+                              args.schedules, args.writes, args.concurrency)
+            print(f"改善率: {after / before:.1f} 倍")
+        finally:
+            await database.close_database()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="データベースアクセスのベンチマーク")
+    parser.add_argument('--schedules', type=int, default=2000, help="作成する予定の件数")
+    parser.add_argument('--queries', type=int, default=4000, help="実行するクエリ数")
+    parser.add_argument('--writes', type=int, default=2000, help="実行する書き込み数")
+    parser.add_argument('--concurrency', type=int, default=20, help="同時実行数")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+モデル変換のマイクロベンチマーク
+
+SQLiteから取得した行を予定オブジェクトに変換する処理について、
+従来方式（sqlite3.Row → dict(row) → 属性コピー、インスタンス辞書あり）と
+現在の方式（行タプル → 位置指定で Schedule.from_row、スロットのみ）の
+変換速度とメモリ使用量を比較します。
+
+実行例:
+    (venv) $ python tests/bench_models.py --rows 1000000
+"""
+
+import argparse
+import gc
+import sqlite3
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database.models import (  # noqa: E402
+    SCHEDULES_TABLE_SQL,
+    SCHEDULE_SELECT_SQL,
+    Schedule,
+    epoch_to_datetime
+)
+
+
+class LegacySchedule:
+    """従来の予定モデル（インスタンス辞書あり、辞書から生成）"""
+
+    def __init__(self, data):
+        self.id = data.get('id')
+        self.user_id = data['user_id']
+        self.guild_id = data['guild_id']
+        self.title = data['title']
+        self.description = data.get('description')
+        self.start_datetime = data['start_datetime']
+        self.end_datetime = data.get('end_datetime')
+        self.created_at = data.get('created_at')
+        self.updated_at = data.get('updated_at')
+        self.is_active = data.get('is_active', True)
+
+
+def legacy_decode(rows):
+    """従来方式: dict(row) してから各日時列を変換し、さらにオブジェクトへコピー"""
+    schedules = []
+    for row in rows:
+        data = dict(row)
+        data['start_datetime'] = epoch_to_datetime(data['start_datetime'])
+        data['end_datetime'] = epoch_to_datetime(data['end_datetime'])
+        data['created_at'] = epoch_to_datetime(data['created_at'])
+        data['updated_at'] = epoch_to_datetime(data['updated_at'])
+        schedules.append(LegacySchedule(data))
+    return schedules
+
+
+def slotted_decode(rows):
+    """現在の方式: 行タプルから位置指定で直接生成"""
+    return [Schedule.from_row(row) for row in rows]
+
+
+def create_database(count: int) -> sqlite3.Connection:
+    """ベンチマーク用のインメモリDBを作成"""
+    db = sqlite3.connect(':memory:')
+    db.execute(SCHEDULES_TABLE_SQL)
+    # マイグレーションで追加された列（SCHEDULE_SELECT_SQL に含まれる）
+    db.execute("ALTER TABLE schedules ADD COLUMN recurrence TEXT")
+    base = int(datetime(2026, 1, 1).timestamp())
+    db.executemany(
+        """
+        INSERT INTO schedules (user_id, guild_id, title, description, start_datetime, end_datetime, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            (str(i % 100), '1', f"予定{i}", None, base + i * 60, base + i * 60 + 3600, base, base)
+            for i in range(count)
+        )
+    )
+    db.commit()
+    return db
+
+
+def measure(name: str, db: sqlite3.Connection, row_factory, decode) -> None:
+    """行の取得 + 変換にかかる時間と、変換後オブジェクトのメモリ量を計測"""
+    db.row_factory = row_factory
+    rows = db.execute(f"SELECT {SCHEDULE_SELECT_SQL} FROM schedules").fetchall()
+
+    # 速度（tracemalloc は遅くなるため別々に計測する）
+    gc.collect()
+    started = time.perf_counter()
+    objects = decode(rows)
+    elapsed = time.perf_counter() - started
+    del objects
+
+    # メモリ
+    gc.collect()
+    tracemalloc.start()
+    objects = decode(rows)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    count = len(objects)
+    print(
+        f"{name:<30} {count / elapsed:>12,.0f} 行/秒  "
+        f"{elapsed:6.2f} 秒  {current / 1024 / 1024:8.1f} MB ({current / count:6.0f} B/行)"
+    )
+    del objects, rows
+    gc.collect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="モデル変換のマイクロベンチマーク")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="変換する行数")
+    args = parser.parse_args()
+
+    print(f"{args.rows:,}行のDBを作成中...")
+    db = create_database(args.rows)
+
+    measure("従来 (Row → dict → __dict__)", db, sqlite3.Row, legacy_decode)
+    measure("現在 (タプル → from_row)", db, None, slotted_decode)
+
+
+if __name__ == "__main__":
+    main()
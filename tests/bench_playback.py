@@ -0,0 +1,191 @@
+"""
+音楽再生の負荷テストスクリプト（1コアあたりの同時再生数）
+
+生成した Opus（WebM）の音声をローカルの HTTP サーバーから配信し、再生方式ごとに --streams 本を同時に、
+音声スレッドと同じように1フレーム（20ms）ずつ読み出して、BOT のプロセスと FFmpeg が使った CPU 時間を計測します。
+再生した音声の長さ ÷ CPU 時間（= 1コアで同時に再生できる本数）を表示します。
+ネットワークには接続しません。FFmpeg と、pcm 方式の計測には libopus が必要です（Linux / macOS）。
+
+再生方式:
+    pcm   FFmpegPCMAudio + PCMVolumeTransformer（Python で音量計算）+ discord.py で Opus にエンコード
+    opus  FFmpeg の volume フィルターで音量を変えて Opus にエンコード（PLAYBACK_MODE=opus で音量が100%以外）
+    copy  Opus をそのまま送る（PLAYBACK_MODE=opus で音量が100%）
+
+実行例:
+    (venv) $ python tests/bench_playback.py
+    (venv) $ python tests/bench_playback.py --streams 8 --seconds 120 --modes pcm,opus
+"""
+
+import argparse
+import functools
+import http.server
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import discord  # noqa: E402
+
+from cogs.music import YTDLOpusSource, YTDLSource  # noqa: E402
+
+MODES = ('pcm', 'opus', 'copy')
+
+
+def make_input(directory: Path, seconds: float) -> Path:
+    """YouTube の音声と同じ形式（48kHz ステレオの Opus / WebM）のテスト音声を作成"""
+    path = directory / 'input.webm'
+    subprocess.run(
+        [
+            'ffmpeg', '-loglevel', 'error', '-y',
+            '-f', 'lavfi', '-i', f"sine=frequency=440:sample_rate=48000:duration={seconds}",
+            '-ac', '2', '-c:a', 'libopus', '-b:a', '128k', str(path)
+        ],
+        check=True
+    )
+    return path
+
+
+def serve(directory: Path) -> http.server.ThreadingHTTPServer:
+    """ストリーミング再生と同じく HTTP で読み込ませるためのサーバー（-reconnect などの設定をそのまま使うため）"""
+    handler = functools.partial(_QuietHandler, directory=str(directory))
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format: str, *args: Any):
+        pass
+
+
+def source_factory(
+    mode: str, url: str, seconds: float, volume: float
+) -> Callable[[], Tuple[Callable[[], bytes], discord.AudioSource]]:
+    """
+    再生方式ごとの音声ソースを作成する関数
+
+    Returns:
+        呼び出すと (1フレーム分の Opus パケットを返す関数, 後片付けする音声ソース) を返す関数
+    """
+    data = {'url': url, 'acodec': 'opus', 'title': 'bench', 'duration': seconds}
+
+    def create():
+        if mode == 'pcm':
+            source = YTDLSource.from_data(data, volume=volume)
+            encoder = discord.opus.Encoder()
+
+            def read() -> bytes:
+                # VoiceClient と同じく PCM をエンコードしてから送る
+                pcm = source.read()
+                return encoder.encode(pcm, encoder.SAMPLES_PER_FRAME) if pcm else b''
+            return read, source
+
+        source = YTDLOpusSource.from_data(data, volume=1.0 if mode == 'copy' else volume)
+        return source.read, source
+
+    return create
+
+
+def run_mode(mode: str, url: str, streams: int, seconds: float, volume: float) -> Dict[str, float]:
+    """
+    1つの再生方式で streams 本を同時に最後まで読み出す
+
+    Returns:
+        再生した音声の長さ・CPU 時間（BOT / FFmpeg）・経過時間の辞書
+    """
+    create = source_factory(mode, url, seconds, volume)
+    frames = [0] * streams
+
+    def play(index: int):
+        read, source = create()
+        try:
+            while read():
+                frames[index] += 1
+        finally:
+            source.cleanup()
+
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    children_started = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    threads = [threading.Thread(target=play, args=(i,)) for i in range(streams)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # cleanup で FFmpeg の終了を待つため、子プロセスの CPU 時間はここで確定している
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return {
+        'audio': sum(frames) * YTDLOpusSource.FRAME_SECONDS,
+        'cpu_bot': time.process_time() - cpu_started,
+        'cpu_ffmpeg': (children.ru_utime - children_started.ru_utime) + (children.ru_stime - children_started.ru_stime),
+        'wall': time.perf_counter() - started,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="音楽再生の負荷テスト（1コアあたりの同時再生数）")
+    parser.add_argument('--streams', type=int, default=4, help="同時に再生する本数")
+    parser.add_argument('--seconds', type=float, default=60, help="テスト音声の長さ（秒）")
+    parser.add_argument('--volume', type=float, default=0.1, help="pcm / opus 方式の音量（0.0 - 1.0）")
+    parser.add_argument('--modes', default=','.join(MODES), help="計測する再生方式（カンマ区切り）")
+    args = parser.parse_args()
+
+    modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+    unknown = [mode for mode in modes if mode not in MODES]
+    if unknown:
+        parser.error(f"不明な再生方式: {', '.join(unknown)}")
+
+    if resource is None:
+        print("❌ この OS では子プロセスの CPU 時間を計測できません（Linux / macOS で実行してください）")
+        sys.exit(1)
+    if shutil.which('ffmpeg') is None:
+        print("❌ FFmpegが見つかりません")
+        sys.exit(1)
+    if 'pcm' in modes and not discord.opus.is_loaded() and not discord.opus._load_default():
+        print("⚠️ libopus が見つからないため pcm 方式は計測しません")
+        modes.remove('pcm')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_input(Path(tmp), args.seconds)
+        server = serve(Path(tmp))
+        url = f"http://127.0.0.1:{server.server_address[1]}/{path.name}"
+
+        results: Dict[str, Dict[str, float]] = {}
+        try:
+            for mode in modes:
+                results[mode] = run_mode(mode, url, args.streams, args.seconds, args.volume)
+        finally:
+            server.shutdown()
+
+    print(f"同時再生 {args.streams}本 × {args.seconds:g}秒, 音量 {args.volume:g}（copy は 1.0）")
+    print(f"{'方式':<6} {'音声(秒)':>9} {'CPU BOT':>9} {'CPU FFmpeg':>11} {'経過(秒)':>9} {'1コアあたり':>11}")
+    baseline = None
+    lines: List[str] = []
+    for mode, result in results.items():
+        cpu = result['cpu_bot'] + result['cpu_ffmpeg']
+        per_core = result['audio'] / cpu if cpu else float('inf')
+        if mode == 'pcm':
+            baseline = per_core
+        ratio = f" (pcm の {per_core / baseline:.1f}倍)" if baseline and mode != 'pcm' else ""
+        lines.append(
+            f"{mode:<6} {result['audio']:>9.1f} {result['cpu_bot']:>9.2f} {result['cpu_ffmpeg']:>11.2f} "
+            f"{result['wall']:>9.2f} {per_core:>9.0f}本{ratio}"
+        )
+    print("\n".join(lines))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""
+リマインダー送信の負荷テストスクリプト
+
+一時データベースに予定とリマインダーを作成し、ScheduleBot のリマインダー送信処理
+（ReminderScheduler → ReminderDispatcher → send_reminder_digest）を、
+送信の遅延と 429（レートリミット）を再現する疑似チャンネルに対して実行します。
+ネットワークには接続しません。
+スループット・通知の遅れの分位点・1通の送信時間・データベース処理時間を表示します。
+
+実行例:
+    (venv) $ python tests/bench_reminders.py --schedules 100000 --due 2000 --window 60
+    (venv) $ python tests/bench_reminders.py --due 500 --users 5 --overdue 300 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Deque, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import discord  # noqa: E402
+
+from database import database  # noqa: E402
+from database.models import datetime_to_epoch  # noqa: E402
+from main import ScheduleBot  # noqa: E402
+from utils import reminder_dispatcher, reminder_scheduler  # noqa: E402
+from utils.reminder_dispatcher import ReminderDispatcher  # noqa: E402
+from utils.reminder_scheduler import ReminderScheduler  # noqa: E402
+
+# Discord のレートリミット（チャンネルごと 5件/5秒、全体 50件/秒）
+CHANNEL_LIMIT = (5, 5.0)
+GLOBAL_LIMIT = (50, 1.0)
+
+
+class FakeResponse:
+    """discord.HTTPException に渡す疑似レスポンス"""
+
+    def __init__(self, status: int, reason: str):
+        self.status = status
+        self.reason = reason
+
+
+class FakeDiscord:
+    """
+    疑似 Discord API
+
+    送信ごとに latency 秒前後待機する
+    レートリミットを超えた送信は discord.py と同様に retry_after 秒待って再送する（429 として数える）
+    error_rate の割合で、再送しても成功しなかった 429 として例外を送出する
+    """
+
+    def __init__(self, latency: float, error_rate: float, seed: int):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.messages = 0
+        self.rate_limited = 0
+        self.errors = 0
+        self._channels: Dict[int, 'FakeChannel'] = {}
+        self._channel_sent: Dict[int, Deque[float]] = defaultdict(deque)
+        self._global_sent: Deque[float] = deque()
+
+    def get_channel(self, channel_id: int) -> 'FakeChannel':
+        """bot.get_channel の代わり"""
+        channel = self._channels.get(channel_id)
+        if channel is None:
+            channel = self._channels[channel_id] = FakeChannel(self, channel_id)
+        return channel
+
+    def _retry_after(self, channel_id: int, now: float) -> float:
+        """レートリミットに達している場合は送信できるまでの秒数"""
+        waits = []
+        for sent, (limit, period) in (
+            (self._channel_sent[channel_id], CHANNEL_LIMIT),
+            (self._global_sent, GLOBAL_LIMIT),
+        ):
+            while sent and sent[0] <= now - period:
+                sent.popleft()
+            if len(sent) >= limit:
+                waits.append(sent[0] + period - now)
+        return max(waits, default=0.0)
+
+    async def send(self, channel_id: int):
+        """メッセージ送信"""
+        while True:
+            retry_after = self._retry_after(channel_id, time.monotonic())
+            if retry_after <= 0:
+                break
+            self.rate_limited += 1
+            await asyncio.sleep(retry_after)
+
+        now = time.monotonic()
+        self._channel_sent[channel_id].append(now)
+        self._global_sent.append(now)
+        await asyncio.sleep(self.latency * self.rng.uniform(0.5, 1.5))
+
+        if self.rng.random() < self.error_rate:
+            self.errors += 1
+            raise discord.HTTPException(FakeResponse(429, 'Too Many Requests'), 'You are being rate limited.')
+        self.messages += 1
+
+
+class FakeChannel:
+    """疑似テキストチャンネル"""
+
+    def __init__(self, api: FakeDiscord, channel_id: int):
+        self.api = api
+        self.id = channel_id
+
+    async def send(self, content=None, embed=None):
+        await self.api.send(self.id)
+
+
+class DatabaseTimer:
+    """リマインダー送信処理から呼ばれるデータベース関数の呼び出し回数と処理時間を計測"""
+
+    def __init__(self):
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.seconds: Dict[str, float] = defaultdict(float)
+
+    def wrap(self, module, name: str):
+        """module から参照している関数 name を計測付きの関数に置き換える"""
+        func = getattr(module, name)
+
+        async def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self.calls[name] += 1
+                self.seconds[name] += time.perf_counter() - started
+
+        setattr(module, name, timed)
+
+    @property
+    def total(self) -> float:
+        return sum(self.seconds.values())
+
+
+def percentile(values: List[float], q: float) -> float:
+    """ソート済みリストの分位点"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def seed(args, rng: random.Random) -> Tuple[datetime, int]:
+    """
+    予定とリマインダーを作成
+
+    Returns:
+        (通知対象期間の開始日時, 期間内・遅延中のリマインダー件数)
+    """
+    base = datetime.now().replace(microsecond=0) + timedelta(days=1)
+    result = await database.create_bulk_schedules([
+        {
+            'user_id': '1',
+            'guild_id': '1',
+            'title': f"予定{i}",
+            'start_datetime': base + timedelta(minutes=i),
+        }
+        for i in range(args.schedules)
+    ])
+    schedule_ids = result.created_ids
+
+    # 作成に時間がかかっても通知の遅れに数えないよう、期間は作成後に決める
+    start = datetime.now().replace(microsecond=0) + timedelta(seconds=args.lead)
+    now_epoch = database._now_epoch()
+    rows = []
+    due = 0
+    for index, schedule_id in enumerate(schedule_ids):
+        if index < args.overdue:
+            # 停止中に通知日時を過ぎたリマインダー（追いつき処理で送信される）
+            remind = start - timedelta(seconds=rng.uniform(args.catch_up_after + 1, args.catch_up_after + 7200))
+        elif index < args.overdue + args.due:
+            remind = start + timedelta(seconds=rng.uniform(0, args.window))
+        else:
+            remind = base + timedelta(minutes=index) - timedelta(minutes=10)
+        if index < args.overdue + args.due:
+            due += args.users
+
+        channel_id = str(1000 + index % args.channels)
+        for user in range(args.users):
+            rows.append((
+                schedule_id, str(10000 + user), '1', channel_id,
+                datetime_to_epoch(remind), None, now_epoch
+            ))
+
+    async with database._get_pool().writer() as db:
+        await db.executemany(
+            """
+            INSERT INTO reminders (schedule_id, user_id, guild_id, channel_id, remind_datetime, message, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows
+        )
+        await db.commit()
+
+    return start, due
+
+
+async def main_async(args) -> None:
+    # 送信ごとのINFOログで計測が乱れないようにする
+    logging.disable(logging.INFO)
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        await database.init_database(Path(tmp) / 'bench.db')
+        bot = ScheduleBot()
+        try:
+            started = time.perf_counter()
+            window_start, due = await seed(args, rng)
+            print(
+                f"作成: 予定 {args.schedules}件 / リマインダー {args.schedules * args.users}件 "
+                f"({time.perf_counter() - started:.1f} 秒)"
+            )
+            print(
+                f"通知対象: {due}件 (期間内 {args.due * args.users}件 / {args.window:.0f} 秒, "
+                f"遅延中 {args.overdue * args.users}件)"
+            )
+
+            # ScheduleBot と同じ構成で、送信先だけ疑似チャンネルに置き換える
+            api = FakeDiscord(args.latency_ms / 1000, args.error_rate, args.seed)
+            bot.get_channel = api.get_channel
+            bot.reminder_dispatcher = ReminderDispatcher(
+                bot.send_reminder, concurrency=args.concurrency, global_rate=args.global_rate
+            )
+            bot.reminder_scheduler = ReminderScheduler(
+                bot.reminder_dispatcher.dispatch, catch_up_after=args.catch_up_after
+            )
+
+            timer = DatabaseTimer()
+            for name in ('claim_due_reminders', 'get_next_lease_expiry', 'get_upcoming_reminders', 'mark_reminders_sent'):
+                timer.wrap(reminder_scheduler, name)
+            for name in ('mark_reminders_sent', 'fail_reminders'):
+                timer.wrap(reminder_dispatcher, name)
+
+            # 送信完了時点の遅れ（期間内 / 遅延中）と1通の送信時間を正確に記録する
+            lateness: Dict[str, List[float]] = {'期間内': [], '遅延中': []}
+            durations: List[float] = []
+            last_sent = 0.0
+            send = bot.reminder_dispatcher.send
+
+            async def recording_send(reminders):
+                nonlocal last_sent
+                send_started = time.perf_counter()
+                try:
+                    ok = await send(reminders)
+                finally:
+                    # 送信に失敗した場合は例外が送出される
+                    durations.append(time.perf_counter() - send_started)
+                if ok:
+                    last_sent = time.perf_counter()
+                    now = datetime.now()
+                    for reminder in reminders:
+                        group = '期間内' if reminder['remind_datetime'] >= window_start else '遅延中'
+                        lateness[group].append((now - reminder['remind_datetime']).total_seconds())
+                return ok
+
+            bot.reminder_dispatcher.send = recording_send
+
+            database.add_reminder_listener(bot.reminder_scheduler)
+            bot.reminder_scheduler.start()
+            run_started = time.perf_counter()
+
+            # 期間が終わり、再送待ち以外の通知対象をすべて処理するまで待つ
+            window_end = window_start + timedelta(seconds=args.window)
+            deadline = time.perf_counter() + args.lead + args.window + args.timeout
+            backlog = None
+            while time.perf_counter() < deadline:
+                await asyncio.sleep(0.5)
+                if datetime.now() < window_end:
+                    continue
+                backlog = await database.get_reminder_backlog()
+                dispatcher = bot.reminder_dispatcher
+                if (
+                    backlog is not None and backlog['overdue'] == backlog['leased']
+                    and not dispatcher.in_flight and not dispatcher.queue_depth
+                    and not bot.reminder_scheduler.is_catching_up
+                ):
+                    break
+            else:
+                print(f"⚠️ {args.timeout:.0f} 秒以内に送信し終わりませんでした (滞留: {backlog})")
+
+            elapsed = time.perf_counter() - run_started
+            await bot.reminder_scheduler.stop()
+            database.remove_reminder_listener(bot.reminder_scheduler)
+
+            stats = bot.reminder_dispatcher.stats()
+            durations.sort()
+            print(
+                f"送信: {stats['sent']}件 / メッセージ {stats['messages']}通 / 失敗 {stats['failed']}件 "
+                f"(429 で待機 {api.rate_limited}回, 429 で失敗 {api.errors}回)"
+            )
+            if bot.reminder_scheduler.catch_up is not None:
+                print(f"追いつき処理: {bot.reminder_scheduler.catch_up}")
+            sending = max(last_sent - run_started, 1e-9)
+            print(
+                f"所要時間 {elapsed:.1f} 秒, スループット {stats['sent'] / sending:.1f} 件/秒 "
+                f"(開始から最後の送信まで {sending:.1f} 秒, 到着レート {args.due * args.users / args.window:.1f} 件/秒)"
+            )
+            for group, values in lateness.items():
+                if not values:
+                    continue
+                values.sort()
+                print(
+                    f"通知の遅れ ({group}): p50 {percentile(values, 0.5):.2f} 秒 / p95 {percentile(values, 0.95):.2f} 秒 / "
+                    f"p99 {percentile(values, 0.99):.2f} 秒 / 最大 {values[-1]:.2f} 秒"
+                )
+            if durations:
+                print(
+                    f"1通の送信時間: p50 {percentile(durations, 0.5) * 1000:.0f} ms / "
+                    f"p95 {percentile(durations, 0.95) * 1000:.0f} ms / 最大 {durations[-1] * 1000:.0f} ms"
+                )
+            print(f"データベース処理: 合計 {timer.total:.2f} 秒 (所要時間の {timer.total / elapsed * 100:.1f}%)")
+            for name in sorted(timer.calls, key=lambda key: -timer.seconds[key]):
+                calls = timer.calls[name]
+                print(
+                    f"  {name:<24} {calls:>6}回 合計 {timer.seconds[name] * 1000:8.1f} ms "
+                    f"平均 {timer.seconds[name] / calls * 1000:6.2f} ms"
+                )
+        finally:
+            await bot.close()
+            await database.close_database()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="リマインダー送信の負荷テスト")
+    parser.add_argument('--schedules', type=int, default=100000, help="作成する予定の件数")
+    parser.add_argument('--users', type=int, default=1, help="予定ごとのリマインダー件数（同じ分の通知は1通にまとまる）")
+    parser.add_argument('--due', type=int, default=2000, help="期間内に通知日時になる予定の件数")
+    parser.add_argument('--overdue', type=int, default=0, help="開始時点で大きく遅れている予定の件数")
+    parser.add_argument('--window', type=float, default=60, help="通知日時を分散させる期間（秒）")
+    parser.add_argument('--lead', type=float, default=2, help="作成完了から期間の開始までの秒数")
+    parser.add_argument('--channels', type=int, default=1000, help="通知先チャンネル数")
+    parser.add_argument('--latency-ms', type=float, default=80, help="1通の送信にかかる平均時間（ミリ秒）")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="送信が 429 で失敗する割合")
+    parser.add_argument('--concurrency', type=int, default=reminder_dispatcher.REMINDER_CONCURRENCY, help="同時送信数")
+    parser.add_argument('--global-rate', type=float, default=reminder_dispatcher.REMINDER_GLOBAL_RATE, help="全体の送信レート（件/秒）")
+    parser.add_argument('--catch-up-after', type=float, default=300, help="追いつき処理で送信する遅延時間（秒）")
+    parser.add_argument('--timeout', type=float, default=300, help="期間の終了後に送信完了を待つ最大秒数")
+    parser.add_argument('--seed', type=int, default=0, help="乱数シード")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
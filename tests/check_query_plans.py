@@ -0,0 +1,197 @@
+"""
+クエリプランのチェックスクリプト
+
+database/database.py の公開関数をすべて一時データベースに対して実行し、
+実際に発行された SQL を EXPLAIN QUERY PLAN で検査します。
+インデックスを使わずにテーブル全体を走査するクエリがあれば終了コード 1 で終了します。
+database.py に関数を追加した場合は _calls() にも呼び出し例を追加してください
+（未登録の関数があるとチェックは失敗します）。
+
+実行例:
+    (venv) $ python tests/check_query_plans.py
+"""
+
+import asyncio
+import inspect
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database import database  # noqa: E402
+
+# チェック対象外の関数（スキーマ操作・メンテナンス用）
+SKIP_FUNCTIONS = {'init_database', 'close_database', 'checkpoint_wal'}
+
+# 全テーブル走査を示すプラン行（"SCAN t USING INDEX ..." は除く）
+FULL_SCAN_PATTERN = re.compile(r'^SCAN (\w+)(?! USING (?:COVERING )?INDEX)')
+
+# プラン検査の対象にする文
+CHECKED_STATEMENT_PATTERN = re.compile(r'^\s*(SELECT|UPDATE|DELETE|WITH)\b', re.IGNORECASE)
+
+NOW = datetime.now().replace(microsecond=0)
+TOMORROW = NOW + timedelta(days=1)
+
+
+def _second_page_cursor() -> str:
+    """2ページ目以降のクエリ形を検査するためのカーソル"""
+    return database._encode_cursor(database.Schedule(10, '1', '1', "", start_datetime=TOMORROW))
+
+
+def _calls() -> Dict[str, Callable[[], Awaitable]]:
+    """関数名 -> 呼び出し例"""
+    return {
+        'create_schedule': lambda: database.create_schedule('1', '1', "会議", TOMORROW),
+        'create_schedule (recurring)': lambda: database.create_schedule(
+            '1', '1', "定例会議", TOMORROW, recurrence="FREQ=WEEKLY;COUNT=10"
+        ),
+        'get_schedule_by_id': lambda: database.get_schedule_by_id(1),
+        'get_schedules_by_user': lambda: database.get_schedules_by_user(
+            '1', '1', start_date=NOW, end_date=TOMORROW + timedelta(days=30)
+        ),
+        'get_schedules_by_guild': lambda: database.get_schedules_by_guild(
+            '1', start_date=NOW, end_date=TOMORROW + timedelta(days=30)
+        ),
+        'get_schedules_page_by_user': lambda: database.get_schedules_page_by_user(
+            '1', '1', start_date=NOW, cursor=_second_page_cursor()
+        ),
+        'get_schedules_page_by_guild': lambda: database.get_schedules_page_by_guild(
+            '1', start_date=NOW, cursor=_second_page_cursor()
+        ),
+        'get_schedules_by_month': lambda: database.get_schedules_by_month(
+            '1', TOMORROW.year, TOMORROW.month, user_id='1'
+        ),
+        'get_month_schedules_page': lambda: database.get_month_schedules_page(
+            '1', TOMORROW.year, TOMORROW.month
+        ),
+        'update_schedule': lambda: database.update_schedule(1, '0', title="会議（変更）"),
+        'update_schedule (recurrence)': lambda: database.update_schedule(2, '1', recurrence="FREQ=DAILY;COUNT=3"),
+        'delete_schedule': lambda: database.delete_schedule(2, '1'),
+        'create_reminder': lambda: database.create_reminder(1, '1', '1', '1', NOW),
+        'create_reminders': lambda: database.create_reminders([
+            {
+                'schedule_id': 1, 'user_id': '1', 'guild_id': '1', 'channel_id': '1',
+                'remind_datetime': NOW - timedelta(minutes=i)
+            }
+            for i in range(3)
+        ]),
+        'get_pending_reminders': lambda: database.get_pending_reminders(),
+        'get_upcoming_reminders': lambda: database.get_upcoming_reminders(after=NOW, limit=50),
+        'claim_due_reminders': lambda: database.claim_due_reminders(limit=10, worker_id='check'),
+        'claim_due_reminders (catch-up)': lambda: database.claim_due_reminders(
+            limit=10, worker_id='check', due_before=NOW - timedelta(minutes=5)
+        ),
+        'release_reminders': lambda: database.release_reminders([5, 6], worker_id='check'),
+        'fail_reminders': lambda: database.fail_reminders([7, 8], worker_id='check', error='check'),
+        'get_dead_letter_reminders': lambda: database.get_dead_letter_reminders('1'),
+        'get_next_lease_expiry': lambda: database.get_next_lease_expiry(),
+        'get_reminder_backlog': lambda: database.get_reminder_backlog(),
+        'mark_reminder_sent': lambda: database.mark_reminder_sent(1),
+        'mark_reminders_sent': lambda: database.mark_reminders_sent([2, 3, 4], worker_id='check'),
+        'set_guild_reminder_offsets': lambda: database.set_guild_reminder_offsets('1', [86400, 600]),
+        'get_guild_reminder_offsets': lambda: database.get_guild_reminder_offsets('1'),
+        'set_media_cache': lambda: database.set_media_cache('dQw4w9WgXcQ', {'title': "曲"}, 0),
+        'get_media_cache': lambda: database.get_media_cache('dQw4w9WgXcQ'),
+        'purge_media_cache': lambda: database.purge_media_cache(),
+        'create_bulk_schedules': lambda: database.create_bulk_schedules([
+            {'user_id': '1', 'guild_id': '1', 'title': f"予定{i}", 'start_datetime': TOMORROW}
+            for i in range(3)
+        ]),
+    }
+
+
+async def seed() -> None:
+    """プランが実データに近くなるよう、ある程度の行数を入れておく"""
+    rows = [
+        {
+            'user_id': str(i % 20),
+            'guild_id': str(i % 3),
+            'title': f"予定{i}",
+            'start_datetime': NOW + timedelta(hours=i),
+        }
+        for i in range(500)
+    ]
+    await database.create_bulk_schedules(rows)
+    for i in range(1, 200):
+        await database.create_reminder(i, '1', '1', '1', NOW + timedelta(minutes=i))
+
+    async with database._get_pool().writer() as db:
+        await db.execute("ANALYZE")
+        await db.commit()
+
+
+async def check() -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        await database.init_database(Path(tmp) / 'plans.db')
+        try:
+            await seed()
+
+            public = {
+                name for name, obj in inspect.getmembers(database, inspect.iscoroutinefunction)
+                if obj.__module__ == database.__name__ and not name.startswith('_')
+            }
+            calls = _calls()
+            missing = sorted(public - SKIP_FUNCTIONS - set(calls))
+
+            # 発行された SQL を関数ごとに記録する
+            captured: Dict[str, List[str]] = {}
+            current = ['']
+
+            def trace(sql: str):
+                captured.setdefault(current[0], []).append(sql)
+
+            pool = database._get_pool()
+            for db in pool.connections():
+                await db.set_trace_callback(trace)
+
+            for name, call in calls.items():
+                current[0] = name
+                await call()
+
+            for db in pool.connections():
+                await db.set_trace_callback(None)
+
+            failures = 0
+            async with pool.reader() as db:
+                for name in calls:
+                    statements = [
+                        sql for sql in captured.get(name, [])
+                        if CHECKED_STATEMENT_PATTERN.match(sql)
+                    ]
+                    if not statements:
+                        print(f"-  {name}: 検査対象のクエリなし")
+                        continue
+
+                    for sql in dict.fromkeys(statements):
+                        async with db.execute(f"EXPLAIN QUERY PLAN {sql}") as cursor:
+                            plan = [row[3] for row in await cursor.fetchall()]
+
+                        scans = [line for line in plan if FULL_SCAN_PATTERN.match(line)]
+                        status = "NG" if scans else "OK"
+                        failures += bool(scans)
+
+                        print(f"{status} {name}: {' '.join(sql.split())[:100]}")
+                        for line in plan:
+                            print(f"      {line}")
+
+            for name in missing:
+                print(f"NG {name}: _calls() に呼び出し例がありません")
+
+            failures += len(missing)
+            print()
+            print("全テーブル走査なし" if not failures else f"{failures}件の問題があります")
+            return 1 if failures else 0
+        finally:
+            await database.close_database()
+
+
+def main():
+    sys.exit(asyncio.run(check()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+ヘルパー関数のテスト
+
+実行例:
+    (venv) $ python -m pytest tests/test_helpers.py
+"""
+
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.helpers import MAX_REMINDER_OFFSETS, parse_reminder_time, parse_reminder_times  # noqa: E402
+
+
+@pytest.mark.parametrize('time_str, expected', [
+    ("30分", timedelta(minutes=30)),
+    ("1時間", timedelta(hours=1)),
+    ("1日", timedelta(days=1)),
+    # 数値と単位の間の空白（parse_reminder_time が受け付けていた形式）
+    ("1 hour", timedelta(hours=1)),
+    ("30 分", timedelta(minutes=30)),
+])
+def test_single_time_is_parsed_like_parse_reminder_time(time_str, expected):
+    assert parse_reminder_time(time_str) == expected
+    assert parse_reminder_times(time_str) == [expected]
+
+
+def test_list_separators():
+    expected = [timedelta(days=1), timedelta(hours=1), timedelta(minutes=10)]
+
+    assert parse_reminder_times("10分,1日,1時間") == expected
+    assert parse_reminder_times("1日、1時間，10分") == expected
+    assert parse_reminder_times(" 1 day , 1 hour, 10 min ") == expected
+    assert parse_reminder_times("1日,,1日,1時間,10分") == expected
+
+
+@pytest.mark.parametrize('time_str', ["", " , ", "1日,あとで", "10"])
+def test_invalid_times_are_rejected(time_str):
+    assert parse_reminder_times(time_str) is None
+
+
+def test_too_many_times_are_rejected():
+    times = ",".join(f"{minutes}分" for minutes in range(1, MAX_REMINDER_OFFSETS + 2))
+
+    assert parse_reminder_times(times) is None
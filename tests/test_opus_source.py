@@ -0,0 +1,99 @@
+"""
+YTDLOpusSource が組み立てる FFmpeg の引数のテスト
+
+FFmpeg は起動せず、discord.py が起動しようとした引数を記録して確認します。
+
+実行例:
+    (venv) $ python -m pytest tests/test_opus_source.py
+"""
+
+import io
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import discord  # noqa: E402
+
+from cogs.music import YTDLOpusSource  # noqa: E402
+
+
+class _FakeProcess:
+    """FFmpeg の代わりに返すプロセス（出力は空）"""
+
+    pid = 0
+    returncode = 0
+
+    def __init__(self):
+        self.stdout = io.BytesIO()
+
+    def kill(self):
+        pass
+
+    def poll(self):
+        return 0
+
+    def wait(self, timeout=None):
+        return 0
+
+
+@pytest.fixture
+def spawned(monkeypatch) -> List[List[str]]:
+    """FFmpeg を起動する代わりに、渡された引数を記録する"""
+    calls: List[List[str]] = []
+
+    def spawn(self, args: Any, **kwargs: Any) -> _FakeProcess:
+        calls.append(list(args))
+        return _FakeProcess()
+
+    monkeypatch.setattr(discord.player.FFmpegAudio, '_spawn_process', spawn)
+    return calls
+
+
+def _data(acodec: str) -> Dict[str, Any]:
+    return {'url': 'https://example.com/audio', 'acodec': acodec, 'title': 'test', 'duration': 60}
+
+
+def _option(args: List[str], name: str) -> str:
+    return args[args.index(name) + 1]
+
+
+def test_volume_is_encoded_with_libopus(spawned):
+    source = YTDLOpusSource.from_data(_data('opus'), volume=0.1)
+    source.cleanup()
+
+    args = spawned[-1]
+    assert _option(args, '-c:a') == 'libopus'
+    assert _option(args, '-filter:a') == 'volume=0.100'
+    assert 'copy' not in args
+
+
+def test_opus_at_full_volume_is_copied(spawned):
+    source = YTDLOpusSource.from_data(_data('opus'), volume=1.0)
+    source.cleanup()
+
+    args = spawned[-1]
+    assert _option(args, '-c:a') == 'copy'
+    assert '-filter:a' not in args
+
+
+def test_other_codecs_are_encoded_with_libopus(spawned):
+    source = YTDLOpusSource.from_data(_data('mp4a.40.2'), volume=1.0)
+    source.cleanup()
+
+    assert _option(spawned[-1], '-c:a') == 'libopus'
+
+
+def test_volume_change_restarts_from_position(spawned):
+    source = YTDLOpusSource.from_data(_data('opus'), volume=1.0)
+    source._frames = 500
+    source.volume = 0.5
+    source.cleanup()
+
+    args = spawned[-1]
+    assert _option(args, '-c:a') == 'libopus'
+    assert _option(args, '-filter:a') == 'volume=0.500'
+    assert _option(args, '-ss') == '10.00'
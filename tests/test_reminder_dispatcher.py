@@ -0,0 +1,113 @@
+"""
+リマインダー送信ディスパッチャーのテスト
+
+実行例:
+    (venv) $ python -m pytest tests/test_reminder_dispatcher.py
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database import database  # noqa: E402
+from utils.helpers import send_reminder_digest  # noqa: E402
+from utils.reminder_dispatcher import ReminderDispatcher, coalesce_reminders  # noqa: E402
+
+REMIND_AT = datetime(2026, 10, 18, 9, 0)
+
+
+def _reminder(reminder_id: int, start: datetime, **overrides: Any) -> Dict[str, Any]:
+    reminder = {
+        'id': reminder_id,
+        'schedule_id': 1,
+        'user_id': str(reminder_id),
+        'channel_id': '100',
+        'remind_datetime': REMIND_AT,
+        'start_datetime': start,
+    }
+    reminder.update(overrides)
+    return reminder
+
+
+def _ids(digests):
+    return [[reminder['id'] for reminder in digest] for digest in digests]
+
+
+def test_same_occurrence_is_coalesced():
+    start = REMIND_AT + timedelta(hours=1)
+    digests = coalesce_reminders([
+        _reminder(1, start),
+        _reminder(2, start, remind_datetime=REMIND_AT + timedelta(seconds=30)),
+        _reminder(3, start, channel_id='200'),
+    ])
+
+    assert _ids(digests) == [[1, 2], [3]]
+
+
+def test_occurrences_of_recurring_schedule_are_not_coalesced():
+    # 今日の回の開始時刻のリマインダーと、明日の回の1日前のリマインダーが同じ分に重なる場合
+    digests = coalesce_reminders([
+        _reminder(1, REMIND_AT),
+        _reminder(2, REMIND_AT + timedelta(days=1)),
+        _reminder(3, REMIND_AT),
+    ])
+
+    assert _ids(digests) == [[1, 3], [2]]
+    assert [digest[0]['start_datetime'] for digest in digests] == [REMIND_AT, REMIND_AT + timedelta(days=1)]
+
+
+def test_digest_size_is_limited():
+    digests = coalesce_reminders([_reminder(i, REMIND_AT) for i in range(5)], max_size=2)
+
+    assert _ids(digests) == [[0, 1], [2, 3], [4]]
+
+
+class _FailingChannel:
+    """送信に失敗するチャンネル"""
+
+    async def send(self, **kwargs: Any):
+        raise RuntimeError("Missing Permissions")
+
+
+class _FakeBot:
+    def __init__(self, channel: Optional[_FailingChannel]):
+        self.channel = channel
+
+    def get_channel(self, channel_id: int) -> Optional[_FailingChannel]:
+        return self.channel
+
+
+async def _dispatch_and_get_dead_letters(db_path: Path, bot: _FakeBot):
+    """期限の来たリマインダーを1件送信し、送信を諦めたリマインダーを取得"""
+    await database.init_database(db_path)
+    try:
+        schedule_id = await database.create_schedule('1', '1', "会議", datetime.now() + timedelta(hours=1))
+        await database.create_reminder(schedule_id, '1', '1', '100', datetime.now() - timedelta(minutes=1))
+
+        reminders = await database.claim_due_reminders(limit=10, worker_id='test')
+        assert len(reminders) == 1
+
+        dispatcher = ReminderDispatcher(lambda digest: send_reminder_digest(bot, digest), worker_id='test')
+        assert await dispatcher.dispatch(reminders) == 1
+        assert dispatcher.dead_lettered == 1
+        return await database.get_dead_letter_reminders('1')
+    finally:
+        await database.close_database()
+
+
+@pytest.mark.parametrize('channel, error', [
+    (_FailingChannel(), "Missing Permissions"),
+    (None, "チャンネルが見つかりません: 100"),
+])
+def test_send_failure_is_recorded_as_last_error(tmp_path, monkeypatch, channel, error):
+    monkeypatch.setattr(database, 'REMINDER_MAX_ATTEMPTS', 1)
+
+    dead_letters = asyncio.run(_dispatch_and_get_dead_letters(tmp_path / 'reminders.db', _FakeBot(channel)))
+
+    assert [reminder['last_error'] for reminder in dead_letters] == [error]
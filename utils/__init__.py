@@ -15,7 +15,12 @@ from .helpers import (
     create_info_embed,
     create_schedule_embed,
     send_reminder,
+    send_reminder_digest,
+    ReminderSendError,
     parse_reminder_time,
+    parse_reminder_times,
+    format_reminder_time,
+    calculate_remind_datetime,
     split_long_message,
     validate_youtube_url,
     get_user_display_name,
@@ -29,6 +34,18 @@ from .calendar_view import (
     create_week_view
 )
 
+from .list_view import (
+    ScheduleListView,
+    create_schedule_page_embed
+)
+
+from .reminder_scheduler import ReminderScheduler
+from .reminder_catchup import CatchUpSummary, apply_stale_policy
+from .reminder_metrics import Histogram, ReminderMetrics
+from .reminder_dispatcher import ReminderDispatcher, TokenBucket, coalesce_reminders
+from .extractor_pool import ExtractorPool, ExtractorBusyError
+from .media_cache import MediaCache, SearchCache, extract_video_id, normalize_query, stream_expires_at
+
 __all__ = [
     # ヘルパー関数
     'parse_datetime_string',
@@ -39,7 +56,12 @@ __all__ = [
     'create_info_embed',
     'create_schedule_embed',
     'send_reminder',
+    'send_reminder_digest',
+    'ReminderSendError',
     'parse_reminder_time',
+    'parse_reminder_times',
+    'format_reminder_time',
+    'calculate_remind_datetime',
     'split_long_message',
     'validate_youtube_url',
     'get_user_display_name',
@@ -49,5 +71,28 @@ __all__ = [
     'CalendarView',
     'CalendarNavigationView',
     'create_month_calendar',
-    'create_week_view'
+    'create_week_view',
+    
+    # 予定一覧のページ表示
+    'ScheduleListView',
+    'create_schedule_page_embed',
+    
+    # リマインダー送信
+    'ReminderScheduler',
+    'CatchUpSummary',
+    'Histogram',
+    'ReminderMetrics',
+    'apply_stale_policy',
+    'ReminderDispatcher',
+    'TokenBucket',
+    'coalesce_reminders',
+    
+    # 動画情報の抽出・キャッシュ
+    'ExtractorPool',
+    'ExtractorBusyError',
+    'MediaCache',
+    'SearchCache',
+    'extract_video_id',
+    'normalize_query',
+    'stream_expires_at'
 ]
@@ -289,29 +289,15 @@ class CalendarNavigationView(discord.ui.View):
     async def _update_calendar(self, interaction: discord.Interaction):
         """カレンダー表示を更新"""
         try:
-            from database.database import get_schedules_by_user, get_schedules_by_guild
+            from database.database import get_schedules_by_month
             
-            # 月の開始・終了日時を計算
-            start_date = datetime(self.year, self.month, 1)
-            if self.month == 12:
-                end_date = datetime(self.year + 1, 1, 1) - timedelta(seconds=1)
-            else:
-                end_date = datetime(self.year, self.month + 1, 1) - timedelta(seconds=1)
-            
-            # 予定の取得
-            if self.show_all:
-                schedules = await get_schedules_by_guild(
-                    self.guild_id,
-                    start_date=start_date,
-                    end_date=end_date
-                )
-            else:
-                schedules = await get_schedules_by_user(
-                    self.user_id,
-                    self.guild_id,
-                    start_date=start_date,
-                    end_date=end_date
-                )
+            # 予定の取得（前月/次月を行き来しても月単位キャッシュから返す）
+            schedules = await get_schedules_by_month(
+                self.guild_id,
+                self.year,
+                self.month,
+                user_id=None if self.show_all else self.user_id
+            )
             
             # カレンダービューの作成
             calendar_view = CalendarView(self.year, self.month, schedules)
@@ -0,0 +1,193 @@
+"""
+yt-dlp の抽出処理用のワーカープール
+イベントループの既定のエグゼキューターとは別の、数を絞ったスレッド（またはプロセス）で抽出を実行し、
+/play が集中しても他の処理が使うスレッドを埋めないようにする
+待ちの件数が上限に達した場合は受け付けず、1件ごとに待ち時間の上限を設ける
+
+作成者: [Your Name]
+作成日: 2026-10-17
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# ワーカーの種類（thread: スレッド / process: プロセス、抽出のCPU負荷でBOTが重くなる場合に使用）
+EXTRACTOR_POOL_MODE = os.getenv('EXTRACTOR_POOL_MODE', 'thread')
+
+# 同時に実行する抽出の数
+EXTRACTOR_WORKERS = int(os.getenv('EXTRACTOR_WORKERS', 2))
+
+# 実行待ちにできる抽出の数（超えた分は ExtractorBusyError で断る）
+EXTRACTOR_QUEUE_SIZE = int(os.getenv('EXTRACTOR_QUEUE_SIZE', 16))
+
+# 1件の抽出を待つ上限（秒、実行待ちの時間を含む）
+EXTRACTOR_TIMEOUT = float(os.getenv('EXTRACTOR_TIMEOUT', 30))
+
+
+class ExtractorBusyError(Exception):
+    """抽出の実行待ちが上限に達している"""
+
+
+class ExtractorPool:
+    """
+    上限付きの抽出用ワーカープール
+
+    呼び出し元がタイムアウト・キャンセルした場合、実行待ちの抽出は取り消す
+    実行中の抽出は止められないため、終わるまでその枠を使用中として数える
+    """
+
+    def __init__(
+        self,
+        workers: int = EXTRACTOR_WORKERS,
+        queue_size: int = EXTRACTOR_QUEUE_SIZE,
+        timeout: float = EXTRACTOR_TIMEOUT,
+        mode: str = EXTRACTOR_POOL_MODE
+    ):
+        """
+        Args:
+            workers: 同時に実行する抽出の数
+            queue_size: 実行待ちにできる抽出の数
+            timeout: 1件の抽出を待つ上限（秒）
+            mode: 'thread' または 'process'
+        """
+        if mode not in ('thread', 'process'):
+            raise ValueError(f"不明なワーカーの種類です: {mode}")
+
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self.timeout = timeout
+        self.mode = mode
+        self._executor: Optional[concurrent.futures.Executor] = None
+        # 完了の通知はワーカー側のスレッドから届くため、件数の更新はロックして行う
+        self._lock = threading.Lock()
+        self._outstanding = 0
+
+        # 統計情報
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    @property
+    def capacity(self) -> int:
+        """実行中と実行待ちを合わせて受け付けられる件数"""
+        return self.workers + self.queue_size
+
+    @property
+    def outstanding(self) -> int:
+        """実行中・実行待ちの件数"""
+        return self._outstanding
+
+    async def run(self, fn: Callable[..., T], *args: Any, timeout: Optional[float] = None) -> T:
+        """
+        ワーカーで関数を実行して結果を待つ
+
+        Args:
+            fn: 実行する関数（プロセスの場合はモジュールの関数など pickle できるもの）
+            *args: 関数の引数
+            timeout: 待つ上限（秒、省略時はプールの設定値）
+
+        Returns:
+            関数の戻り値
+
+        Raises:
+            ExtractorBusyError: 実行待ちが上限に達している場合
+            asyncio.TimeoutError: 上限の時間内に終わらなかった場合
+        """
+        with self._lock:
+            if self._outstanding >= self.capacity:
+                self.rejected += 1
+                raise ExtractorBusyError(f"抽出の実行待ちが上限（{self.capacity}件）に達しています")
+            self._outstanding += 1
+            self.submitted += 1
+
+        try:
+            future = self._submit(fn, *args)
+        except Exception:
+            with self._lock:
+                self._outstanding -= 1
+            raise
+        future.add_done_callback(self._on_done)
+
+        try:
+            # 待つのをやめた場合、実行待ちの future は取り消される
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning(f"抽出がタイムアウトしました: {getattr(fn, '__name__', fn)}")
+            raise
+
+    def shutdown(self):
+        """
+        ワーカーを終了（実行待ちの抽出は取り消す。次の run で作り直す）
+        """
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        統計情報を取得
+
+        Returns:
+            実行中・実行待ちの件数、断った件数、タイムアウトした件数などの辞書
+        """
+        outstanding = self._outstanding
+        return {
+            'mode': self.mode,
+            'workers': self.workers,
+            'queue_size': self.queue_size,
+            'running': min(outstanding, self.workers),
+            'queued': max(0, outstanding - self.workers),
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'cancelled': self.cancelled,
+            'rejected': self.rejected,
+            'timeouts': self.timeouts,
+        }
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> concurrent.futures.Future:
+        """ワーカーに関数を渡す（プロセスが異常終了して使えなくなっていた場合は作り直す）"""
+        try:
+            return self._get_executor().submit(fn, *args)
+        except concurrent.futures.BrokenExecutor:
+            logger.warning("抽出用のワーカーを作り直します")
+            self.shutdown()
+            return self._get_executor().submit(fn, *args)
+
+    def _get_executor(self) -> concurrent.futures.Executor:
+        """エグゼキューターを取得（初回のみ作成）"""
+        if self._executor is None:
+            if self.mode == 'process':
+                self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix='extractor'
+                )
+        return self._executor
+
+    def _on_done(self, future: concurrent.futures.Future):
+        """抽出の完了・取り消し時に枠を空ける"""
+        with self._lock:
+            self._outstanding -= 1
+            if future.cancelled():
+                self.cancelled += 1
+            elif future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+
+# BOT全体で共有するプール
+extractor_pool = ExtractorPool()
@@ -9,11 +9,12 @@
 import discord
 import logging
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 import re
 import asyncio
 
 from database.database import mark_reminder_sent
+from database.recurrence import Recurrence
 
 logger = logging.getLogger(__name__)
 
@@ -248,6 +249,14 @@ def create_schedule_embed(schedule: 'Schedule', show_user: bool = True) -> disco
             inline=True
         )
     
+    # 繰り返し（あれば）
+    if schedule.recurrence:
+        embed.add_field(
+            name="繰り返し",
+            value=Recurrence.parse(schedule.recurrence).describe(),
+            inline=True
+        )
+    
     # 説明（あれば）
     if schedule.description:
         embed.add_field(
@@ -269,71 +278,97 @@ def create_schedule_embed(schedule: 'Schedule', show_user: bool = True) -> disco
     
     return embed
 
-async def send_reminder(bot, reminder_data: Dict[str, Any]) -> bool:
+class ReminderSendError(Exception):
+    """リマインダーを送信できない（送信先のチャンネルが見つからないなど）"""
+
+async def send_reminder(bot, reminder_data: Dict[str, Any], mark_sent: bool = True) -> bool:
     """
     リマインダーを送信
     
     Args:
         bot: BOTインスタンス
         reminder_data: リマインダーデータ
+        mark_sent: 送信後に送信済みにマークするか（呼び出し側でまとめてマークする場合はFalse）
     
     Returns:
         送信成功の可否
     """
     try:
-        # チャンネルの取得
-        channel = bot.get_channel(int(reminder_data['channel_id']))
-        if not channel:
-            logger.error(f"チャンネルが見つかりません: {reminder_data['channel_id']}")
-            return False
-        
-        # リマインダーEmbed作成
-        embed = discord.Embed(
-            title="🔔 予定のリマインダー",
-            color=0xffa500
-        )
-        
-        embed.add_field(
-            name="予定",
-            value=reminder_data['title'],
-            inline=False
-        )
-        
-        embed.add_field(
-            name="開始時刻",
-            value=format_datetime_for_discord(reminder_data['start_datetime']),
-            inline=True
-        )
-        
-        embed.add_field(
-            name="残り時間",
-            value=format_relative_time_for_discord(reminder_data['start_datetime']),
-            inline=True
-        )
-        
-        # カスタムメッセージがあれば追加
-        if reminder_data.get('message'):
-            embed.add_field(
-                name="メッセージ",
-                value=reminder_data['message'],
-                inline=False
-            )
-        
-        # ユーザーへのメンション
-        content = f"<@{reminder_data['user_id']}>"
-        
-        # メッセージ送信
-        await channel.send(content=content, embed=embed)
-        
-        # 送信済みにマーク
-        await mark_reminder_sent(reminder_data['id'])
-        
-        logger.info(f"リマインダーを送信しました: {reminder_data['title']}")
-        return True
-        
+        await send_reminder_digest(bot, [reminder_data])
     except Exception as e:
         logger.error(f"リマインダー送信エラー: {e}")
         return False
+    
+    # 送信済みにマーク
+    if mark_sent:
+        await mark_reminder_sent(reminder_data['id'])
+    return True
+
+async def send_reminder_digest(bot, reminders: List[Dict[str, Any]]) -> bool:
+    """
+    同じチャンネル・同じ予定のリマインダーをまとめて1通で送信
+    （送信済みのマークは呼び出し側で行う）
+    
+    Args:
+        bot: BOTインスタンス
+        reminders: 送信するリマインダーのリスト（channel_id と予定・予定の開始日時が同じもの）
+    
+    Returns:
+        送信できた場合はTrue
+    
+    Raises:
+        ReminderSendError: 送信先のチャンネルが見つからない場合
+        discord.HTTPException: メッセージの送信に失敗した場合（失敗理由は再送・送信失敗の記録に使われる）
+    """
+    reminder_data = reminders[0]
+    
+    # チャンネルの取得
+    channel = bot.get_channel(int(reminder_data['channel_id']))
+    if not channel:
+        raise ReminderSendError(f"チャンネルが見つかりません: {reminder_data['channel_id']}")
+    
+    # リマインダーEmbed作成
+    embed = discord.Embed(
+        title="🔔 予定のリマインダー",
+        color=0xffa500
+    )
+    
+    embed.add_field(
+        name="予定",
+        value=reminder_data['title'],
+        inline=False
+    )
+    
+    embed.add_field(
+        name="開始時刻",
+        value=format_datetime_for_discord(reminder_data['start_datetime']),
+        inline=True
+    )
+    
+    embed.add_field(
+        name="残り時間",
+        value=format_relative_time_for_discord(reminder_data['start_datetime']),
+        inline=True
+    )
+    
+    # カスタムメッセージがあれば追加（同じメッセージは1回だけ表示）
+    messages = list(dict.fromkeys(r['message'] for r in reminders if r.get('message')))
+    if messages:
+        embed.add_field(
+            name="メッセージ",
+            value="\n".join(messages)[:1024],
+            inline=False
+        )
+    
+    # ユーザーへのメンション（同じユーザーは1回だけ）
+    user_ids = dict.fromkeys(str(r['user_id']) for r in reminders)
+    content = " ".join(f"<@{user_id}>" for user_id in user_ids)
+    
+    # メッセージ送信
+    await channel.send(content=content, embed=embed)
+    
+    logger.info(f"リマインダーを送信しました: {reminder_data['title']} ({len(reminders)}件)")
+    return True
 
 def parse_reminder_time(time_str: str) -> Optional[timedelta]:
     """
@@ -367,6 +402,78 @@ def parse_reminder_time(time_str: str) -> Optional[timedelta]:
         logger.error(f"リマインダー時間解析エラー: {e}")
         return None
 
+# 1回のコマンドで設定できるリマインダーの最大数
+MAX_REMINDER_OFFSETS = 10
+
+def parse_reminder_times(time_str: str) -> Optional[List[timedelta]]:
+    """
+    カンマ区切りのリマインダー時間文字列を解析
+    
+    Args:
+        time_str: 時間文字列 (例: "1日,1時間,10分"、区切りは「,」「、」「，」。
+            "1 hour" や "30 分" のように数値と単位の間に空白を含めてもよい)
+    
+    Returns:
+        timedeltaのリスト（重複を除いて長い順。1つでも解析に失敗した場合、
+        または MAX_REMINDER_OFFSETS 個を超える場合はNone）
+    """
+    # 空白は区切りにしない（1つの時間の中の空白は parse_reminder_time がそのまま解析する）
+    parts = [part.strip() for part in re.split(r'[,、，]', time_str) if part.strip()]
+    if not parts:
+        return None
+    
+    deltas = set()
+    for part in parts:
+        delta = parse_reminder_time(part)
+        if not delta:
+            return None
+        deltas.add(delta)
+    
+    if len(deltas) > MAX_REMINDER_OFFSETS:
+        return None
+    return sorted(deltas, reverse=True)
+
+def format_reminder_time(delta: timedelta) -> str:
+    """
+    リマインダー時間を表示用の文字列に変換（parse_reminder_time の逆）
+    
+    Args:
+        delta: 予定の開始の何前に通知するか
+    
+    Returns:
+        表示用の文字列 (例: "1日", "2時間", "30分")
+    """
+    minutes = int(delta.total_seconds()) // 60
+    if minutes and minutes % (24 * 60) == 0:
+        return f"{minutes // (24 * 60)}日"
+    if minutes and minutes % 60 == 0:
+        return f"{minutes // 60}時間"
+    return f"{minutes}分"
+
+def calculate_remind_datetime(schedule, delta: timedelta) -> Tuple[datetime, Optional[int]]:
+    """
+    予定の開始の delta 前の通知日時を計算
+    
+    Args:
+        schedule: 予定
+        delta: 予定の開始の何前に通知するか
+    
+    Returns:
+        (通知日時, 繰り返しの通知オフセット（秒、繰り返し予定でない場合はNone）)
+        通知日時が過去になる場合もそのまま返す
+    """
+    remind_datetime = schedule.start_datetime - delta
+    if not schedule.recurrence:
+        return remind_datetime, None
+    
+    # 繰り返し予定は、通知時刻がまだ来ていない最初の回に設定する（以降の回は送信後に順に作成）
+    occurrence = Recurrence.parse(schedule.recurrence).next_after(
+        schedule.start_datetime, datetime.now() + delta - timedelta(seconds=1)
+    )
+    if occurrence is not None:
+        remind_datetime = occurrence - delta
+    return remind_datetime, int(delta.total_seconds())
+
 def split_long_message(message: str, max_length: int = 2000) -> List[str]:
     """
     長いメッセージを分割
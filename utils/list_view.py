@@ -0,0 +1,149 @@
+"""
+予定一覧のページ表示機能
+キーセットページングで必要なページだけを取得し、前へ/次へボタンで切り替える
+
+作成者: [Your Name]
+作成日: 2026-10-17
+"""
+
+import discord
+from datetime import datetime
+from typing import List, Optional
+import logging
+
+from database.models import SchedulePage
+
+logger = logging.getLogger(__name__)
+
+# 1ページに表示する予定の件数
+SCHEDULES_PER_PAGE = 10
+
+def create_schedule_page_embed(page: SchedulePage, page_number: int) -> discord.Embed:
+    """
+    予定一覧1ページ分のEmbedを作成
+
+    Args:
+        page: 予定の1ページ
+        page_number: ページ番号（1始まり）
+
+    Returns:
+        予定一覧Embed
+    """
+    embed = discord.Embed(
+        title=f"📅 予定一覧 (ページ {page_number})",
+        color=0x00ff99
+    )
+
+    for schedule in page.items:
+        time_str = f"<t:{int(schedule.start_datetime.timestamp())}:F>"
+        embed.add_field(
+            name=schedule.title,
+            value=f"{time_str}\n{schedule.description or '詳細なし'}",
+            inline=False
+        )
+
+    footer = f"ページ {page_number}"
+    if page.has_next:
+        footer += " | 次のページがあります"
+    embed.set_footer(text=footer)
+
+    return embed
+
+class ScheduleListView(discord.ui.View):
+    """
+    予定一覧のページ切り替え用View
+    """
+
+    def __init__(
+        self,
+        owner_id: str,
+        target_user_id: str,
+        guild_id: str,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        show_all: bool,
+        first_page: SchedulePage
+    ):
+        super().__init__(timeout=300)  # 5分でタイムアウト
+        self.owner_id = owner_id              # ボタンを操作できるユーザー
+        self.target_user_id = target_user_id  # 表示対象のユーザー
+        self.guild_id = guild_id
+        self.start_date = start_date
+        self.end_date = end_date
+        self.show_all = show_all
+
+        # 表示中の各ページを取得したカーソル（先頭ページはNone）
+        self._cursors: List[Optional[str]] = [None]
+        self.page = first_page
+        self._update_buttons()
+
+    @property
+    def page_number(self) -> int:
+        """表示中のページ番号（1始まり）"""
+        return len(self._cursors)
+
+    def create_embed(self) -> discord.Embed:
+        """表示中のページのEmbedを作成"""
+        return create_schedule_page_embed(self.page, self.page_number)
+
+    def _update_buttons(self):
+        """ボタンの有効/無効を更新"""
+        self.prev_button.disabled = len(self._cursors) <= 1
+        self.next_button.disabled = not self.page.has_next
+
+    async def _fetch(self, cursor: Optional[str]) -> SchedulePage:
+        """カーソル位置から1ページ分を取得"""
+        from database.database import get_schedules_page_by_user, get_schedules_page_by_guild
+
+        if self.show_all:
+            return await get_schedules_page_by_guild(
+                self.guild_id,
+                start_date=self.start_date,
+                end_date=self.end_date,
+                cursor=cursor,
+                page_size=SCHEDULES_PER_PAGE
+            )
+        return await get_schedules_page_by_user(
+            self.target_user_id,
+            self.guild_id,
+            start_date=self.start_date,
+            end_date=self.end_date,
+            cursor=cursor,
+            page_size=SCHEDULES_PER_PAGE
+        )
+
+    @discord.ui.button(label='◀ 前へ', style=discord.ButtonStyle.secondary)
+    async def prev_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """前のページに移動"""
+        if interaction.user.id != int(self.owner_id):
+            await interaction.response.send_message("このボタンは使用できません。", ephemeral=True)
+            return
+
+        if len(self._cursors) > 1:
+            self._cursors.pop()
+        await self._show_page(interaction)
+
+    @discord.ui.button(label='次へ ▶', style=discord.ButtonStyle.secondary)
+    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """次のページに移動"""
+        if interaction.user.id != int(self.owner_id):
+            await interaction.response.send_message("このボタンは使用できません。", ephemeral=True)
+            return
+
+        if self.page.has_next:
+            self._cursors.append(self.page.next_cursor)
+        await self._show_page(interaction)
+
+    async def _show_page(self, interaction: discord.Interaction):
+        """現在のカーソル位置のページを表示"""
+        try:
+            self.page = await self._fetch(self._cursors[-1])
+            self._update_buttons()
+            await interaction.response.edit_message(embed=self.create_embed(), view=self)
+
+        except Exception as e:
+            logger.error(f"予定一覧ページ更新エラー: {e}")
+            await interaction.response.send_message(
+                "予定一覧の更新中にエラーが発生しました。",
+                ephemeral=True
+            )
@@ -0,0 +1,354 @@
+"""
+yt-dlp で取得した動画情報・検索結果のキャッシュ
+動画IDごとにメモリ（LRU）と SQLite の2段で保持し、同じ曲を再生する際の抽出処理を省く
+ストリーミング用のURLは expire パラメータから有効期限を決め、期限が近いものは取得し直す
+検索結果は正規化したキーワードごとにメモリに保持し、同時に届いた同じ検索は1回の検索にまとめる
+
+作成者: [Your Name]
+作成日: 2026-10-17
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from database.database import get_media_cache, set_media_cache, purge_media_cache
+
+logger = logging.getLogger(__name__)
+
+# メモリに保持する動画の最大数
+MEDIA_CACHE_SIZE = int(os.getenv('MEDIA_CACHE_SIZE', 512))
+
+# 検索結果を保持するキーワードの最大数と有効期間（秒）
+SEARCH_CACHE_SIZE = int(os.getenv('SEARCH_CACHE_SIZE', 256))
+SEARCH_CACHE_TTL = float(os.getenv('SEARCH_CACHE_TTL', 600))
+
+# URLに expire パラメータがない場合の有効期間（秒）
+DEFAULT_STREAM_TTL = 1800
+
+# 有効期限の何秒前から取得し直すか（再生の開始直後にURLが失効しないよう、曲の長さも加える）
+STREAM_EXPIRY_MARGIN = 300
+
+# データベースの期限切れの行を削除する間隔（保存回数）
+PURGE_INTERVAL = 100
+
+# キャッシュに保存するキー（再生・表示に使うものだけ。formats などは大きいため保存しない）
+CACHED_KEYS = (
+    'id', 'title', 'url', 'duration', 'thumbnail', 'uploader', 'webpage_url',
+    'extractor', 'ext', 'acodec', 'abr', 'is_live', 'http_headers',
+)
+
+# URLから動画IDを取り出すパターン
+VIDEO_ID_PATTERN = re.compile(
+    r'(?:youtube\.com/(?:watch\?(?:[^#]*&)?v=|embed/|shorts/|live/)|youtu\.be/)([\w-]{11})(?![\w-])'
+)
+
+# ストリーミング用のURLの有効期限（クエリ文字列 ?expire=... または パス中の /expire/...）
+EXPIRE_PATTERN = re.compile(r'[?&/]expire[=/](\d+)')
+
+
+def extract_video_id(query: str) -> Optional[str]:
+    """
+    YouTube の URL から動画IDを取り出す
+
+    Args:
+        query: URL または検索キーワード
+
+    Returns:
+        動画ID（動画のURLでない場合はNone）
+    """
+    match = VIDEO_ID_PATTERN.search(query)
+    return match.group(1) if match else None
+
+
+def stream_expires_at(data: Dict[str, Any], now: Optional[float] = None) -> float:
+    """
+    動画情報のストリーミング用URLを使ってよい期限
+
+    Args:
+        data: yt-dlp の動画情報
+        now: 現在時刻（エポック秒、省略時は time.time()）
+
+    Returns:
+        期限のエポック秒（曲の最後まで再生できるよう、URLの失効より 余裕 + 曲の長さ だけ前）
+    """
+    now = time.time() if now is None else now
+    if data.get('is_live'):
+        # ライブ配信は長さが決まらないため、毎回取得し直す
+        return now
+
+    match = EXPIRE_PATTERN.search(data.get('url') or '')
+    if not match:
+        return now + DEFAULT_STREAM_TTL
+    return int(match.group(1)) - STREAM_EXPIRY_MARGIN - (data.get('duration') or 0)
+
+
+class MediaCache:
+    """
+    動画ID -> 動画情報 のキャッシュ（メモリのLRU + SQLite）
+
+    メモリにない場合はデータベースを参照し、見つかればメモリにも載せる
+    ストリーミング用のURLの期限が近いものはヒットとせず、呼び出し側が取得し直して put する
+    """
+
+    def __init__(self, max_entries: int = MEDIA_CACHE_SIZE):
+        """
+        Args:
+            max_entries: メモリに保持する動画の最大数（超えた場合は最も古く使われたものから削除）
+        """
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, Tuple[float, Dict[str, Any]]]' = OrderedDict()
+        self._writes = 0
+
+        # 統計情報
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.bypassed = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        キャッシュから動画情報を取得
+
+        Args:
+            query: YouTube の URL または検索キーワード
+
+        Returns:
+            動画情報（キャッシュにない、期限が近い、動画のURLでない場合はNone）
+        """
+        video_id = extract_video_id(query)
+        if video_id is None:
+            self.bypassed += 1
+            return None
+
+        now = time.time()
+        entry = self._entries.get(video_id)
+        if entry is not None:
+            if entry[0] > now:
+                self._entries.move_to_end(video_id)
+                self.memory_hits += 1
+                return dict(entry[1])
+            del self._entries[video_id]
+
+        stored = await get_media_cache(video_id)
+        if stored is not None and stored[1] > now:
+            data, expires_at = stored
+            self._remember(video_id, expires_at, data)
+            self.disk_hits += 1
+            return dict(data)
+
+        if entry is not None or stored is not None:
+            self.stale += 1
+        else:
+            self.misses += 1
+        return None
+
+    async def put(self, data: Dict[str, Any]):
+        """
+        取得した動画情報を保存（期限がすでに近いものは保存しない）
+
+        Args:
+            data: yt-dlp の動画情報
+        """
+        video_id = data.get('id')
+        if not video_id:
+            return
+
+        expires_at = stream_expires_at(data)
+        if expires_at <= time.time():
+            return
+
+        data = {key: data[key] for key in CACHED_KEYS if data.get(key) is not None}
+        self._remember(video_id, expires_at, data)
+        await set_media_cache(video_id, data, int(expires_at))
+
+        self._writes += 1
+        if self._writes % PURGE_INTERVAL == 0:
+            purged = await purge_media_cache()
+            if purged:
+                logger.info(f"期限切れの動画情報を{purged}件削除しました")
+
+    async def get_or_extract(
+        self,
+        query: str,
+        extract: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        キャッシュから動画情報を取得し、ない場合は extract で取得して保存
+
+        Args:
+            query: YouTube の URL または検索キーワード
+            extract: yt-dlp で動画情報を取得する関数
+
+        Returns:
+            動画情報
+        """
+        data = await self.get(query)
+        if data is not None:
+            return data
+
+        data = await extract()
+        await self.put(data)
+        return data
+
+    def clear(self):
+        """
+        メモリ上のキャッシュを削除（データベースの行は残す）
+        """
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        統計情報を取得
+
+        Returns:
+            メモリ・データベースそれぞれのヒット数、ミス数、期限切れ数、ヒット率などの辞書
+        """
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses + self.stale
+        return {
+            'entries': len(self._entries),
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'stale': self.stale,
+            'bypassed': self.bypassed,
+            'hit_rate': round(hits / lookups, 3) if lookups else 0.0,
+            'evictions': self.evictions,
+        }
+
+    def _remember(self, video_id: str, expires_at: float, data: Dict[str, Any]):
+        """メモリに保存し、上限を超えた分を古いものから削除"""
+        self._entries[video_id] = (expires_at, data)
+        self._entries.move_to_end(video_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+def normalize_query(term: str) -> str:
+    """
+    検索キーワードを正規化（全角・半角、大文字・小文字、連続する空白の違いをなくす）
+
+    Args:
+        term: 検索キーワード
+
+    Returns:
+        正規化したキーワード
+    """
+    return ' '.join(unicodedata.normalize('NFKC', term).casefold().split())
+
+
+class SearchCache:
+    """
+    検索キーワード -> 検索結果 のキャッシュ（LRU + TTL）
+
+    同じキーワードの検索が実行中の場合は新たに検索せず、その結果を待つ
+    （最初の呼び出し元がキャンセルされても検索は続け、結果を保存する）
+    """
+
+    def __init__(self, max_entries: int = SEARCH_CACHE_SIZE, ttl: float = SEARCH_CACHE_TTL):
+        """
+        Args:
+            max_entries: 保持するキーワードの最大数（超えた場合は最も古く使われたものから削除）
+            ttl: 有効期間（秒）
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: 'OrderedDict[str, Tuple[float, List[Dict[str, Any]]]]' = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+        # 統計情報
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_or_search(
+        self,
+        term: str,
+        search: Callable[[str], Awaitable[List[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        キャッシュから検索結果を取得し、ない場合は search で検索して保存
+
+        Args:
+            term: 検索キーワード
+            search: 正規化したキーワードで検索する関数（空の結果は保存しない）
+
+        Returns:
+            検索結果のリスト
+        """
+        key = normalize_query(term)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return list(entry[1])
+            del self._entries[key]
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.create_task(search(key))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+
+        return list(await asyncio.shield(task))
+
+    def clear(self):
+        """
+        保存した検索結果を削除（実行中の検索は続ける）
+        """
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        統計情報を取得
+
+        Returns:
+            ヒット数・ミス数・まとめた検索の数・ヒット率などの辞書
+        """
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            'entries': len(self._entries),
+            'in_flight': len(self._in_flight),
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'hit_rate': round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+            'evictions': self.evictions,
+        }
+
+    def _finish(self, key: str, task: asyncio.Task):
+        """検索の完了時に実行中の一覧から外し、結果を保存"""
+        self._in_flight.pop(key, None)
+        if task.cancelled() or task.exception() is not None or not task.result():
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl, task.result())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+# BOT全体で共有するキャッシュ
+media_cache = MediaCache()
+search_cache = SearchCache()
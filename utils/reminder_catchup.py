@@ -0,0 +1,165 @@
+"""
+遅延リマインダーの追いつき処理
+BOTの停止中に通知日時を過ぎたリマインダーを、猶予期間を過ぎたものはまとめる・省略してから送信し、
+どれだけ遅れたかを集計する
+
+作成者: [Your Name]
+作成日: 2026-10-17
+"""
+
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# 通知日時からこの秒数以上遅れたリマインダーは追いつき処理で送信する（環境変数で変更可能）
+REMINDER_CATCHUP_AFTER = float(os.getenv('REMINDER_CATCHUP_AFTER', 300))
+
+# 追いつき処理の送信レート（件/秒、通常のリマインダーの送信枠を使い切らないように）
+REMINDER_CATCHUP_RATE = float(os.getenv('REMINDER_CATCHUP_RATE', 5))
+
+# 通知日時からこの秒数以上遅れたリマインダーは REMINDER_STALE_POLICY に従って処理する
+REMINDER_GRACE_SECONDS = float(os.getenv('REMINDER_GRACE_SECONDS', 3600))
+
+# 猶予期間を過ぎたリマインダーの扱い
+# collapse: 予定が始まっていなければ同じ予定・ユーザー・チャンネルの最新の1件だけを送信する
+# skip: 送信しない / send: すべて送信する
+REMINDER_STALE_POLICY = os.getenv('REMINDER_STALE_POLICY', 'collapse')
+
+STALE_POLICIES = ('collapse', 'skip', 'send')
+
+# 遅延時間の集計区分（上限秒数, 表示名）
+LATENESS_BUCKETS: Tuple[Tuple[Optional[float], str], ...] = (
+    (300, '5分未満'),
+    (3600, '1時間未満'),
+    (86400, '1日未満'),
+    (None, '1日以上'),
+)
+
+
+def _format_seconds(seconds: float) -> str:
+    """秒数を「X時間Y分」形式に変換"""
+    minutes = int(seconds // 60)
+    if minutes < 60:
+        return f"{minutes}分"
+    return f"{minutes // 60}時間{minutes % 60}分"
+
+
+class CatchUpSummary:
+    """
+    追いつき処理の集計（送信・省略した件数と遅延時間の分布）
+    """
+
+    def __init__(self):
+        self.sent = 0
+        self.failed = 0
+        self.skipped = 0
+        self.collapsed = 0
+        self.max_lateness = 0.0
+        self.total_lateness = 0.0
+        self.histogram: Dict[str, int] = {label: 0 for _, label in LATENESS_BUCKETS}
+        self.started_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+
+    @property
+    def total(self) -> int:
+        """処理した件数"""
+        return self.sent + self.failed + self.skipped + self.collapsed
+
+    def record_lateness(self, reminders: List[Dict[str, Any]], now: datetime):
+        """
+        リマインダーの遅延時間を集計
+
+        Args:
+            reminders: 処理したリマインダーのリスト
+            now: 処理した日時
+        """
+        for reminder in reminders:
+            lateness = max(0.0, (now - reminder['remind_datetime']).total_seconds())
+            self.total_lateness += lateness
+            self.max_lateness = max(self.max_lateness, lateness)
+            for limit, label in LATENESS_BUCKETS:
+                if limit is None or lateness < limit:
+                    self.histogram[label] += 1
+                    break
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        辞書形式に変換
+
+        Returns:
+            件数・遅延時間（秒）・遅延時間の分布などの辞書
+        """
+        return {
+            'sent': self.sent,
+            'failed': self.failed,
+            'skipped': self.skipped,
+            'collapsed': self.collapsed,
+            'max_lateness': round(self.max_lateness),
+            'avg_lateness': round(self.total_lateness / self.total) if self.total else 0,
+            'histogram': dict(self.histogram),
+            'started_at': self.started_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+    def __str__(self) -> str:
+        """
+        文字列表現
+        """
+        average = self.total_lateness / self.total if self.total else 0.0
+        histogram = ", ".join(f"{label}: {count}" for label, count in self.histogram.items() if count)
+        return (
+            f"送信 {self.sent}件, 失敗 {self.failed}件, 省略 {self.skipped}件, まとめ {self.collapsed}件 "
+            f"(最大遅延 {_format_seconds(self.max_lateness)}, 平均 {_format_seconds(average)}; {histogram})"
+        )
+
+
+def apply_stale_policy(
+    reminders: List[Dict[str, Any]],
+    now: datetime,
+    grace_seconds: float = REMINDER_GRACE_SECONDS,
+    policy: str = REMINDER_STALE_POLICY
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    猶予期間を過ぎたリマインダーを送信するもの・省略するもの・まとめるものに分ける
+
+    Args:
+        reminders: 遅延しているリマインダーのリスト
+        now: 現在日時
+        grace_seconds: 猶予期間（秒）
+        policy: 猶予期間を過ぎたリマインダーの扱い（collapse / skip / send）
+
+    Returns:
+        (送信するもの, 省略するもの, 他のリマインダーにまとめたもの)
+    """
+    if policy not in STALE_POLICIES:
+        raise ValueError(f"不明なポリシー: {policy}")
+
+    to_send: List[Dict[str, Any]] = []
+    stale: List[Dict[str, Any]] = []
+    for reminder in reminders:
+        if policy == 'send' or (now - reminder['remind_datetime']).total_seconds() <= grace_seconds:
+            to_send.append(reminder)
+        else:
+            stale.append(reminder)
+
+    if policy == 'skip':
+        return to_send, stale, []
+
+    # 同じ予定・ユーザー・チャンネルでは最も新しいリマインダーだけを残す
+    def key(reminder: Dict[str, Any]) -> Tuple[int, str, str]:
+        return reminder['schedule_id'], str(reminder['user_id']), str(reminder['channel_id'])
+
+    kept: Set[Tuple[int, str, str]] = {key(reminder) for reminder in to_send}
+    skipped: List[Dict[str, Any]] = []
+    collapsed: List[Dict[str, Any]] = []
+    for reminder in sorted(stale, key=lambda r: r['remind_datetime'], reverse=True):
+        if reminder['start_datetime'] <= now:
+            # 予定が始まった後に届いても意味がない
+            skipped.append(reminder)
+        elif key(reminder) in kept:
+            collapsed.append(reminder)
+        else:
+            kept.add(key(reminder))
+            to_send.append(reminder)
+
+    return to_send, skipped, collapsed
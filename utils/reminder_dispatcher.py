@@ -0,0 +1,307 @@
+"""
+リマインダー送信ディスパッチャー
+同時送信数を制限しつつ、DiscordのレートリミットをBOT側のトークンバケットで守って並行送信する
+同じチャンネル・同じ予定（繰り返し予定は同じ回）・同じ分のリマインダーは1通にまとめて送信する
+
+作成者: [Your Name]
+作成日: 2026-10-17
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from database.database import REMINDER_WORKER_ID, fail_reminders, mark_reminders_sent
+from database.models import datetime_to_epoch
+from .reminder_metrics import ReminderMetrics
+
+logger = logging.getLogger(__name__)
+
+# 同時に送信するリマインダーの最大数（環境変数で変更可能）
+REMINDER_CONCURRENCY = int(os.getenv('REMINDER_CONCURRENCY', 8))
+
+# BOT全体の送信レート（件/秒、Discordのグローバル制限 50件/秒 より少し低く設定）
+REMINDER_GLOBAL_RATE = float(os.getenv('REMINDER_GLOBAL_RATE', 40))
+
+# チャンネルごとの送信レート（Discordのメッセージ送信制限 5件/5秒 に合わせる）
+CHANNEL_RATE = 1.0
+CHANNEL_BURST = 5
+
+# 送信済みIDをまとめてマークする件数
+MARK_BATCH_SIZE = 50
+
+# 1通にまとめるリマインダーの最大数（メンションがメッセージの文字数制限 2000文字 に収まるように）
+MAX_DIGEST_SIZE = 50
+
+# スループット計算に使う期間（秒）
+THROUGHPUT_WINDOW = 60.0
+
+
+class TokenBucket:
+    """
+    トークンバケット方式のレート制限
+    待機中のタスクは到着順に通過する
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Args:
+            rate: 1秒あたりに補充されるトークン数
+            capacity: 貯められるトークンの最大数（連続送信できる件数）
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        """経過時間分のトークンを補充"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    @property
+    def is_full(self) -> bool:
+        """トークンが満タンか（しばらく使われていないか）"""
+        self._refill()
+        return self._tokens >= self.capacity and not self._lock.locked()
+
+    async def acquire(self):
+        """
+        トークンを1つ消費（足りない場合は補充されるまで待機）
+        """
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def coalesce_reminders(
+    reminders: List[Dict[str, Any]],
+    max_size: int = MAX_DIGEST_SIZE
+) -> List[List[Dict[str, Any]]]:
+    """
+    リマインダーを (チャンネル, 予定, 予定の開始日時, 通知日時の分) ごとにまとめる
+    （繰り返し予定の別の回のリマインダーが同じ分に重なっても、開始日時の違う回はまとめない）
+
+    Args:
+        reminders: 送信待ちリマインダーのリスト
+        max_size: 1通にまとめる最大数（超えた分は別の通知に分ける）
+
+    Returns:
+        1通ずつ送信するリマインダーのリスト（最初のリマインダーの順）
+    """
+    groups: Dict[Tuple[str, int, int, int], List[Dict[str, Any]]] = {}
+    digests: List[List[Dict[str, Any]]] = []
+    for reminder in reminders:
+        key = (
+            str(reminder['channel_id']),
+            reminder['schedule_id'],
+            datetime_to_epoch(reminder['start_datetime']),
+            datetime_to_epoch(reminder['remind_datetime']) // 60
+        )
+        group = groups.get(key)
+        if group is None or len(group) >= max_size:
+            group = groups[key] = []
+            digests.append(group)
+        group.append(reminder)
+    return digests
+
+
+class ReminderDispatcher:
+    """
+    リマインダーの並行送信
+
+    同じチャンネル・同じ予定の同じ回・同じ分のリマインダーは coalesce_reminders でまとめて1通で送信する
+    チャンネルごとのバケット → 同時送信数の上限 → 全体のバケットの順に待機してから送信する
+    （チャンネルの制限待ちで同時送信枠を占有しないため）
+    送信に成功したIDは MARK_BATCH_SIZE 件ごとに1回のUPDATEで送信済みにする
+    送信に失敗したリマインダーは fail_reminders で再送待ち（上限回数に達したものは送信失敗として保存）にする
+    送信ごとに通知日時からの遅れと送信時間を metrics に記録する
+    """
+
+    def __init__(
+        self,
+        send: Callable[[List[Dict[str, Any]]], Awaitable[bool]],
+        concurrency: int = REMINDER_CONCURRENCY,
+        global_rate: float = REMINDER_GLOBAL_RATE,
+        channel_rate: float = CHANNEL_RATE,
+        channel_burst: int = CHANNEL_BURST,
+        mark_batch_size: int = MARK_BATCH_SIZE,
+        max_digest_size: int = MAX_DIGEST_SIZE,
+        worker_id: Optional[str] = None
+    ):
+        """
+        Args:
+            send: まとめたリマインダーを1通で送信する関数（送信済みのマークはしない。成功時にTrueを返し、
+                失敗時は失敗理由を含む例外を送出する）
+            concurrency: 同時送信数の上限
+            global_rate: BOT全体の送信レート（件/秒）
+            channel_rate: チャンネルごとの送信レート（件/秒）
+            channel_burst: チャンネルごとに連続送信できる件数
+            mark_batch_size: 送信済みIDをまとめてマークする件数
+            max_digest_size: 1通にまとめるリマインダーの最大数
+            worker_id: リマインダーを確保したワーカーID（省略時は REMINDER_WORKER_ID）
+        """
+        self.send = send
+        self.channel_rate = channel_rate
+        self.channel_burst = channel_burst
+        self.mark_batch_size = mark_batch_size
+        self.max_digest_size = max_digest_size
+        self.worker_id = worker_id or REMINDER_WORKER_ID
+
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._global_bucket = TokenBucket(global_rate, max(1, int(global_rate)))
+        self._channel_buckets: Dict[str, TokenBucket] = {}
+
+        # 統計情報
+        self.sent = 0
+        self.failed = 0
+        self.dead_lettered = 0  # 再送の上限回数に達して送信を諦めた件数
+        self.messages = 0      # 送信したメッセージ数（まとめた通知は1通）
+        self.queue_depth = 0   # 送信待ちの件数
+        self.in_flight = 0     # 送信中の件数
+        self.last_batch_rate = 0.0  # 直前の送信処理のスループット（件/秒）
+        self._sent_times: Deque[float] = deque()
+        self.metrics = ReminderMetrics()
+
+    def _channel_bucket(self, channel_id: str) -> TokenBucket:
+        """チャンネルのバケットを取得（使われていないバケットは定期的に削除）"""
+        bucket = self._channel_buckets.get(channel_id)
+        if bucket is None:
+            if len(self._channel_buckets) >= 1000:
+                self._channel_buckets = {
+                    key: value for key, value in self._channel_buckets.items() if not value.is_full
+                }
+            bucket = TokenBucket(self.channel_rate, self.channel_burst)
+            self._channel_buckets[channel_id] = bucket
+        return bucket
+
+    async def dispatch(self, reminders: List[Dict[str, Any]]) -> int:
+        """
+        リマインダーを並行送信し、送信済みにマーク
+
+        Args:
+            reminders: claim_due_reminders で確保した送信待ちリマインダーのリスト
+
+        Returns:
+            送信できなかった件数
+        """
+        sent_ids: List[int] = []
+        # 失敗理由 → リマインダーIDのリスト
+        failed_ids: Dict[Optional[str], List[int]] = {}
+        failures = 0
+        started = time.monotonic()
+        self.queue_depth += len(reminders)
+
+        async def flush():
+            if not sent_ids:
+                return
+            ids = sent_ids[:]
+            sent_ids.clear()
+            updated = await mark_reminders_sent(ids, worker_id=self.worker_id)
+            if updated < len(ids):
+                # 確保の期限切れで他のワーカーに再確保された場合など
+                logger.warning(f"送信済みにマークできなかったリマインダー: {len(ids) - updated}件")
+
+        async def send_one(digest: List[Dict[str, Any]]):
+            nonlocal failures
+
+            ids = [reminder['id'] for reminder in digest]
+            error: Optional[str] = None
+            queued = True
+            try:
+                await self._channel_bucket(str(digest[0]['channel_id'])).acquire()
+                async with self._semaphore:
+                    await self._global_bucket.acquire()
+
+                    queued = False
+                    self.queue_depth -= len(digest)
+                    self.in_flight += len(digest)
+                    send_started = time.monotonic()
+                    try:
+                        ok = await self.send(digest)
+                        if not ok:
+                            error = "送信関数が失敗を返しました"
+                    except Exception as e:
+                        logger.error(f"リマインダー送信エラー (ID: {ids}): {e}")
+                        ok = False
+                        # 失敗理由は reminder_dead_letters.last_error に保存される
+                        error = str(e) or type(e).__name__
+                    finally:
+                        self.in_flight -= len(digest)
+                    self.metrics.record_send(digest, time.monotonic() - send_started, ok)
+            finally:
+                if queued:
+                    self.queue_depth -= len(digest)
+
+            if ok:
+                self.sent += len(digest)
+                self.messages += 1
+                self._record_sent(len(digest))
+                sent_ids.extend(ids)
+                if len(sent_ids) >= self.mark_batch_size:
+                    await flush()
+            else:
+                self.failed += len(digest)
+                failures += len(digest)
+                failed_ids.setdefault(error, []).extend(ids)
+
+        digests = coalesce_reminders(reminders, self.max_digest_size)
+        try:
+            await asyncio.gather(*(send_one(digest) for digest in digests))
+        finally:
+            await flush()
+            for error, ids in failed_ids.items():
+                _, dead_lettered = await fail_reminders(ids, worker_id=self.worker_id, error=error)
+                self.dead_lettered += dead_lettered
+
+        elapsed = time.monotonic() - started
+        if reminders:
+            self.last_batch_rate = len(reminders) / elapsed if elapsed else 0.0
+            logger.info(
+                f"リマインダーを{len(reminders) - failures}/{len(reminders)}件送信しました "
+                f"(メッセージ{len(digests)}通, {elapsed:.2f}秒, {self.last_batch_rate:.1f}件/秒)"
+            )
+        return failures
+
+    def _record_sent(self, count: int = 1):
+        """送信時刻を送信件数分記録（スループット計算の期間より古い記録は削除）"""
+        now = time.monotonic()
+        self._sent_times.extend([now] * count)
+        self._prune(now)
+
+    def _prune(self, now: float):
+        """スループット計算の期間より古い送信時刻を削除"""
+        cutoff = now - THROUGHPUT_WINDOW
+        while self._sent_times and self._sent_times[0] < cutoff:
+            self._sent_times.popleft()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        統計情報を取得
+
+        Returns:
+            送信数・失敗数・メッセージ数・送信待ち件数・直近60秒と直前の送信処理のスループット・
+            通知の遅れと送信時間の分位点などの辞書
+        """
+        self._prune(time.monotonic())
+
+        return {
+            'sent': self.sent,
+            'failed': self.failed,
+            'dead_lettered': self.dead_lettered,
+            'messages': self.messages,
+            'queue_depth': self.queue_depth,
+            'in_flight': self.in_flight,
+            'throughput_per_sec': round(len(self._sent_times) / THROUGHPUT_WINDOW, 2),
+            'last_batch_per_sec': round(self.last_batch_rate, 2),
+            **self.metrics.as_dict(),
+        }
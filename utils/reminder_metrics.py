@@ -0,0 +1,190 @@
+"""
+リマインダー送信のメトリクス
+通知の遅れ・送信時間をヒストグラムに記録し、送信数・滞留件数と合わせてヘルスチェックサーバーから公開する
+
+作成者: [Your Name]
+作成日: 2026-10-17
+"""
+
+import math
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# 通知の遅れ（remind_datetime から送信完了まで）の区切り（秒）
+LATENESS_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, 21600, 86400)
+
+# 1通の送信にかかった時間の区切り（秒）
+SEND_DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Histogram:
+    """
+    区切りごとの件数を数えるヒストグラム（Prometheus の histogram と同じ累積形式で出力）
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        """
+        Args:
+            buckets: 区切りの上限値（昇順）
+        """
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # 最後は上限なし
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        """
+        値を記録
+
+        Args:
+            value: 記録する値
+        """
+        for index, limit in enumerate(self.buckets):
+            if value <= limit:
+                break
+        else:
+            index = len(self.buckets)
+        self._counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """
+        (区切りの上限, その値以下の件数) のリスト
+
+        Returns:
+            最後の要素は ('+Inf', 全件数)
+        """
+        total = 0
+        result = []
+        for limit, count in zip(self.buckets + (math.inf,), self._counts):
+            total += count
+            result.append(('+Inf' if limit == math.inf else f"{limit:g}", total))
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        区切り内を線形補間して分位点を推定
+
+        Args:
+            q: 分位（0〜1）
+
+        Returns:
+            推定値（記録がない場合はNone、最後の区切りを超える場合は最後の区切りの値）
+        """
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        total = 0
+        lower = 0.0
+        for limit, count in zip(self.buckets, self._counts):
+            if count and total + count >= rank:
+                return lower + (limit - lower) * (rank - total) / count
+            total += count
+            lower = limit
+        return float(self.buckets[-1])
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        件数・平均・分位点の辞書
+
+        Returns:
+            count / avg / p50 / p95 / p99 の辞書
+        """
+        def rounded(value: Optional[float]) -> Optional[float]:
+            return round(value, 3) if value is not None else None
+
+        return {
+            'count': self.count,
+            'avg': rounded(self.sum / self.count) if self.count else None,
+            'p50': rounded(self.quantile(0.5)),
+            'p95': rounded(self.quantile(0.95)),
+            'p99': rounded(self.quantile(0.99)),
+        }
+
+
+class ReminderMetrics:
+    """
+    リマインダー送信のメトリクス
+    """
+
+    def __init__(self):
+        self.lateness = Histogram(LATENESS_BUCKETS)
+        self.send_duration = Histogram(SEND_DURATION_BUCKETS)
+
+    def record_send(self, reminders: List[Dict[str, Any]], duration: float, ok: bool):
+        """
+        1通の送信結果を記録
+
+        Args:
+            reminders: 1通にまとめて送信したリマインダー
+            duration: 送信にかかった時間（秒）
+            ok: 送信に成功したか
+        """
+        self.send_duration.observe(duration)
+        if not ok:
+            return
+
+        now = datetime.now()
+        for reminder in reminders:
+            self.lateness.observe(max(0.0, (now - reminder['remind_datetime']).total_seconds()))
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        /status 用の辞書
+
+        Returns:
+            遅れ・送信時間の件数・平均・分位点の辞書
+        """
+        return {
+            'lateness_seconds': self.lateness.summary(),
+            'send_duration_seconds': self.send_duration.summary(),
+        }
+
+    def render_prometheus(
+        self,
+        counters: Optional[Dict[str, Tuple[str, float]]] = None,
+        gauges: Optional[Dict[str, Tuple[str, float]]] = None
+    ) -> str:
+        """
+        Prometheus のテキスト形式で出力
+
+        Args:
+            counters: 追加で出力する累計値（メトリクス名 -> (説明, 値)）
+            gauges: 追加で出力する現在値（メトリクス名 -> (説明, 値)）
+
+        Returns:
+            /metrics のレスポンス本文
+        """
+        lines: List[str] = []
+
+        def histogram(name: str, help_text: str, data: Histogram):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for limit, count in data.cumulative():
+                lines.append(f'{name}_bucket{{le="{limit}"}} {count}')
+            lines.append(f"{name}_sum {data.sum:.6f}")
+            lines.append(f"{name}_count {data.count}")
+
+        def single(name: str, kind: str, help_text: str, value: float):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {value:g}")
+
+        histogram(
+            'reminder_lateness_seconds',
+            'Delay between remind_datetime and successful delivery.',
+            self.lateness
+        )
+        histogram(
+            'reminder_send_duration_seconds',
+            'Time spent sending one (possibly coalesced) reminder message.',
+            self.send_duration
+        )
+        for name, (help_text, value) in (counters or {}).items():
+            single(name, 'counter', help_text, value)
+        for name, (help_text, value) in (gauges or {}).items():
+            single(name, 'gauge', help_text, value)
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,338 @@
+"""
+リマインダースケジューラー
+次に通知するリマインダーの日時をヒープで管理し、その時刻ちょうどまで待機して送信する
+停止中などで大きく遅れたリマインダーはバックグラウンドで送信レートを抑えて送信する
+
+作成者: [Your Name]
+作成日: 2026-10-17
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from database.database import (
+    REMINDER_WORKER_ID,
+    claim_due_reminders,
+    get_next_lease_expiry,
+    get_upcoming_reminders,
+    mark_reminders_sent
+)
+from database.models import datetime_to_epoch
+from .reminder_catchup import (
+    REMINDER_CATCHUP_AFTER,
+    REMINDER_CATCHUP_RATE,
+    REMINDER_GRACE_SECONDS,
+    REMINDER_STALE_POLICY,
+    CatchUpSummary,
+    apply_stale_policy
+)
+
+logger = logging.getLogger(__name__)
+
+# 送信処理: 送信待ちリマインダーのリストを受け取り、送信できなかった件数を返す
+Dispatcher = Callable[[List[Dict[str, Any]]], Awaitable[int]]
+
+
+class ReminderScheduler:
+    """
+    ヒープ（最小値 = 次の通知日時）を使ったリマインダースケジューラー
+
+    DBからは通知日時の早い順に window_size 件だけ読み込み、ヒープが空になった時点で次の範囲を読み込む
+    リマインダーの作成・予定の削除は database.add_reminder_listener 経由で通知され、ヒープをその場で更新する
+    通知日時になったら claim_due_reminders() で送信待ちのリマインダーを確保して送信処理に渡す
+    （他のワーカーが確保中のものは送信せず、確保の期限切れ・再送時刻に起きて再確保する）
+    通知日時から catch_up_after 秒以上遅れたものは別タスクで catch_up_rate 件/秒 までの速さで送信し、
+    猶予期間を過ぎたものは stale_policy に従ってまとめる・省略する
+    """
+
+    def __init__(
+        self,
+        dispatch: Dispatcher,
+        window_size: int = 200,
+        claim_batch_size: int = 100,
+        retry_interval: float = 60.0,
+        resync_interval: float = 600.0,
+        catch_up_after: float = REMINDER_CATCHUP_AFTER,
+        catch_up_rate: float = REMINDER_CATCHUP_RATE,
+        grace_seconds: float = REMINDER_GRACE_SECONDS,
+        stale_policy: str = REMINDER_STALE_POLICY
+    ):
+        """
+        Args:
+            dispatch: 送信処理
+            window_size: 一度に読み込むリマインダーの件数
+            claim_batch_size: 一度に確保して送信処理に渡すリマインダーの件数
+            retry_interval: エラー発生時に処理を再開するまでの待ち時間（秒）
+            resync_interval: DBと再同期する間隔（秒、他のプロセスが作成したリマインダーの取りこぼし防止）
+            catch_up_after: 追いつき処理で送信する遅延時間（秒）
+            catch_up_rate: 追いつき処理の送信レート（件/秒）
+            grace_seconds: 遅延したリマインダーをそのまま送信する猶予期間（秒）
+            stale_policy: 猶予期間を過ぎたリマインダーの扱い（collapse / skip / send）
+        """
+        self.dispatch = dispatch
+        self.window_size = window_size
+        self.claim_batch_size = claim_batch_size
+        self.retry_interval = retry_interval
+        self.resync_interval = resync_interval
+        self.catch_up_after = catch_up_after
+        self.catch_up_rate = catch_up_rate
+        self.grace_seconds = grace_seconds
+        self.stale_policy = stale_policy
+
+        # (通知日時のエポック秒, リマインダーID, 予定ID)
+        self._heap: List[Tuple[int, int, int]] = []
+        # 読み込み範囲の最後の通知日時（読み込み件数が window_size 未満ならNone = 未送信分をすべて保持）
+        self._window_end: Optional[int] = None
+        # この日時までのリマインダーは送信処理に渡し済み
+        self._fired_until = 0
+        # 確保の期限切れ・再送待ちのリマインダーを再確保する時刻（エポック秒）
+        self._retry_at: Optional[float] = None
+        self._next_resync = 0.0
+
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._catch_up_task: Optional[asyncio.Task] = None
+
+        # 統計情報
+        self.fired = 0
+        self.refills = 0
+        # 直近の追いつき処理の集計（処理中の場合は途中経過）
+        self.catch_up: Optional[CatchUpSummary] = None
+
+    @property
+    def is_running(self) -> bool:
+        """スケジューラーが動作中かどうか"""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def is_catching_up(self) -> bool:
+        """追いつき処理の実行中かどうか"""
+        return self._catch_up_task is not None and not self._catch_up_task.done()
+
+    @property
+    def next_deadline(self) -> Optional[datetime]:
+        """次に通知するリマインダーの日時"""
+        return datetime.fromtimestamp(self._heap[0][0]) if self._heap else None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def start(self):
+        """
+        スケジューラーを開始（開始済みの場合は何もしない）
+        """
+        if self.is_running:
+            return
+
+        self._task = asyncio.create_task(self._run())
+        logger.info("リマインダースケジューラーを開始しました")
+
+    async def stop(self):
+        """
+        スケジューラーを停止
+        """
+        for task in (self._task, self._catch_up_task):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._task = self._catch_up_task = None
+
+    # ==================== データベースからの通知 ====================
+
+    def on_reminder_created(self, reminder_id: int, schedule_id: int, remind_datetime: datetime):
+        """
+        リマインダーが作成された
+
+        Args:
+            reminder_id: リマインダーID
+            schedule_id: 予定ID
+            remind_datetime: 通知日時
+        """
+        remind_at = datetime_to_epoch(remind_datetime)
+
+        # 読み込み範囲より後のリマインダーは、範囲を読み込み直す時にDBから取得される
+        if self._window_end is not None and remind_at > self._window_end:
+            return
+
+        heapq.heappush(self._heap, (remind_at, reminder_id, schedule_id))
+        if self._heap[0][1] == reminder_id:
+            # 最も早いリマインダーが変わったので待機時間を計算し直す
+            self._wakeup.set()
+
+    def on_schedule_deleted(self, schedule_id: int):
+        """
+        予定が削除された（その予定のリマインダーをヒープから除く）
+
+        Args:
+            schedule_id: 予定ID
+        """
+        remaining = [entry for entry in self._heap if entry[2] != schedule_id]
+        if len(remaining) == len(self._heap):
+            return
+
+        heapq.heapify(remaining)
+        self._heap = remaining
+        self._wakeup.set()
+
+    # ==================== 内部処理 ====================
+
+    async def _refill(self):
+        """通知済みの日時より後のリマインダーを window_size 件読み込み直す"""
+        after = datetime.fromtimestamp(self._fired_until) if self._fired_until else None
+        reminders = await get_upcoming_reminders(after=after, limit=self.window_size)
+
+        heap = [
+            (datetime_to_epoch(reminder.remind_datetime), reminder.id, reminder.schedule_id)
+            for reminder in reminders
+        ]
+        heapq.heapify(heap)
+        self._heap = heap
+        if len(heap) >= self.window_size:
+            self._window_end = max(entry[0] for entry in heap)
+        else:
+            self._window_end = None
+        self._next_resync = time.monotonic() + self.resync_interval
+        self.refills += 1
+
+        logger.debug(f"リマインダーを{len(heap)}件読み込みました (次: {self.next_deadline})")
+
+    def _seconds_until_next(self) -> Optional[float]:
+        """次に起きるまでの秒数（Noneの場合は通知されるまで待機）"""
+        deadlines = []
+        if self._heap:
+            deadlines.append(self._heap[0][0])
+        if self._retry_at is not None:
+            deadlines.append(self._retry_at)
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - time.time())
+
+    async def _fire(self):
+        """通知日時になったリマインダーを確保して送信処理に渡す"""
+        now = int(time.time())
+        catch_up_before = now - self.catch_up_after
+        # 大きく遅れたリマインダー・再送待ちのリマインダーがあれば追いつき処理に任せる
+        needs_catch_up = self._retry_at is not None and self._retry_at <= now
+        while self._heap and self._heap[0][0] <= now:
+            needs_catch_up |= heapq.heappop(self._heap)[0] < catch_up_before
+        self._fired_until = max(self._fired_until, now)
+        self._retry_at = None
+
+        if needs_catch_up:
+            self._start_catch_up()
+
+        # 最新の状態（予定の変更・削除、期限切れの確保）を反映するためDBから確保する
+        due_after = datetime.fromtimestamp(catch_up_before)
+        while True:
+            reminders = await claim_due_reminders(limit=self.claim_batch_size, due_after=due_after)
+            if not reminders:
+                break
+
+            failures = await self.dispatch(reminders)
+            self.fired += len(reminders) - failures
+
+            if len(reminders) < self.claim_batch_size:
+                break
+
+        # 他のワーカーが確保中のもの・送信に失敗して再送待ちのものは、期限になったら再確保する
+        expiry = await get_next_lease_expiry()
+        if expiry is not None:
+            self._retry_at = datetime_to_epoch(expiry)
+
+    def _start_catch_up(self):
+        """追いつき処理を開始（実行中の場合は何もしない）"""
+        if self.is_catching_up:
+            return
+        self._catch_up_task = asyncio.create_task(self._catch_up())
+
+    async def _catch_up(self):
+        """大きく遅れたリマインダーを、送信レートを抑えてすべて送信し終えるまで処理する"""
+        summary = self.catch_up = CatchUpSummary()
+        # 確保の期限内に送信し終えられる件数ずつ確保する
+        batch_size = max(1, min(self.claim_batch_size, int(self.catch_up_rate * 10)))
+
+        try:
+            while True:
+                now = datetime.now()
+                reminders = await claim_due_reminders(
+                    limit=batch_size,
+                    due_before=now - timedelta(seconds=self.catch_up_after)
+                )
+                if not reminders:
+                    break
+
+                started = time.monotonic()
+                to_send, skipped, collapsed = apply_stale_policy(
+                    reminders, now, self.grace_seconds, self.stale_policy
+                )
+                summary.record_lateness(reminders, now)
+
+                if skipped or collapsed:
+                    await mark_reminders_sent(
+                        [reminder['id'] for reminder in skipped + collapsed], worker_id=REMINDER_WORKER_ID
+                    )
+                    summary.skipped += len(skipped)
+                    summary.collapsed += len(collapsed)
+
+                if to_send:
+                    failures = await self.dispatch(to_send)
+                    summary.sent += len(to_send) - failures
+                    summary.failed += failures
+                    self.fired += len(to_send) - failures
+
+                # 送信レートを catch_up_rate 件/秒 以下に抑える
+                await asyncio.sleep(max(0.0, len(to_send) / self.catch_up_rate - (time.monotonic() - started)))
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"遅延リマインダーの処理でエラー: {e}")
+        finally:
+            summary.finished_at = datetime.now()
+            if summary.total:
+                logger.info(f"遅延リマインダーの処理が完了しました: {summary}")
+
+        # 送信に失敗したものは再送時刻に再確保する
+        expiry = await get_next_lease_expiry()
+        if expiry is not None:
+            self._retry_at = min(self._retry_at or float('inf'), datetime_to_epoch(expiry))
+            self._wakeup.set()
+
+    async def _run(self):
+        """スケジューラーのメインループ"""
+        await self._refill()
+
+        while True:
+            try:
+                # 保持している範囲を使い切ったら次の範囲を読み込む
+                if (not self._heap and self._window_end is not None) or time.monotonic() >= self._next_resync:
+                    await self._refill()
+
+                self._wakeup.clear()
+                delay = self._seconds_until_next()
+                resync_delay = max(0.0, self._next_resync - time.monotonic())
+                timeout = resync_delay if delay is None else min(delay, resync_delay)
+
+                if timeout > 0:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                        continue  # ヒープが変更されたので待機時間を計算し直す
+                    except asyncio.TimeoutError:
+                        pass
+
+                if self._seconds_until_next() == 0:
+                    await self._fire()
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"リマインダースケジューラーでエラー: {e}")
+                await asyncio.sleep(self.retry_interval)